@@ -0,0 +1,5 @@
+"""Performance benchmarks for civic-data-boundaries-us-cd118.
+
+Run from the repository root:
+    python -m benchmarks
+"""
@@ -0,0 +1,99 @@
+"""Run the benchmark suite and compare against stored baselines.
+
+File: benchmarks/__main__.py
+
+Usage (from the repository root):
+    python -m benchmarks
+    python -m benchmarks --districts 400 --vertices 4000 --repeat 3
+    python -m benchmarks --only chunk_hilbert --only chunk_quadtree
+    python -m benchmarks --update-baseline
+
+Exits with 1 if any benchmark is slower than its baseline by more than
+``--tolerance``.
+"""
+
+import argparse
+from pathlib import Path
+import sys
+import tempfile
+
+from civic_lib_core import log_utils
+
+from benchmarks.suite import (
+    BASELINES_PATH,
+    BENCHMARKS,
+    baseline_key,
+    compare,
+    load_baselines,
+    prepare_context,
+    run_suite,
+    save_baselines,
+)
+
+logger = log_utils.logger
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description=__doc__.split("\n")[0]
+    )
+    parser.add_argument(
+        "--districts", type=int, default=200, help="Districts in the synthetic state."
+    )
+    parser.add_argument("--vertices", type=int, default=2000, help="Vertices per district ring.")
+    parser.add_argument(
+        "--index-entries", type=int, default=500, help="Entries in the served index.json."
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per benchmark.")
+    parser.add_argument(
+        "--only", action="append", choices=sorted(BENCHMARKS), help="Run only these benchmarks."
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=0.5, help="Allowed slowdown before failing (0.5 = 50%%)."
+    )
+    parser.add_argument(
+        "--baselines", type=Path, default=BASELINES_PATH, help="Baselines JSON file."
+    )
+    parser.add_argument(
+        "--update-baseline", action="store_true", help="Store these results as the new baselines."
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the suite, print a table and compare with (or update) baselines.
+
+    Returns:
+        int: 0 if no benchmark regressed, 1 otherwise.
+    """
+    args = _parse_args(argv)
+    key = baseline_key(args.districts, args.vertices, args.index_entries)
+
+    # The code under test logs per call; keep the timing output readable
+    logger.disable("civic_data_boundaries_us_cd118")
+
+    with (
+        tempfile.TemporaryDirectory(prefix="cd118-bench-") as tmp,
+        prepare_context(Path(tmp), args.districts, args.vertices, args.index_entries) as ctx,
+    ):
+        results = run_suite(ctx, repeat=args.repeat, names=args.only)
+
+    if args.update_baseline:
+        save_baselines(results, key, args.baselines)
+        print(f"Baselines for {key} written to {args.baselines}")
+        return 0
+
+    comparisons = compare(results, load_baselines(args.baselines), key, args.tolerance)
+    print(f"{key}, {args.repeat} runs each")
+    print(f"{'benchmark':<24}{'median s':>12}{'baseline s':>12}{'ratio':>8}")
+    for c in comparisons:
+        base = f"{c.baseline_s:.4f}" if c.baseline_s is not None else "-"
+        ratio = f"{c.ratio:.2f}" if c.ratio is not None else "-"
+        flag = "  REGRESSED" if c.regressed else ""
+        print(f"{c.name:<24}{c.median_s:>12.4f}{base:>12}{ratio:>8}{flag}")
+
+    return 1 if any(c.regressed for c in comparisons) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,276 @@
+"""Benchmarks for the export, index, chunking and remote lookup hot paths.
+
+File: benchmarks/suite.py
+
+Each benchmark is a function of a prepared ``BenchContext``, registered with
+``@benchmark``. ``run_suite`` times every benchmark (median of several runs)
+and ``compare`` checks the medians against stored baselines.
+"""
+
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+import json
+from pathlib import Path
+import platform
+import statistics
+import threading
+import time
+from typing import Any, NamedTuple
+
+import geopandas as gpd  # type: ignore
+
+from benchmarks.synthetic import write_synthetic_shapefile
+from civic_data_boundaries_us_cd118 import remote
+from civic_data_boundaries_us_cd118.chunking import chunk_spatial
+from civic_data_boundaries_us_cd118.export_cd118 import load_cd118_layer
+from civic_data_boundaries_us_cd118.index import compute_bbox, compute_feature_count
+from civic_data_boundaries_us_cd118.validation import repair_geometries
+
+__all__ = [
+    "BASELINES_PATH",
+    "BENCHMARKS",
+    "BenchContext",
+    "BenchResult",
+    "Comparison",
+    "baseline_key",
+    "benchmark",
+    "compare",
+    "load_baselines",
+    "prepare_context",
+    "run_suite",
+    "save_baselines",
+]
+
+BASELINES_PATH = Path(__file__).with_name("baselines.json")
+
+# Simplify tolerance used by the export config, in degrees
+SIMPLIFY_TOLERANCE = 0.0001
+
+
+class BenchContext(NamedTuple):
+    """Inputs shared by all benchmarks of one suite run."""
+
+    work_dir: Path
+    shapefile: Path
+    gdf: gpd.GeoDataFrame
+    geojson: Path
+    index_url: str
+
+
+class BenchResult(NamedTuple):
+    """Timing of one benchmark."""
+
+    name: str
+    runs: int
+    min_s: float
+    median_s: float
+
+
+class Comparison(NamedTuple):
+    """A benchmark median compared with its stored baseline."""
+
+    name: str
+    median_s: float
+    baseline_s: float | None
+    ratio: float | None
+    regressed: bool
+
+
+BENCHMARKS: dict[str, Callable[[BenchContext], Any]] = {}
+
+
+def benchmark(
+    name: str,
+) -> Callable[[Callable[[BenchContext], Any]], Callable[[BenchContext], Any]]:
+    """Register a benchmark function under ``name``."""
+
+    def register(fn: Callable[[BenchContext], Any]) -> Callable[[BenchContext], Any]:
+        BENCHMARKS[name] = fn
+        return fn
+
+    return register
+
+
+@benchmark("load_cd118_layer")
+def _bench_load(ctx: BenchContext) -> Any:
+    return load_cd118_layer(ctx.shapefile)
+
+
+@benchmark("simplify")
+def _bench_simplify(ctx: BenchContext) -> Any:
+    return ctx.gdf.geometry.simplify(SIMPLIFY_TOLERANCE, preserve_topology=True)
+
+
+@benchmark("validate_geometry")
+def _bench_validate(ctx: BenchContext) -> Any:
+    return repair_geometries(ctx.gdf.geometry.to_numpy())
+
+
+@benchmark("to_file")
+def _bench_to_file(ctx: BenchContext) -> Any:
+    ctx.gdf.to_file(ctx.work_dir / "to_file.geojson", driver="GeoJSON")
+
+
+@benchmark("compute_bbox")
+def _bench_bbox(ctx: BenchContext) -> Any:
+    return compute_bbox(ctx.geojson)
+
+
+@benchmark("compute_feature_count")
+def _bench_feature_count(ctx: BenchContext) -> Any:
+    return compute_feature_count(ctx.geojson)
+
+
+@benchmark("chunk_hilbert")
+def _bench_chunk_hilbert(ctx: BenchContext) -> Any:
+    return chunk_spatial(ctx.geojson, mode="hilbert", target_bytes=250_000)
+
+
+@benchmark("chunk_quadtree")
+def _bench_chunk_quadtree(ctx: BenchContext) -> Any:
+    return chunk_spatial(ctx.geojson, mode="quadtree", target_bytes=250_000)
+
+
+@benchmark("remote_load_index")
+def _bench_remote_index(ctx: BenchContext) -> Any:
+    saved = remote.BASE
+    remote.BASE = ctx.index_url
+    try:
+        return remote.load_index()
+    finally:
+        remote.BASE = saved
+
+
+def _synthetic_index(entries: int) -> list[dict[str, Any]]:
+    """Return an index.json payload shaped like the real one, with chunk lists."""
+    index: list[dict[str, Any]] = []
+    for i in range(entries):
+        bbox = [-125.0 + i * 0.01, 24.0, -124.0 + i * 0.01, 25.0]
+        index.append(
+            {
+                "path": f"states/state_{i}/cd118_state_{i}.geojson",
+                "bbox": bbox,
+                "features": 10,
+                "chunks": [
+                    {
+                        "path": f"states/state_{i}/cd118_state_{i}_chunks/chunk_{n}.geojson",
+                        "bbox": bbox,
+                        "features": 2,
+                        "bytes": 100_000,
+                    }
+                    for n in range(1, 5)
+                ],
+            }
+        )
+    return index
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        pass
+
+
+@contextmanager
+def serve_directory(directory: Path) -> Iterator[str]:
+    """Serve a directory over HTTP on localhost and yield its base URL."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(_QuietHandler, directory=str(directory)))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@contextmanager
+def prepare_context(
+    work_dir: Path, districts: int, vertices: int, index_entries: int
+) -> Iterator[BenchContext]:
+    """Generate the synthetic inputs and start the local index server."""
+    shapefile = write_synthetic_shapefile(work_dir / "tiger", "27", districts, vertices)
+    gdf = gpd.read_file(shapefile)
+    geojson = work_dir / "cd118_synthetic.geojson"
+    gdf.to_file(geojson, driver="GeoJSON")
+
+    site = work_dir / "site"
+    site.mkdir(parents=True, exist_ok=True)
+    with (site / "index.json").open("w", encoding="utf-8") as f:
+        json.dump(_synthetic_index(index_entries), f, indent=2)
+
+    with serve_directory(site) as url:
+        yield BenchContext(work_dir, shapefile, gdf, geojson, url)
+
+
+def _time(fn: Callable[[BenchContext], Any], ctx: BenchContext, repeat: int) -> list[float]:
+    fn(ctx)  # warm-up: imports, page cache, driver registration
+    timings: list[float] = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(ctx)
+        timings.append(time.perf_counter() - t0)
+    return timings
+
+
+def run_suite(
+    ctx: BenchContext, repeat: int = 5, names: list[str] | None = None
+) -> list[BenchResult]:
+    """Time each selected benchmark ``repeat`` times after one warm-up run."""
+    results: list[BenchResult] = []
+    for name, fn in BENCHMARKS.items():
+        if names and name not in names:
+            continue
+        timings = _time(fn, ctx, repeat)
+        results.append(
+            BenchResult(name, repeat, round(min(timings), 6), round(statistics.median(timings), 6))
+        )
+    return results
+
+
+def baseline_key(districts: int, vertices: int, index_entries: int) -> str:
+    """Return the key baselines are stored under; sizes must match to compare."""
+    return f"districts={districts},vertices={vertices},index_entries={index_entries}"
+
+
+def load_baselines(path: Path = BASELINES_PATH) -> dict[str, Any]:
+    """Load stored baselines, or {} if there are none."""
+    if not path.exists():
+        return {}
+    with path.open(encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baselines(results: list[BenchResult], key: str, path: Path = BASELINES_PATH) -> None:
+    """Store the medians of ``results`` as the baselines for ``key``.
+
+    Benchmarks not in ``results`` keep their stored baselines.
+    """
+    baselines = load_baselines(path)
+    stored = baselines.get(key) or {}
+    baselines[key] = {
+        "machine": f"{platform.system()} {platform.machine()} / Python {platform.python_version()}",
+        "median_s": {**stored.get("median_s", {}), **{r.name: r.median_s for r in results}},
+    }
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(baselines, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def compare(
+    results: list[BenchResult], baselines: dict[str, Any], key: str, tolerance: float
+) -> list[Comparison]:
+    """Compare medians with the baselines for ``key``.
+
+    A benchmark regresses if its median exceeds the baseline by more than
+    ``tolerance`` (0.5 means 50% slower).
+    """
+    stored: dict[str, float] = (baselines.get(key) or {}).get("median_s", {})
+    comparisons: list[Comparison] = []
+    for r in results:
+        base = stored.get(r.name)
+        ratio = round(r.median_s / base, 3) if base else None
+        regressed = ratio is not None and ratio > 1 + tolerance
+        comparisons.append(Comparison(r.name, r.median_s, base, ratio, regressed))
+    return comparisons
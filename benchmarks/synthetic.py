@@ -0,0 +1,136 @@
+"""Synthetic CD118-style district shapefiles for benchmarks and tests.
+
+File: benchmarks/synthetic.py
+
+Districts are cells of a regular grid whose edges are densified and
+perturbed by a smooth function of global position, so neighbouring districts
+share identical boundary vertices (as real TIGER districts do) and every
+polygon has a predictable vertex count. Output is deterministic and needs no
+network access.
+"""
+
+import math
+from pathlib import Path
+
+import geopandas as gpd  # type: ignore
+import numpy as np
+from shapely.geometry import Polygon
+
+__all__ = [
+    "synthetic_districts",
+    "write_synthetic_shapefile",
+    "write_synthetic_states",
+]
+
+# Attribute columns of the TIGER/Line 2022 CD118 shapefiles
+TIGER_COLUMNS = (
+    "STATEFP20",
+    "GEOID20",
+    "CD118FP",
+    "NAMELSAD20",
+    "LSAD20",
+    "CDSESSN",
+    "MTFCC20",
+    "FUNCSTAT20",
+    "ALAND20",
+    "AWATER20",
+    "INTPTLAT20",
+    "INTPTLON20",
+)
+
+
+def _edge(x0: float, y0: float, x1: float, y1: float, n: int, wobble: float) -> np.ndarray:
+    """Return n points from (x0, y0) towards (x1, y1), excluding the end point.
+
+    The offset perpendicular to the edge depends only on the global position
+    along it, so the same edge walked from either side has the same vertices.
+    """
+    t = np.arange(n) / n
+    xs = x0 + (x1 - x0) * t
+    ys = y0 + (y1 - y0) * t
+    # Vanishes at the corners; phase from the absolute coordinate along the edge
+    along = ys if x0 == x1 else xs
+    offset = wobble * np.sin(math.pi * t) * np.sin(along * 37.0)
+    if x0 == x1:
+        xs = xs + offset
+    else:
+        ys = ys + offset
+    return np.column_stack([xs, ys])
+
+
+def synthetic_districts(
+    districts: int = 50,
+    vertices: int = 1_000,
+    fips: str = "27",
+    origin: tuple[float, float] = (-97.0, 43.0),
+    cell: float = 0.5,
+) -> gpd.GeoDataFrame:
+    """Build a GeoDataFrame of grid-shaped districts with TIGER-like columns.
+
+    Args:
+        districts (int): Number of districts.
+        vertices (int): Approximate number of vertices per district ring.
+        fips (str): Two-digit state FIPS code written to the attributes.
+        origin (tuple): Lower-left corner (lon, lat) of the grid.
+        cell (float): Width and height of each district in degrees.
+
+    Returns:
+        gpd.GeoDataFrame: One polygon per district in EPSG:4269.
+    """
+    per_edge = max(vertices // 4, 1)
+    wobble = cell * 0.08
+    cols = math.ceil(math.sqrt(districts))
+
+    geoms: list[Polygon] = []
+    for i in range(districts):
+        x0 = origin[0] + (i % cols) * cell
+        y0 = origin[1] + (i // cols) * cell
+        x1, y1 = x0 + cell, y0 + cell
+        # Edges are always generated in increasing coordinate order, then
+        # reversed as needed, so shared edges match exactly
+        bottom = _edge(x0, y0, x1, y0, per_edge, wobble)
+        right = _edge(x1, y0, x1, y1, per_edge, wobble)
+        top = np.vstack([[x1, y1], _edge(x0, y1, x1, y1, per_edge, wobble)[:0:-1]])
+        left = np.vstack([[x0, y1], _edge(x0, y0, x0, y1, per_edge, wobble)[:0:-1]])
+        geoms.append(Polygon(np.vstack([bottom, right, top, left])))
+
+    rng = np.random.default_rng(int(fips))
+    cd = [f"{i + 1:02d}" for i in range(districts)]
+    reps = gpd.GeoSeries(geoms).representative_point()
+    data = {
+        "STATEFP20": [fips] * districts,
+        "GEOID20": [fips + c for c in cd],
+        "CD118FP": cd,
+        "NAMELSAD20": [f"Congressional District {int(c)}" for c in cd],
+        "LSAD20": ["C2"] * districts,
+        "CDSESSN": ["118"] * districts,
+        "MTFCC20": ["G5200"] * districts,
+        "FUNCSTAT20": ["N"] * districts,
+        "ALAND20": rng.integers(10**8, 10**10, districts),
+        "AWATER20": rng.integers(0, 10**8, districts),
+        "INTPTLAT20": [f"{p.y:+.7f}" for p in reps],
+        "INTPTLON20": [f"{p.x:+.7f}" for p in reps],
+    }
+    return gpd.GeoDataFrame(data, geometry=geoms, crs="EPSG:4269")
+
+
+def write_synthetic_shapefile(
+    tiger_dir: Path, fips: str = "27", districts: int = 50, vertices: int = 1_000
+) -> Path:
+    """Write one state's synthetic shapefile in the data-in/tiger layout.
+
+    Returns:
+        Path: ``<tiger_dir>/<fips>/tl_2022_<fips>_cd118/tl_2022_<fips>_cd118.shp``.
+    """
+    stem = f"tl_2022_{fips}_cd118"
+    shp = tiger_dir / fips / stem / f"{stem}.shp"
+    shp.parent.mkdir(parents=True, exist_ok=True)
+    synthetic_districts(districts, vertices, fips).to_file(shp, driver="ESRI Shapefile")
+    return shp
+
+
+def write_synthetic_states(
+    tiger_dir: Path, states: list[str], districts: int = 50, vertices: int = 1_000
+) -> list[Path]:
+    """Write synthetic shapefiles for several states, one grid per state."""
+    return [write_synthetic_shapefile(tiger_dir, fips, districts, vertices) for fips in states]
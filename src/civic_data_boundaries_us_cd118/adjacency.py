@@ -0,0 +1,209 @@
+"""District adjacency graph, computed once at export time.
+
+File: adjacency.py
+
+Candidate neighbour pairs come from an STRtree query, so only districts whose
+extents meet are compared. Two districts are adjacent if they share a stretch
+of boundary (touching at a corner does not count); the shared length is
+recorded on each edge, in meters.
+
+Districts are simplified one at a time, so shared edges no longer coincide
+exactly in the exported layer. A small ``tolerance`` (in degrees) bridges the
+gap: a district's boundary counts as shared where it lies within
+``tolerance`` of the neighbour.
+
+Two files are written next to the nationwide GeoJSON and listed in index.json:
+- ``<stem>.adjacency.json``: district ids and an edge list ``[i, j, meters]``
+- ``<stem>.adjacency.npz``: the same graph as symmetric CSR arrays for numpy/scipy
+"""
+
+import json
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from civic_lib_core import log_utils
+import geopandas as gpd  # type: ignore
+import numpy as np
+import shapely
+
+logger = log_utils.logger
+
+__all__ = [
+    "ADJACENCY_FORMAT",
+    "ADJACENCY_VERSION",
+    "DEFAULT_KEY_COLUMN",
+    "LENGTH_CRS",
+    "AdjacencyGraph",
+    "adjacency_paths_for",
+    "compute_adjacency",
+    "load_adjacency",
+    "shared_boundaries",
+    "write_adjacency",
+]
+
+ADJACENCY_FORMAT = "cd118-adjacency"
+ADJACENCY_VERSION = 1
+
+DEFAULT_KEY_COLUMN = "GEOID20"
+
+# Shared boundary lengths are measured in CONUS Albers (meters)
+LENGTH_CRS = "EPSG:5070"
+
+
+class AdjacencyGraph(NamedTuple):
+    """Undirected district adjacency in CSR form.
+
+    The neighbours of district ``i`` are ``indices[indptr[i]:indptr[i + 1]]``,
+    with shared boundary lengths at the same positions in ``lengths``.
+    """
+
+    ids: list[str]
+    indptr: np.ndarray
+    indices: np.ndarray
+    lengths: np.ndarray
+
+    def neighbors(self, key: str) -> dict[str, float]:
+        """Return {neighbour id: shared boundary length} for one district."""
+        i = self.ids.index(key)
+        start, end = self.indptr[i], self.indptr[i + 1]
+        return {
+            self.ids[j]: float(length)
+            for j, length in zip(self.indices[start:end], self.lengths[start:end], strict=True)
+        }
+
+    def edges(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return each edge once as (i, j, length) arrays with i < j."""
+        rows = np.repeat(np.arange(len(self.ids)), np.diff(self.indptr))
+        upper = rows < self.indices
+        return rows[upper], self.indices[upper], self.lengths[upper]
+
+
+def shared_boundaries(
+    geoms: np.ndarray, tolerance: float = 0.0
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Find district pairs that share boundary, and the shared part.
+
+    Args:
+        geoms (np.ndarray): Object array of (multi)polygons; None is skipped.
+        tolerance (float): Gap (in CRS units) still treated as a shared boundary.
+            With 0, boundaries must coincide exactly.
+
+    Returns:
+        tuple: Arrays (i, j, shared) with i < j, where ``shared`` holds the
+        part of district i's boundary it shares with district j.
+    """
+    geoms = np.asarray(geoms, dtype=object)
+    tree = shapely.STRtree(geoms)
+    if tolerance > 0:
+        left, right = tree.query(geoms, predicate="dwithin", distance=tolerance)
+    else:
+        left, right = tree.query(geoms, predicate="intersects")
+    pair = left < right
+    left, right = left[pair], right[pair]
+
+    boundary = shapely.boundary(geoms[left])
+    if tolerance > 0:
+        near = shapely.buffer(geoms, tolerance)
+        shared = shapely.intersection(boundary, near[right])
+    else:
+        shared = shapely.intersection(boundary, shapely.boundary(geoms[right]))
+
+    # A corner contact leaves a point, or with a tolerance a stub about 2 * tolerance long
+    keep = shapely.length(shared) > 2 * tolerance
+    return left[keep], right[keep], shared[keep]
+
+
+def _lengths(shared: np.ndarray, crs: Any) -> np.ndarray:
+    if crs is None:
+        return shapely.length(shared)
+    series = gpd.GeoSeries(shared, crs=crs)
+    return series.to_crs(LENGTH_CRS).length.to_numpy()
+
+
+def compute_adjacency(
+    gdf: gpd.GeoDataFrame, key_column: str = DEFAULT_KEY_COLUMN, tolerance: float = 0.0
+) -> AdjacencyGraph:
+    """Compute the adjacency graph of a district layer.
+
+    Args:
+        gdf (gpd.GeoDataFrame): District polygons, e.g. the nationwide export.
+        key_column (str): Column used as district id; row numbers if missing.
+        tolerance (float): See ``shared_boundaries``.
+
+    Returns:
+        AdjacencyGraph: Shared boundary lengths in meters (CRS units if the
+        layer has no CRS).
+    """
+    if key_column in gdf.columns:
+        ids = [str(v) for v in gdf[key_column]]
+    else:
+        logger.warning(f"[ADJACENCY] No {key_column} column; using row numbers as ids")
+        ids = [str(i) for i in range(len(gdf))]
+
+    left, right, shared = shared_boundaries(gdf.geometry.to_numpy(), tolerance)
+    lengths = _lengths(shared, gdf.crs)
+
+    # Symmetric CSR: every edge in both directions, sorted by row then column
+    rows = np.concatenate([left, right])
+    cols = np.concatenate([right, left])
+    weights = np.concatenate([lengths, lengths])
+    order = np.lexsort((cols, rows))
+    indptr = np.zeros(len(ids) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=len(ids)), out=indptr[1:])
+    return AdjacencyGraph(
+        ids, indptr, cols[order].astype(np.int32), weights[order].astype(np.float64)
+    )
+
+
+def adjacency_paths_for(geojson_path: Path) -> tuple[Path, Path]:
+    """Return the (edge list JSON, CSR npz) paths written alongside a GeoJSON export."""
+    stem = geojson_path.stem
+    return (
+        geojson_path.with_name(f"{stem}.adjacency.json"),
+        geojson_path.with_name(f"{stem}.adjacency.npz"),
+    )
+
+
+def write_adjacency(
+    graph: AdjacencyGraph, geojson_path: Path, key_column: str, tolerance: float
+) -> tuple[Path, Path]:
+    """Write the edge list JSON and CSR npz for a layer and return their paths."""
+    json_path, npz_path = adjacency_paths_for(geojson_path)
+    json_path.parent.mkdir(parents=True, exist_ok=True)
+
+    i, j, lengths = graph.edges()
+    doc = {
+        "format": ADJACENCY_FORMAT,
+        "version": ADJACENCY_VERSION,
+        "key": key_column,
+        "length_unit": "m",
+        "tolerance": tolerance,
+        "ids": graph.ids,
+        "edges": [
+            [a, b, round(length, 1)]
+            for a, b, length in zip(i.tolist(), j.tolist(), lengths.tolist(), strict=True)
+        ],
+    }
+    with json_path.open("w", encoding="utf-8") as f:
+        json.dump(doc, f, separators=(",", ":"))
+
+    np.savez_compressed(
+        npz_path,
+        ids=np.array(graph.ids, dtype=str),
+        indptr=graph.indptr,
+        indices=graph.indices,
+        lengths=graph.lengths,
+    )
+    logger.info(
+        f"[ADJACENCY] {len(i)} adjacent pairs among {len(graph.ids)} districts "
+        f"written to {json_path.name} and {npz_path.name}"
+    )
+    return json_path, npz_path
+
+
+def load_adjacency(npz_path: Path) -> AdjacencyGraph:
+    """Load an adjacency graph from its CSR npz file."""
+    with np.load(npz_path, allow_pickle=False) as data:
+        return AdjacencyGraph(
+            data["ids"].tolist(), data["indptr"], data["indices"], data["lengths"]
+        )
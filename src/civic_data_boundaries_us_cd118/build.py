@@ -0,0 +1,145 @@
+"""Incremental build across fetch, export, chunk and index.
+
+File: build.py
+
+Used by civic-us-cd118 CLI:
+    civic-us-cd118 build
+
+Export decides what is current from the stamps in each vintage's
+national/manifest.yaml (export settings hash, shapefile fingerprint and
+package version): only states whose stamp changed are re-exported, and states
+that are no longer in the input have their outputs deleted. The build then
+refreshes what lies downstream of the rewritten files (chunks and their
+index.json entries) and reuses everything else.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import os
+from pathlib import Path
+import sys
+from typing import Any
+
+from civic_lib_core import log_utils
+
+from civic_data_boundaries_us_cd118 import fetch
+from civic_data_boundaries_us_cd118.export import chunk_folder
+from civic_data_boundaries_us_cd118.export_cd118 import ExportResult, export_cd118
+from civic_data_boundaries_us_cd118.index import build_index_main
+from civic_data_boundaries_us_cd118.outlines import outline_paths_for
+from civic_data_boundaries_us_cd118.utils import instrument
+from civic_data_boundaries_us_cd118.utils.get_paths import get_data_out_dir
+from civic_data_boundaries_us_cd118.vintages import Vintage
+
+logger = log_utils.logger
+
+__all__ = [
+    "main",
+    "run_build",
+]
+
+
+def _chunk_config(vintage: Vintage, path: Path) -> dict[str, Any] | None:
+    """Return the layer config whose chunk settings apply to a rewritten file.
+
+    Returns None for outputs that are not chunked (the outlines).
+    """
+    if path in outline_paths_for(vintage):
+        return None
+    is_national = path.parent == vintage.national_out_dir
+    return vintage.national if is_national else vintage.layer
+
+
+def _summary(result: ExportResult) -> dict[str, Any]:
+    logger.info(
+        f"[BUILD] {result.vintage.name}: rebuilt {len(result.exported)} state(s), "
+        f"reused {len(result.reused)}, removed {len(result.removed)}."
+    )
+    return {
+        "rebuilt": result.exported,
+        "reused": result.reused,
+        "removed": result.removed,
+        "national": result.vintage.national_path in result.written,
+    }
+
+
+def run_build(
+    force: bool = False, vintages: list[str] | None = None, workers: int | None = None
+) -> dict[str, dict[str, Any]]:
+    """Export, chunk and index only what changed since the last build.
+
+    All selected vintages are exported in one ``export_cd118`` run on a shared
+    thread pool; the rewritten files are then chunked in parallel and the
+    index is refreshed once at the end.
+
+    Args:
+        force (bool): Ignore the manifest stamps and rebuild every state.
+        vintages (list[str] | None): Vintages to build; None for all enabled.
+        workers (int | None): Worker threads (default: CPU count).
+
+    Returns:
+        dict: Per vintage, the lists of rebuilt, reused and removed state FIPS
+        codes and whether the nationwide file was rewritten.
+    """
+    out_dir = get_data_out_dir()
+
+    with instrument.span("export"):
+        results = export_cd118(force=force, vintages=vintages, workers=workers)
+
+    # Downstream: chunks for rewritten files, then only their index entries
+    with instrument.span("chunk", rollup_features=False):
+        folders = {
+            path.parent: cfg
+            for result in results.values()
+            for path in result.written
+            if (cfg := _chunk_config(result.vintage, path)) is not None
+        }
+        chunk_one_folder = instrument.bind(chunk_folder)
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+            jobs = [
+                pool.submit(chunk_one_folder, folder, cfg)
+                for folder, cfg in sorted(folders.items())
+            ]
+            for future in jobs:
+                future.result()
+
+    changed = {path for result in results.values() for path in result.written}
+    removed = any(result.removed for result in results.values())
+    if changed or removed or not (out_dir / "index.json").exists():
+        rel_changed = {str(p.relative_to(out_dir)) for p in changed}
+        with instrument.span("index", rollup_features=False):
+            if build_index_main(changed=rel_changed) != 0:
+                raise RuntimeError("Index build failed.")
+
+    return {name: _summary(result) for name, result in results.items()}
+
+
+def main(
+    skip_fetch: bool = False,
+    force: bool = False,
+    vintages: list[str] | None = None,
+    workers: int | None = None,
+) -> int:
+    """Run fetch (unless skipped) followed by an incremental export/chunk/index.
+
+    Args:
+        skip_fetch (bool): Do not download anything first.
+        force (bool): Rebuild every state regardless of its manifest stamp.
+        vintages (list[str] | None): Vintages to build; None for all enabled.
+        workers (int | None): Worker threads shared by every vintage.
+
+    Returns:
+        int: 0 if successful, 1 on error.
+    """
+    try:
+        with instrument.run("build"):
+            if not skip_fetch:
+                fetch.main(vintages=vintages)
+            run_build(force=force, vintages=vintages, workers=workers)
+        return 0
+    except Exception as e:
+        logger.error(f"Build failed: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+"""Sizes and sha256 checksums of everything published in data-out/.
+
+File: checksums.py
+
+Used by civic-us-cd118 CLI:
+    civic-us-cd118 verify
+
+The index stage hashes every output file in parallel (streamed in 1 MiB
+blocks) and records the results: each index.json entry gets the ``size``
+and ``sha256`` of its GeoJSON (and each chunk its ``sha256``), and
+manifest.json gets a ``files`` map of every published file. Clients can use
+the hashes as cache keys; ``verify`` re-hashes data-out/ against the map.
+
+The map also records each file's ``mtime_ns``, so an incremental index run
+re-hashes only the files whose size or mtime changed since the last manifest.
+
+The index, manifest and run reports describe the outputs rather
+than being outputs, so they are not hashed.
+"""
+
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+from pathlib import Path
+import sys
+from typing import NamedTuple, TypedDict
+
+from civic_lib_core import log_utils
+
+from civic_data_boundaries_us_cd118.utils import instrument
+from civic_data_boundaries_us_cd118.utils.fingerprint import file_sha256
+from civic_data_boundaries_us_cd118.utils.get_paths import get_data_out_dir
+
+logger = log_utils.logger
+
+__all__ = [
+    "UNCHECKED_FILES",
+    "FileChecksum",
+    "VerifyResult",
+    "checksum_outputs",
+    "hash_files",
+    "iter_outputs",
+    "load_manifest_checksums",
+    "main",
+    "verify_outputs",
+]
+
+UNCHECKED_FILES = frozenset({"index.json", "manifest.json", "run_report.json", "run_trace.json"})
+
+
+class FileChecksum(TypedDict):
+    """Size, modification time and content hash of one output file."""
+
+    size: int
+    mtime_ns: int
+    sha256: str
+
+
+class VerifyResult(NamedTuple):
+    """Outcome of checking data-out/ against manifest.json."""
+
+    ok: list[str]
+    mismatched: list[str]  # size or sha256 differs
+    missing: list[str]  # listed but not on disk
+    unlisted: list[str]  # on disk but not listed
+
+
+def iter_outputs(out_dir: Path) -> Iterable[Path]:
+    """Yield the published files under ``out_dir``, in path order.
+
+    Skips UNCHECKED_FILES, hidden files and partially written files.
+    """
+    for path in sorted(out_dir.rglob("*")):
+        name = path.name
+        if (
+            path.is_file()
+            and name not in UNCHECKED_FILES
+            and not name.startswith(".")
+            and not name.endswith((".part", ".tmp"))
+        ):
+            yield path
+
+
+def _checksum(path: Path) -> FileChecksum:
+    st = path.stat()
+    instrument.add(bytes_read=st.st_size)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": file_sha256(path)}
+
+
+def hash_files(paths: Iterable[Path], workers: int | None = None) -> dict[Path, FileChecksum]:
+    """Hash files in parallel threads (hashlib releases the GIL on large blocks)."""
+    paths = list(paths)
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        return dict(zip(paths, pool.map(instrument.bind(_checksum), paths), strict=True))
+
+
+def load_manifest_checksums(out_dir: Path | None = None) -> dict[str, FileChecksum]:
+    """Return the ``files`` map of manifest.json, or {} if there is none to read."""
+    manifest_path = (out_dir or get_data_out_dir()) / "manifest.json"
+    if not manifest_path.exists():
+        return {}
+    try:
+        with manifest_path.open(encoding="utf-8") as f:
+            return json.load(f).get("files") or {}
+    except (OSError, ValueError, AttributeError) as e:
+        logger.warning(f"Ignoring unreadable {manifest_path.name}: {e}")
+        return {}
+
+
+def checksum_outputs(
+    out_dir: Path | None = None,
+    workers: int | None = None,
+    previous: dict[str, FileChecksum] | None = None,
+) -> dict[str, FileChecksum]:
+    """Return {path relative to data-out/: FileChecksum} for every published file.
+
+    Args:
+        out_dir (Path | None): Folder to scan; defaults to data-out/.
+        workers (int | None): Hashing threads (default: CPU count).
+        previous (dict | None): Checksums from an earlier run, e.g. from
+            ``load_manifest_checksums``. A file whose size and mtime_ns match
+            its previous entry keeps that entry and is not read again.
+    """
+    out_dir = out_dir or get_data_out_dir()
+    previous = previous or {}
+    checksums: dict[str, FileChecksum] = {}
+    stale: list[Path] = []
+    for path in iter_outputs(out_dir):
+        rel = str(path.relative_to(out_dir))
+        prev = previous.get(rel)
+        st = path.stat()
+        if prev and prev.get("size") == st.st_size and prev.get("mtime_ns") == st.st_mtime_ns:
+            checksums[rel] = prev
+        else:
+            stale.append(path)
+
+    for path, checksum in hash_files(stale, workers).items():
+        checksums[str(path.relative_to(out_dir))] = checksum
+    return dict(sorted(checksums.items()))
+
+
+def verify_outputs(out_dir: Path | None = None, workers: int | None = None) -> VerifyResult:
+    """Re-hash data-out/ and compare it with the ``files`` map of manifest.json.
+
+    Raises:
+        FileNotFoundError: If manifest.json does not exist.
+        ValueError: If manifest.json has no ``files`` map (written before checksums).
+    """
+    out_dir = out_dir or get_data_out_dir()
+    with (out_dir / "manifest.json").open(encoding="utf-8") as f:
+        expected = json.load(f).get("files")
+    if expected is None:
+        raise ValueError("manifest.json has no 'files' checksums; run the index stage first")
+
+    listed = [rel for rel in sorted(expected) if (out_dir / rel).is_file()]
+    actual = hash_files([out_dir / rel for rel in listed], workers)
+
+    ok: list[str] = []
+    mismatched: list[str] = []
+    for rel in listed:
+        got = actual[out_dir / rel]
+        want = expected[rel]
+        if got["size"] == want.get("size") and got["sha256"] == want.get("sha256"):
+            ok.append(rel)
+        else:
+            mismatched.append(rel)
+
+    on_disk = {str(p.relative_to(out_dir)) for p in iter_outputs(out_dir)}
+    return VerifyResult(
+        ok,
+        mismatched,
+        missing=sorted(set(expected) - set(listed)),
+        unlisted=sorted(on_disk - set(expected)),
+    )
+
+
+def main(workers: int | None = None) -> int:
+    """Verify data-out/ against manifest.json.
+
+    Returns:
+        int: 0 if every listed file matches, 1 otherwise.
+    """
+    try:
+        with instrument.run("verify"):
+            result = verify_outputs(workers=workers)
+    except Exception as e:
+        logger.error(f"Verify failed: {e}")
+        return 1
+
+    for rel in result.mismatched:
+        logger.error(f"[VERIFY] Checksum mismatch: {rel}")
+    for rel in result.missing:
+        logger.error(f"[VERIFY] Missing: {rel}")
+    for rel in result.unlisted:
+        logger.warning(f"[VERIFY] Not in manifest.json: {rel}")
+    logger.info(
+        f"[VERIFY] {len(result.ok)} ok, {len(result.mismatched)} mismatched, "
+        f"{len(result.missing)} missing, {len(result.unlisted)} unlisted"
+    )
+    return 1 if result.mismatched or result.missing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,299 @@
+"""Spatially coherent chunking of exported GeoJSON layers.
+
+File: chunking.py
+
+Orders features along a Hilbert curve (or splits them by quadtree) so that
+each chunk covers a compact area, then packs them into chunk files no larger
+than a target byte size. Chunk bounding boxes are written to a ``chunks.json``
+sidecar, which the index stage folds into index.json.
+"""
+
+from collections.abc import Iterable
+import json
+from pathlib import Path
+from typing import Any, TypedDict
+
+from civic_lib_core import log_utils
+import numpy as np
+
+from civic_data_boundaries_us_cd118.remote import BBox, feature_bbox
+
+logger = log_utils.logger
+
+__all__ = [
+    "CHUNKS_DIR_SUFFIX",
+    "CHUNKS_SIDECAR",
+    "CHUNK_MODES",
+    "LEGACY_CHUNKS_DIR_SUFFIX",
+    "ChunkRecord",
+    "chunk_spatial",
+    "chunks_dir_for",
+    "feature_bbox",
+    "hilbert_index",
+    "order_by_hilbert",
+    "pack_by_bytes",
+    "read_chunk_sidecar",
+    "split_by_quadtree",
+]
+
+# "features" keeps the original feature-count slicing from civic_lib_geo
+CHUNK_MODES = ("features", "hilbert", "quadtree")
+
+CHUNKS_DIR_SUFFIX = "_chunks"
+# Directories that civic_lib_geo's folder chunker wrote next to each file
+LEGACY_CHUNKS_DIR_SUFFIX = "_chunked.geojson"
+CHUNKS_SIDECAR = "chunks.json"
+
+HILBERT_ORDER = 16
+QUADTREE_MAX_DEPTH = 12
+
+_COLLECTION_HEAD = b'{"type":"FeatureCollection",'
+_FEATURES_HEAD = b'"features":['
+_COLLECTION_TAIL = b"]}"
+
+
+class ChunkRecord(TypedDict):
+    """Metadata for a single chunk file, as stored in the chunks.json sidecar."""
+
+    path: str  # chunk filename, relative to the chunks directory
+    bbox: list[float]
+    features: int
+    bytes: int
+
+
+def chunks_dir_for(geojson_path: Path) -> Path:
+    """Return the directory holding the spatial chunks of a GeoJSON file."""
+    return geojson_path.with_name(geojson_path.stem + CHUNKS_DIR_SUFFIX)
+
+
+def _union_bbox(bboxes: Iterable[BBox]) -> BBox:
+    minx, miny, maxx, maxy = zip(*bboxes, strict=True)
+    return min(minx), min(miny), max(maxx), max(maxy)
+
+
+def hilbert_index(x: np.ndarray, y: np.ndarray, order: int = HILBERT_ORDER) -> np.ndarray:
+    """Compute Hilbert curve distances for integer grid coordinates.
+
+    Args:
+        x (np.ndarray): Integer x positions in [0, 2**order).
+        y (np.ndarray): Integer y positions in [0, 2**order).
+        order (int): Curve order; the grid is 2**order cells on a side.
+
+    Returns:
+        np.ndarray: Distance along the curve for each (x, y) pair.
+    """
+    n = 1 << order
+    x = np.asarray(x, dtype=np.int64).copy()
+    y = np.asarray(y, dtype=np.int64).copy()
+    d = np.zeros_like(x)
+
+    s = n >> 1
+    while s > 0:
+        rx = ((x & s) > 0).astype(np.int64)
+        ry = ((y & s) > 0).astype(np.int64)
+        d += s * s * ((3 * rx) ^ ry)
+
+        # Rotate the quadrant so the sub-curve has the right orientation
+        flip = (ry == 0) & (rx == 1)
+        x = np.where(flip, n - 1 - x, x)
+        y = np.where(flip, n - 1 - y, y)
+        swap = ry == 0
+        x, y = np.where(swap, y, x), np.where(swap, x, y)
+        s >>= 1
+
+    return d
+
+
+def order_by_hilbert(bboxes: list[BBox], order: int = HILBERT_ORDER) -> list[int]:
+    """Return feature indices sorted by the Hilbert distance of their bbox centers."""
+    if not bboxes:
+        return []
+
+    boxes = np.asarray(bboxes, dtype=np.float64)
+    cx = (boxes[:, 0] + boxes[:, 2]) / 2
+    cy = (boxes[:, 1] + boxes[:, 3]) / 2
+
+    span_x = float(cx.max() - cx.min()) or 1.0
+    span_y = float(cy.max() - cy.min()) or 1.0
+    cells = (1 << order) - 1
+    gx = np.floor((cx - cx.min()) / span_x * cells)
+    gy = np.floor((cy - cy.min()) / span_y * cells)
+
+    return np.argsort(hilbert_index(gx, gy, order), kind="stable").tolist()
+
+
+def pack_by_bytes(
+    indices: list[int], sizes: list[int], target_bytes: int, max_features: int
+) -> list[list[int]]:
+    """Greedily pack ordered features into chunks bounded by size and count.
+
+    A single feature larger than ``target_bytes`` gets a chunk of its own.
+    """
+    chunks: list[list[int]] = []
+    current: list[int] = []
+    current_bytes = 0
+
+    for i in indices:
+        too_big = current_bytes + sizes[i] > target_bytes
+        too_many = len(current) >= max_features
+        if current and (too_big or too_many):
+            chunks.append(current)
+            current, current_bytes = [], 0
+        current.append(i)
+        current_bytes += sizes[i]
+
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def split_by_quadtree(
+    indices: list[int],
+    bboxes: list[BBox],
+    sizes: list[int],
+    target_bytes: int,
+    max_features: int,
+    bounds: BBox | None = None,
+    depth: int = 0,
+) -> list[list[int]]:
+    """Recursively split features into quadrants until each leaf fits a chunk.
+
+    Features are assigned to the quadrant containing their bbox center.
+    Leaves that still exceed the limits at ``QUADTREE_MAX_DEPTH`` are packed
+    greedily.
+    """
+    if not indices:
+        return []
+
+    total = sum(sizes[i] for i in indices)
+    fits = total <= target_bytes and len(indices) <= max_features
+    if fits or len(indices) == 1 or depth >= QUADTREE_MAX_DEPTH:
+        return pack_by_bytes(indices, sizes, target_bytes, max_features)
+
+    minx, miny, maxx, maxy = bounds or _union_bbox(bboxes[i] for i in indices)
+    midx = (minx + maxx) / 2
+    midy = (miny + maxy) / 2
+
+    # Quadrants in Z order: SW, SE, NW, NE
+    quadrants: list[list[int]] = [[], [], [], []]
+    for i in indices:
+        b = bboxes[i]
+        east = (b[0] + b[2]) / 2 >= midx
+        north = (b[1] + b[3]) / 2 >= midy
+        quadrants[int(east) + 2 * int(north)].append(i)
+
+    quadrant_bounds: list[BBox] = [
+        (minx, miny, midx, midy),
+        (midx, miny, maxx, midy),
+        (minx, midy, midx, maxy),
+        (midx, midy, maxx, maxy),
+    ]
+
+    chunks: list[list[int]] = []
+    for members, qb in zip(quadrants, quadrant_bounds, strict=True):
+        chunks.extend(
+            split_by_quadtree(members, bboxes, sizes, target_bytes, max_features, qb, depth + 1)
+        )
+    return chunks
+
+
+def _encode_feature(feature: dict[str, Any]) -> bytes:
+    return json.dumps(feature, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _write_chunk(path: Path, encoded: list[bytes], crs: Any) -> int:
+    """Write pre-encoded features as a compact FeatureCollection and return its size."""
+    head = _COLLECTION_HEAD
+    if crs is not None:
+        head += b'"crs":' + json.dumps(crs, separators=(",", ":")).encode("utf-8") + b","
+    payload = head + _FEATURES_HEAD + b",".join(encoded) + _COLLECTION_TAIL
+    path.write_bytes(payload)
+    return len(payload)
+
+
+def chunk_spatial(
+    geojson_path: Path,
+    mode: str = "hilbert",
+    target_bytes: int = 250_000,
+    max_features: int = 500,
+) -> list[ChunkRecord]:
+    """Split a GeoJSON FeatureCollection into spatially coherent chunks.
+
+    Chunks are written to ``<stem>_chunks/`` next to the input file along with
+    a ``chunks.json`` sidecar listing each chunk's bbox, feature count and size.
+
+    Args:
+        geojson_path (Path): Input GeoJSON FeatureCollection.
+        mode (str): "hilbert" or "quadtree".
+        target_bytes (int): Target maximum size of each chunk file in bytes.
+        max_features (int): Maximum features per chunk.
+
+    Returns:
+        list[ChunkRecord]: One record per chunk written.
+
+    Raises:
+        ValueError: If the mode is unknown.
+        TypeError: If the file is not a FeatureCollection (``features`` is not a list).
+    """
+    if mode not in ("hilbert", "quadtree"):
+        raise ValueError(f"Unsupported spatial chunk mode: {mode}")
+
+    geojson = json.loads(geojson_path.read_text(encoding="utf-8"))
+    features = geojson.get("features")
+    if not isinstance(features, list):
+        raise TypeError(f"Invalid GeoJSON: missing or malformed 'features' in {geojson_path}")
+
+    # Features without coordinates cannot be placed; keep them in a trailing chunk
+    placed: list[int] = []
+    unplaced: list[int] = []
+    bboxes: list[BBox] = []
+    for i, feature in enumerate(features):
+        bbox = feature_bbox(feature)
+        if bbox is None:
+            unplaced.append(i)
+            bboxes.append((0.0, 0.0, 0.0, 0.0))
+        else:
+            placed.append(i)
+            bboxes.append(bbox)
+
+    encoded = [_encode_feature(f) for f in features]
+    sizes = [len(e) + 1 for e in encoded]  # +1 for the separating comma
+
+    if mode == "hilbert":
+        ordered = order_by_hilbert([bboxes[i] for i in placed])
+        groups = pack_by_bytes([placed[j] for j in ordered], sizes, target_bytes, max_features)
+    else:
+        groups = split_by_quadtree(placed, bboxes, sizes, target_bytes, max_features)
+    groups.extend(pack_by_bytes(unplaced, sizes, target_bytes, max_features))
+    unplaced_set = set(unplaced)
+
+    chunks_dir = chunks_dir_for(geojson_path)
+    chunks_dir.mkdir(parents=True, exist_ok=True)
+    for stale in chunks_dir.glob("*.geojson"):
+        stale.unlink()
+
+    records: list[ChunkRecord] = []
+    for n, group in enumerate(groups, start=1):
+        chunk_path = chunks_dir / f"{geojson_path.stem}_chunk_{n}.geojson"
+        size = _write_chunk(chunk_path, [encoded[i] for i in group], geojson.get("crs"))
+        group_boxes = [bboxes[i] for i in group if i not in unplaced_set]
+        bbox = [round(v, 6) for v in _union_bbox(group_boxes)] if group_boxes else []
+        records.append(
+            {"path": chunk_path.name, "bbox": bbox, "features": len(group), "bytes": size}
+        )
+
+    sidecar = chunks_dir / CHUNKS_SIDECAR
+    with sidecar.open("w", encoding="utf-8") as f:
+        json.dump({"source": geojson_path.name, "mode": mode, "chunks": records}, f, indent=2)
+
+    logger.info(f"Wrote {len(records)} {mode} chunks for {geojson_path.name} to {chunks_dir}")
+    return records
+
+
+def read_chunk_sidecar(geojson_path: Path) -> list[ChunkRecord] | None:
+    """Return the chunk records written for a GeoJSON file, or None if unchunked."""
+    sidecar = chunks_dir_for(geojson_path) / CHUNKS_SIDECAR
+    if not sidecar.exists():
+        return None
+    with sidecar.open(encoding="utf-8") as f:
+        return json.load(f).get("chunks", [])
@@ -2,81 +2,245 @@
 
 This module provides functions to clean up downloaded and extracted boundary data files,
 including ZIP archives and shapefile sets, from the data input directory.
+
+Cleanup runs in two steps. ``plan_cleanup`` walks data-in/ once, without
+changing anything, and lists the files to delete with their sizes according to
+a retention policy. ``execute_plan`` then deletes those files in parallel and
+removes directories left empty. A dry run stops after the plan.
 """
 
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import os
 from pathlib import Path
-import shutil
 import sys
+from typing import NamedTuple
 
 from civic_lib_core import log_utils
 
 logger = log_utils.logger
 
+__all__ = [
+    "RETENTION_POLICIES",
+    "SHAPEFILE_EXTENSIONS",
+    "CleanupPlan",
+    "CleanupResult",
+    "PlannedDeletion",
+    "clean_data_in_dir",
+    "execute_plan",
+    "main",
+    "plan_cleanup",
+]
+
 # All known shapefile extensions
 SHAPEFILE_EXTENSIONS = {".shp", ".shx", ".dbf", ".prj", ".cpg"}
 
+# What each policy keeps: "none" deletes zips and extracted shapefiles,
+# "zips" keeps downloaded archives, "extracted" keeps extracted shapefiles
+RETENTION_POLICIES: dict[str, frozenset[str]] = {
+    "none": frozenset(),
+    "zips": frozenset({"zip"}),
+    "extracted": frozenset({"extracted"}),
+}
 
-def clean_data_in_dir(data_in_dir: Path):
-    """Delete all .zip files and entire shapefile sets from data-in/.
 
-    Including loose shapefiles and extracted folders.
+class PlannedDeletion(NamedTuple):
+    """A file the cleanup will delete."""
 
-    Keeps chunked GeoJSONs safe in data-out.
+    path: Path
+    kind: str  # "zip" or "extracted"
+    bytes: int
+
+
+class CleanupPlan(NamedTuple):
+    """Everything one cleanup run will delete, built before anything is deleted."""
+
+    root: Path
+    policy: str
+    deletions: list[PlannedDeletion]
+    directories: list[Path]  # removed after the files, if left empty; deepest first
+
+    @property
+    def total_bytes(self) -> int:
+        """Return the number of bytes the plan reclaims."""
+        return sum(d.bytes for d in self.deletions)
+
+    def counts(self) -> dict[str, int]:
+        """Return the number of planned file deletions per kind."""
+        return dict(Counter(d.kind for d in self.deletions))
+
+
+class CleanupResult(NamedTuple):
+    """Outcome of executing a CleanupPlan."""
+
+    deleted_files: int
+    deleted_dirs: int
+    reclaimed_bytes: int
+    failed: int
+
+
+def _format_bytes(size: int) -> str:
+    return f"{size / 1e6:.2f} MB"
+
+
+def _shapefile_bases(filenames: list[str]) -> set[str]:
+    """Return the base names of shapefile sets among the files of one directory."""
+    return {name[: -len(".shp")] for name in filenames if name.lower().endswith(".shp")}
+
+
+def _classify(name: str, shapefile_bases: set[str]) -> str | None:
+    """Return the kind of a file in data-in/, or None if cleanup leaves it alone."""
+    lower = name.lower()
+    if lower.endswith(".zip"):
+        return "zip"
+    if Path(lower).suffix in SHAPEFILE_EXTENSIONS:
+        return "extracted"
+    # Sidecars of a shapefile set, e.g. tl_2022_27_cd118.shp.iso.xml
+    if any(name.startswith(base + ".") for base in shapefile_bases):
+        return "extracted"
+    return None
+
+
+def plan_cleanup(data_in_dir: Path, policy: str = "none") -> CleanupPlan:
+    """Scan data-in/ once and list what the given retention policy deletes.
+
+    Nothing is modified. Symlinked directories are not followed.
+
+    Args:
+        data_in_dir (Path): Directory to clean, usually data-in/.
+        policy (str): One of ``RETENTION_POLICIES``.
+
+    Returns:
+        CleanupPlan: Files to delete and directories to remove if left empty.
     """
+    if policy not in RETENTION_POLICIES:
+        raise ValueError(
+            f"Unknown retention policy '{policy}'; use one of {list(RETENTION_POLICIES)}"
+        )
+    keep = RETENTION_POLICIES[policy]
+
+    deletions: list[PlannedDeletion] = []
+    directories: list[Path] = []
     if not data_in_dir.exists():
-        logger.info(f"No cleanup needed. Folder does not exist: {data_in_dir}")
-        return
+        return CleanupPlan(data_in_dir, policy, deletions, directories)
 
-    deleted_files = 0
-    deleted_dirs = 0
-    deleted_sets = 0
-
-    # Track which shapefile base names we've already deleted
-    shapefile_bases_deleted: set[Path] = set()
-
-    for path in data_in_dir.rglob("*"):
-        # Delete .zip files
-        if path.is_file() and path.suffix == ".zip":
-            path.unlink()
-            logger.info(f"Deleted zip file: {path}")
-            deleted_files += 1
-
-        # Delete entire shapefile sets for any .shp file found
-        elif path.is_file() and path.suffix.lower() == ".shp":
-            base = path.with_suffix("")
-            if base in shapefile_bases_deleted:
+    for dirpath, dirnames, filenames in os.walk(data_in_dir):
+        current = Path(dirpath)
+        if current != data_in_dir:
+            directories.append(current)
+        bases = _shapefile_bases(filenames)
+        for name in filenames:
+            kind = _classify(name, bases)
+            if kind is None or kind in keep:
                 continue
+            path = current / name
+            try:
+                size = path.stat(follow_symlinks=False).st_size
+            except FileNotFoundError:
+                continue
+            deletions.append(PlannedDeletion(path, kind, size))
+        dirnames.sort()
+
+    directories.sort(key=lambda p: len(p.parts), reverse=True)
+    return CleanupPlan(data_in_dir, policy, deletions, directories)
+
+
+def _delete(deletion: PlannedDeletion) -> str:
+    """Delete one file and return "deleted", "missing" or "failed"."""
+    try:
+        deletion.path.unlink()
+        return "deleted"
+    except FileNotFoundError:
+        return "missing"
+    except OSError as e:
+        logger.warning(f"Could not delete {deletion.path}: {e}")
+        return "failed"
+
+
+def execute_plan(plan: CleanupPlan, workers: int | None = None) -> CleanupResult:
+    """Delete the planned files in parallel, then remove directories left empty.
+
+    Files that have disappeared since the scan are skipped. Directories that
+    still hold anything (kept files, unrelated files) are left in place.
+
+    Args:
+        plan (CleanupPlan): Plan from ``plan_cleanup``.
+        workers (int | None): Deletion threads; defaults to min(32, CPU count + 4).
+
+    Returns:
+        CleanupResult: Counts of what was deleted.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        outcomes = list(pool.map(_delete, plan.deletions))
+
+    deleted_dirs = 0
+    for directory in plan.directories:
+        try:
+            directory.rmdir()
+            deleted_dirs += 1
+        except OSError:
+            continue  # not empty, or already gone
+
+    deleted = [
+        d for d, outcome in zip(plan.deletions, outcomes, strict=True) if outcome == "deleted"
+    ]
+    return CleanupResult(
+        deleted_files=len(deleted),
+        deleted_dirs=deleted_dirs,
+        reclaimed_bytes=sum(d.bytes for d in deleted),
+        failed=outcomes.count("failed"),
+    )
+
+
+def clean_data_in_dir(
+    data_in_dir: Path, policy: str = "none", dry_run: bool = False, workers: int | None = None
+) -> CleanupPlan:
+    """Delete .zip files and shapefile sets from data-in/, as the policy allows.
+
+    Keeps chunked GeoJSONs safe in data-out.
 
-            # Gather all extensions belonging to this shapefile set
-            for ext in SHAPEFILE_EXTENSIONS:
-                file_path = base.with_suffix(ext)
-                if file_path.exists():
-                    file_path.unlink()
-                    logger.info(f"Deleted shapefile component: {file_path}")
-                    deleted_files += 1
+    Args:
+        data_in_dir (Path): Directory to clean, usually data-in/.
+        policy (str): Retention policy, see ``RETENTION_POLICIES``.
+        dry_run (bool): Only report what would be deleted.
+        workers (int | None): Deletion threads.
 
-            shapefile_bases_deleted.add(base)
-            deleted_sets += 1
+    Returns:
+        CleanupPlan: The plan that was (or, in a dry run, would be) executed.
+    """
+    if not data_in_dir.exists():
+        logger.info(f"No cleanup needed. Folder does not exist: {data_in_dir}")
+        return plan_cleanup(data_in_dir, policy)
+
+    plan = plan_cleanup(data_in_dir, policy)
+    counts = plan.counts()
+    summary = (
+        f"{counts.get('zip', 0)} zip file(s) and {counts.get('extracted', 0)} "
+        f"extracted shapefile file(s), {_format_bytes(plan.total_bytes)}"
+    )
 
-        # Delete folders that contain any shapefiles
-        elif path.is_dir():
-            if any(p.suffix.lower() in SHAPEFILE_EXTENSIONS for p in path.rglob("*")):
-                shutil.rmtree(path)
-                logger.info(f"Deleted shapefile folder: {path}")
-                deleted_dirs += 1
+    if dry_run:
+        for deletion in plan.deletions:
+            logger.info(f"Would delete {deletion.kind}: {deletion.path} ({deletion.bytes} bytes)")
+        logger.info(f"Dry run (retain: {policy}): would delete {summary}.")
+        return plan
 
+    result = execute_plan(plan, workers=workers)
+    if result.failed:
+        logger.warning(f"Cleanup could not delete {result.failed} file(s).")
     logger.info(
-        f"Cleanup complete. Deleted {deleted_files} file(s), {deleted_dirs} folder(s), "
-        f"and {deleted_sets} shapefile set(s)."
+        f"Cleanup complete (retain: {policy}). Deleted {result.deleted_files} file(s) and "
+        f"{result.deleted_dirs} empty folder(s), reclaimed {_format_bytes(result.reclaimed_bytes)}."
     )
+    return plan
 
 
-def main() -> int:
+def main(policy: str = "none", dry_run: bool = False, workers: int | None = None) -> int:
     """Clean up US Congressional District 118 boundary data.
 
     This function orchestrates the cleanup of data files in the input directory by:
     1. Retrieving the input data directory path
-    2. Executing the cleanup process on all files in that directory
+    2. Planning and (unless ``dry_run``) executing the cleanup under ``policy``
     3. Handling any exceptions that occur during the process
 
     Returns:
@@ -90,7 +254,7 @@ def main() -> int:
         from civic_data_boundaries_us_cd118.utils.get_paths import get_data_in_dir
 
         data_in = get_data_in_dir()
-        clean_data_in_dir(data_in)
+        clean_data_in_dir(data_in, policy=policy, dry_run=dry_run, workers=workers)
         return 0
     except Exception as e:
         logger.error(f"Cleanup failed: {e}")
@@ -4,55 +4,276 @@ File: cli.py
 
 Provides commands for:
 - Fetching TIGER/Line shapefiles
+- Incrementally rebuilding only what changed
+- Sharding a build across machines
 - Exporting and chunking all GeoJSON files
 - Generating spatial indexes and summaries
+- Comparing two vintages' districts
+- Building a PMTiles vector tile pyramid
+- Serving data-out/ over HTTP
 
 Run `civic-usa --help` for usage.
+
+Command modules are imported inside each command so that startup, `--help`
+and light commands like `cleanup` never load geopandas, pandas or shapely.
 """
 
+import os
+from pathlib import Path
 import sys
 
 from civic_lib_core import log_utils
 import typer
 
-from civic_data_boundaries_us_cd118 import cleanup, export, fetch, index
+from civic_data_boundaries_us_cd118.utils.get_paths import (
+    CACHE_DIR_ENV,
+    CONFIG_DIR_ENV,
+    DATA_IN_DIR_ENV,
+    DATA_OUT_DIR_ENV,
+    ROOT_DIR_ENV,
+)
 
 logger = log_utils.logger
 
 app = typer.Typer(help="Civic USA CD118 CLI — TIGER-based boundary export and indexing")
 
 
+@app.callback()
+def paths_callback(
+    root: str | None = typer.Option(
+        None, "--root", help=f"Project root for data-in/, data-out/ [{ROOT_DIR_ENV}]."
+    ),
+    data_in: str | None = typer.Option(
+        None, "--data-in", help=f"Raw downloads and shapefiles [{DATA_IN_DIR_ENV}]."
+    ),
+    data_out: str | None = typer.Option(
+        None, "--data-out", help=f"Exported outputs [{DATA_OUT_DIR_ENV}]."
+    ),
+    cache_dir: str | None = typer.Option(
+        None, "--cache-dir", help=f"Shared download cache [{CACHE_DIR_ENV}]."
+    ),
+    config_dir: str | None = typer.Option(
+        None, "--config-dir", help=f"Layer YAML configs [{CONFIG_DIR_ENV}]."
+    ),
+):
+    """Set data, cache and config roots for all commands (overrides the environment)."""
+    # Exported to the environment so worker processes resolve the same paths
+    for env, value in (
+        (ROOT_DIR_ENV, root),
+        (DATA_IN_DIR_ENV, data_in),
+        (DATA_OUT_DIR_ENV, data_out),
+        (CACHE_DIR_ENV, cache_dir),
+        (CONFIG_DIR_ENV, config_dir),
+    ):
+        if value is not None:
+            os.environ[env] = str(Path(value).expanduser().resolve())
+
+
+def _split_vintages(value: str | None) -> list[str] | None:
+    """Turn a --vintage value into a list of names, or None for all enabled vintages."""
+    names = [name.strip() for name in (value or "").split(",") if name.strip()]
+    return names or None
+
+
 @app.command("fetch")
-def fetch_command():
-    """Download required TIGER shapefiles (CD118) into data-in/.
+def fetch_command(
+    vintage: str | None = typer.Option(
+        None,
+        "--vintage",
+        help="Comma-separated vintages to fetch, e.g. cd118,cd119 (default all enabled).",
+    ),
+):
+    """Download required TIGER shapefiles (CD118 and other vintages) into data-in/.
 
     Skips download if files already exist.
     """
-    fetch.main()
+    from civic_data_boundaries_us_cd118 import fetch
+
+    raise typer.Exit(fetch.main(vintages=_split_vintages(vintage)))
 
 
 @app.command("export")
-def export_command():
+def export_command(
+    force: bool = typer.Option(False, "--force", help="Re-export states with unchanged stamps."),
+    vintage: str | None = typer.Option(
+        None,
+        "--vintage",
+        help="Comma-separated vintages to export, e.g. cd118,cd119 (default all enabled).",
+    ),
+    workers: int | None = typer.Option(None, help="Worker threads shared by all vintages."),
+):
     """Export and chunk all data from TIGER into app-ready GeoJSON in data-out/.
 
-    Includes CD118 layers.
+    Includes every enabled vintage (CD118 and others in data-config/). States
+    whose manifest stamp is unchanged are skipped.
     """
-    export.main()
+    from civic_data_boundaries_us_cd118 import export
+
+    raise typer.Exit(export.main(force=force, vintages=_split_vintages(vintage), workers=workers))
 
 
 @app.command("index")
 def index_command():
     """Generate index.json and other summary metadata files in data-out/."""
-    index.main()
+    from civic_data_boundaries_us_cd118 import index
+
+    raise typer.Exit(index.main())
+
+
+@app.command("build")
+def build_command(
+    skip_fetch: bool = typer.Option(False, "--skip-fetch", help="Do not run fetch first."),
+    force: bool = typer.Option(False, "--force", help="Ignore manifest stamps and rebuild all."),
+    vintage: str | None = typer.Option(
+        None,
+        "--vintage",
+        help="Comma-separated vintages to build, e.g. cd118,cd119 (default all enabled).",
+    ),
+    workers: int | None = typer.Option(None, help="Worker threads shared by all vintages."),
+):
+    """Fetch, then export, chunk and index only the states whose inputs changed.
+
+    All vintages are built in one run on a shared worker pool. What is current
+    is decided by the stamps in each vintage's national/manifest.yaml.
+    """
+    from civic_data_boundaries_us_cd118 import build
+
+    raise typer.Exit(
+        build.main(
+            skip_fetch=skip_fetch, force=force, vintages=_split_vintages(vintage), workers=workers
+        )
+    )
+
+
+@app.command("shard")
+def shard_command(
+    step: str = typer.Argument(..., help="plan, work or reduce."),
+    work_dir: str | None = typer.Option(
+        None,
+        "--work-dir",
+        help="Directory shared by all nodes (default: shards/ next to data-out/).",
+    ),
+    vintage: str | None = typer.Option(
+        None, "--vintage", help="plan: comma-separated vintages (default all enabled)."
+    ),
+    shard_size: int = typer.Option(4, "--shard-size", help="plan: states per shard."),
+    processes: int | None = typer.Option(
+        None, help="work: local worker processes (default: CPU count)."
+    ),
+    skip_fetch: bool = typer.Option(
+        False, "--skip-fetch", help="work: use shapefiles already in data-in/."
+    ),
+    workers: int | None = typer.Option(None, help="reduce: threads reading state files."),
+):
+    """Run a build across many machines: plan shards, work on them, then reduce.
+
+    Run `plan` once, `work` on every node (each claims unfinished shards via
+    file locks in the work directory), and `reduce` once all shards are done
+    to write the nationwide files, manifests and index.json.
+    """
+    from civic_data_boundaries_us_cd118 import shards
+
+    raise typer.Exit(
+        shards.main(
+            step,
+            work_dir=Path(work_dir).expanduser().resolve() if work_dir else None,
+            vintages=_split_vintages(vintage),
+            shard_size=shard_size,
+            processes=processes,
+            fetch=not skip_fetch,
+            workers=workers,
+        )
+    )
+
+
+@app.command("diff")
+def diff_command(
+    old: str = typer.Argument(..., help="Vintage to compare from, e.g. cd118."),
+    new: str = typer.Argument(..., help="Vintage to compare to, e.g. cd119."),
+    min_area: float = typer.Option(
+        10_000.0, "--min-area", help="Drop overlaps smaller than this many square meters."
+    ),
+    workers: int | None = typer.Option(None, help="Worker threads (default: CPU count)."),
+):
+    """Compare two exported vintages state by state.
+
+    Writes the area that changed district and a district-to-district overlap
+    table to data-out/<new vintage>/diff/.
+    """
+    from civic_data_boundaries_us_cd118 import diff
+
+    raise typer.Exit(diff.main(old, new, min_area=min_area, workers=workers))
+
+
+@app.command("verify")
+def verify_command(
+    workers: int | None = typer.Option(None, help="Worker threads (default: CPU count)."),
+):
+    """Check data-out/ against the sizes and sha256 checksums in manifest.json.
+
+    Exits 1 if any listed file is missing or differs.
+    """
+    from civic_data_boundaries_us_cd118 import checksums
+
+    raise typer.Exit(checksums.main(workers=workers))
+
+
+@app.command("tiles")
+def tiles_command(
+    vintage: str = typer.Option("cd118", "--vintage", help="Vintage to build tiles for."),
+    min_zoom: int | None = typer.Option(None, help="Lowest zoom level (default from config)."),
+    max_zoom: int | None = typer.Option(None, help="Highest zoom level (default from config)."),
+    workers: int | None = typer.Option(None, help="Worker processes (default: CPU count)."),
+):
+    """Build a PMTiles vector tile pyramid from a vintage's nationwide GeoJSON in data-out/."""
+    from civic_data_boundaries_us_cd118 import tiles
+
+    raise typer.Exit(
+        tiles.main(vintage=vintage, min_zoom=min_zoom, max_zoom=max_zoom, workers=workers)
+    )
 
 
 @app.command("cleanup")
-def cleanup_command():
+def cleanup_command(
+    dry_run: bool = typer.Option(
+        False, "--dry-run", help="List what would be deleted and the bytes reclaimed."
+    ),
+    retain: str = typer.Option(
+        "none", "--retain", help="Keep 'zips' or 'extracted' shapefiles; 'none' deletes both."
+    ),
+    workers: int | None = typer.Option(None, help="Deletion threads."),
+):
     """Cleanup temporary files and directories created during export.
 
-    Deletes all .zip files and extracted shapefiles from data-in/.
+    Deletes .zip files and extracted shapefiles from data-in/ (except what
+    --retain keeps), then removes folders left empty.
     """
-    cleanup.main()
+    from civic_data_boundaries_us_cd118 import cleanup
+
+    raise typer.Exit(cleanup.main(policy=retain, dry_run=dry_run, workers=workers))
+
+
+@app.command("serve")
+def serve_command(
+    host: str = typer.Option("127.0.0.1", help="Interface to bind."),
+    port: int = typer.Option(8000, help="Port to listen on."),
+    cache_mb: int = typer.Option(64, "--cache-mb", help="In-memory cache for small files, in MB."),
+    max_age: int = typer.Option(300, "--max-age", help="Cache-Control max-age in seconds."),
+    precompress: bool = typer.Option(
+        False, "--precompress", help="Write .gz sidecars for JSON/GeoJSON first."
+    ),
+):
+    """Serve data-out/ over HTTP with ETag, Range and precompressed responses.
+
+    Point the Python client at it with CIVIC_REMOTE_BASE=http://HOST:PORT.
+    """
+    from civic_data_boundaries_us_cd118 import serve
+
+    raise typer.Exit(
+        serve.main(
+            host=host, port=port, cache_mb=cache_mb, max_age=max_age, precompress_files=precompress
+        )
+    )
 
 
 def main() -> int:
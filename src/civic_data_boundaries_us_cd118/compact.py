@@ -0,0 +1,158 @@
+"""Coordinate quantization and the compact delta-encoded output format.
+
+File: compact.py
+
+Exports carry far more coordinate precision than the simplify tolerance
+justifies. ``coordinate_precision`` derives a number of decimal places from
+the tolerance (one digit finer than the tolerance, so rounding moves points by
+at most a twentieth of it), and ``quantize_layer`` snaps geometries to that
+grid while keeping them valid.
+
+The compact format stores each ring as a flat list of integers: the first
+vertex in units of 10**-precision degrees, then deltas to each following
+vertex, without the closing vertex. Properties are stored as rows against a
+shared column list. ``remote.decode_compact`` turns it back into GeoJSON.
+"""
+
+import json
+import math
+from pathlib import Path
+from typing import Any, cast
+
+from civic_lib_core import log_utils
+import geopandas as gpd  # type: ignore
+import numpy as np
+import shapely
+
+from civic_data_boundaries_us_cd118.remote import COMPACT_FORMAT, COMPACT_SUFFIX, COMPACT_VERSION
+
+logger = log_utils.logger
+
+__all__ = [
+    "DEFAULT_COMPACT_PRECISION",
+    "MAX_PRECISION",
+    "compact_path_for",
+    "coordinate_precision",
+    "encode_compact",
+    "geojson_write_options",
+    "quantize_layer",
+    "write_compact",
+]
+
+# TIGER/Line publishes coordinates with 7 decimals (about 1 cm)
+MAX_PRECISION = 7
+
+# Used by the compact format when the layer has no precision or tolerance
+DEFAULT_COMPACT_PRECISION = 6
+
+
+def coordinate_precision(cfg: dict[str, Any]) -> int | None:
+    """Return the number of decimal places to keep, or None for full precision.
+
+    ``coordinate_precision`` may be an int, or "auto" to derive it from
+    ``simplify_tolerance``: a tolerance of 0.01 degrees keeps 3 decimals.
+    """
+    setting = cfg.get("coordinate_precision")
+    if setting is None:
+        return None
+    if setting == "auto":
+        tolerance = cfg.get("simplify_tolerance")
+        if not tolerance:
+            return None
+        digits = max(0, math.ceil(-math.log10(tolerance))) + 1
+        return min(digits, MAX_PRECISION)
+    if isinstance(setting, bool) or not isinstance(setting, int) or setting < 0:
+        raise ValueError(f"coordinate_precision must be 'auto' or a non-negative int: {setting!r}")
+    return min(setting, MAX_PRECISION)
+
+
+def geojson_write_options(precision: int | None) -> dict[str, Any]:
+    """Return GDAL GeoJSON layer options that write ``precision`` decimals."""
+    return {} if precision is None else {"COORDINATE_PRECISION": precision}
+
+
+def quantize_layer(gdf: gpd.GeoDataFrame, precision: int) -> gpd.GeoDataFrame:
+    """Snap all geometries to a 10**-precision grid, keeping them valid.
+
+    Shared boundaries stay shared since every vertex is snapped to the same grid.
+    ``set_precision`` returns rings in GEOS normal form (clockwise exteriors), so
+    the result is reoriented to RFC 7946 (exteriors counterclockwise).
+    """
+    gdf = gdf.copy()
+    snapped = shapely.set_precision(gdf.geometry.to_numpy(), grid_size=10.0**-precision)
+    snapped = shapely.orient_polygons(snapped, exterior_cw=False)
+    gdf[gdf.geometry.name] = gpd.GeoSeries(snapped, index=gdf.index, crs=gdf.crs)
+    return gdf
+
+
+def compact_path_for(geojson_path: Path) -> Path:
+    """Return the compact file written alongside a GeoJSON export."""
+    return geojson_path.with_name(geojson_path.stem + COMPACT_SUFFIX)
+
+
+def _encode_geometries(geoms: np.ndarray, precision: int) -> list[list[list[list[int]]] | None]:
+    """Delta-encode (multi)polygons as lists of polygons of flat integer rings."""
+    scale = 10.0**precision
+    parts, part_geom = shapely.get_parts(geoms, return_index=True)
+    rings, ring_part = shapely.get_rings(parts, return_index=True)
+    coords, coord_ring = shapely.get_coordinates(rings, return_index=True)
+
+    q = np.rint(coords * scale).astype(np.int64)
+    # Ring boundaries; drop each ring's closing vertex
+    starts = np.flatnonzero(np.r_[True, coord_ring[1:] != coord_ring[:-1]])
+    ends = np.r_[starts[1:], len(q)]
+    deltas = np.diff(q, axis=0, prepend=np.zeros((1, 2), dtype=np.int64))
+    deltas[starts] = q[starts]
+
+    encoded: list[list[list[list[int]]] | None] = [None if g is None else [] for g in geoms]
+    last_part = -1
+    polygon: list[list[int]] = []
+    for ring_no, (start, end) in enumerate(zip(starts, ends, strict=True)):
+        part = ring_part[ring_no]
+        if part != last_part:
+            polygon = []
+            encoded[part_geom[part]].append(polygon)  # type: ignore[union-attr]
+            last_part = part
+        polygon.append(deltas[start : end - 1].ravel().tolist())
+    return encoded
+
+
+def encode_compact(gdf: gpd.GeoDataFrame, precision: int) -> dict[str, Any]:
+    """Encode a polygon layer in the compact delta format.
+
+    Args:
+        gdf (gpd.GeoDataFrame): Polygon or MultiPolygon layer.
+        precision (int): Decimal places kept; coordinates become integers in
+            units of 10**-precision.
+
+    Returns:
+        dict: The compact document, ready to serialize as JSON.
+    """
+    columns = [c for c in gdf.columns if c != gdf.geometry.name]
+    rows: list[Any] = [[]] * len(gdf)
+    if columns:
+        # pandas serializes numpy scalars, NaN and timestamps to plain JSON values;
+        # to_json() returns the text when no path is given
+        rows = json.loads(cast("str", gdf[columns].to_json(orient="values")))
+    geometries = _encode_geometries(gdf.geometry.to_numpy(), precision)
+    bounds = gdf.total_bounds if len(gdf) else None
+
+    return {
+        "format": COMPACT_FORMAT,
+        "version": COMPACT_VERSION,
+        "precision": precision,
+        "crs": gdf.crs.to_string() if gdf.crs else None,
+        "bbox": [round(float(v), precision) for v in bounds] if bounds is not None else None,
+        "columns": columns,
+        "features": [{"p": row, "g": geom} for row, geom in zip(rows, geometries, strict=True)],
+    }
+
+
+def write_compact(gdf: gpd.GeoDataFrame, path: Path, precision: int | None) -> Path:
+    """Write a layer in the compact format and return its path."""
+    doc = encode_compact(gdf, DEFAULT_COMPACT_PRECISION if precision is None else precision)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(doc, f, ensure_ascii=False, separators=(",", ":"))
+    logger.info(f"Compact file written to {path} ({path.stat().st_size / 1e6:.2f} MB)")
+    return path
@@ -0,0 +1,264 @@
+"""Compares the district exports of two vintages (e.g. cd118 -> cd119).
+
+File: diff.py
+
+Used by civic-us-cd118 CLI:
+    civic-us-cd118 diff cd118 cd119
+
+For every state exported by both vintages, the old and new districts are
+overlaid: an STRtree over the new districts prunes the candidate pairs, and
+only those pairs are intersected (vectorized). States run in parallel on a
+thread pool. Two files are written to ``<new vintage>/diff/``:
+
+    <old>_to_<new>.changed.geojson  area that moved to a different district number
+    <old>_to_<new>.overlaps.csv     overlap area and fractions per district pair
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import os
+from pathlib import Path
+import sys
+from typing import Any, NamedTuple
+
+from civic_lib_core import log_utils
+import geopandas as gpd  # type: ignore
+import numpy as np
+import pandas as pd  # type: ignore
+import shapely
+
+from civic_data_boundaries_us_cd118.adjacency import LENGTH_CRS as AREA_CRS
+from civic_data_boundaries_us_cd118.export_cd118 import read_cd118_manifest_entries
+from civic_data_boundaries_us_cd118.utils import instrument
+from civic_data_boundaries_us_cd118.vintages import Vintage, get_vintage
+
+logger = log_utils.logger
+
+__all__ = [
+    "DEFAULT_MIN_AREA_M2",
+    "OVERLAP_COLUMNS",
+    "DiffResult",
+    "diff_paths_for",
+    "diff_state",
+    "diff_vintages",
+    "main",
+    "overlay_pairs",
+]
+
+# Pieces smaller than this are treated as slivers from separate simplification
+DEFAULT_MIN_AREA_M2 = 10_000.0
+
+OVERLAP_COLUMNS = [
+    "state_fips",
+    "from_district",
+    "to_district",
+    "overlap_m2",
+    "from_fraction",
+    "to_fraction",
+]
+
+
+class DiffResult(NamedTuple):
+    """Output of a vintage diff."""
+
+    changed_path: Path
+    overlaps_path: Path
+    states: list[str]  # FIPS codes compared
+    unmatched: list[str]  # FIPS codes exported by only one vintage
+
+
+def diff_paths_for(old: Vintage, new: Vintage) -> tuple[Path, Path]:
+    """Return the (changed-area GeoJSON, overlap CSV) paths for a vintage pair."""
+    diff_dir = new.out_dir / "diff"
+    stem = f"{old.name}_to_{new.name}"
+    return diff_dir / f"{stem}.changed.geojson", diff_dir / f"{stem}.overlaps.csv"
+
+
+def overlay_pairs(
+    old_geoms: np.ndarray, new_geoms: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Intersect two polygon layers, visiting only pairs whose envelopes meet.
+
+    Args:
+        old_geoms (np.ndarray): Object array of (multi)polygons.
+        new_geoms (np.ndarray): Object array of (multi)polygons.
+
+    Returns:
+        tuple: Arrays (i, j, overlap) for every pair with a positive-area
+        overlap, where ``overlap`` is old_geoms[i] intersected with new_geoms[j].
+    """
+    old_geoms = np.asarray(old_geoms, dtype=object)
+    new_geoms = np.asarray(new_geoms, dtype=object)
+    tree = shapely.STRtree(new_geoms)
+    left, right = tree.query(old_geoms, predicate="intersects")
+
+    overlap = shapely.intersection(old_geoms[left], new_geoms[right])
+    # Pairs that only share an edge or a corner leave lines and points behind
+    keep = shapely.area(overlap) > 0
+    return left[keep], right[keep], overlap[keep]
+
+
+def _areas(geoms: Any, crs: Any) -> np.ndarray:
+    if crs is None:
+        return shapely.area(np.asarray(geoms, dtype=object))
+    return gpd.GeoSeries(geoms, crs=crs).to_crs(AREA_CRS).area.to_numpy()
+
+
+def diff_state(
+    old_gdf: gpd.GeoDataFrame,
+    new_gdf: gpd.GeoDataFrame,
+    old_column: str,
+    new_column: str,
+    state_fips: str = "",
+    min_area: float = DEFAULT_MIN_AREA_M2,
+) -> tuple[gpd.GeoDataFrame, pd.DataFrame]:
+    """Overlay one state's old and new districts.
+
+    Areas are measured in an equal-area projection (EPSG:5070), or in CRS
+    units if the layers have none.
+
+    Args:
+        old_gdf (gpd.GeoDataFrame): The state's districts in the old vintage.
+        new_gdf (gpd.GeoDataFrame): The state's districts in the new vintage.
+        old_column (str): District number column of ``old_gdf`` (e.g. CD118FP).
+        new_column (str): District number column of ``new_gdf`` (e.g. CD119FP).
+        state_fips (str): Written to the ``state_fips`` column of both outputs.
+        min_area (float): Overlaps smaller than this (m²) are dropped.
+
+    Returns:
+        tuple: Changed-area polygons for pairs whose
+        district numbers differ, and the overlap table (``OVERLAP_COLUMNS``).
+    """
+    left, right, overlap = overlay_pairs(old_gdf.geometry.to_numpy(), new_gdf.geometry.to_numpy())
+    # Overlay in the source CRS so shared edges match exactly; project only to measure
+    areas = _areas(overlap, old_gdf.crs)
+
+    keep = areas >= min_area
+    left, right, overlap, areas = left[keep], right[keep], overlap[keep], areas[keep]
+    from_ids = old_gdf[old_column].astype(str).to_numpy()[left]
+    to_ids = new_gdf[new_column].astype(str).to_numpy()[right]
+
+    table = pd.DataFrame(
+        {
+            "state_fips": state_fips,
+            "from_district": from_ids,
+            "to_district": to_ids,
+            "overlap_m2": areas.round(1),
+            "from_fraction": (areas / _areas(old_gdf.geometry, old_gdf.crs)[left]).round(6),
+            "to_fraction": (areas / _areas(new_gdf.geometry, new_gdf.crs)[right]).round(6),
+        },
+        columns=OVERLAP_COLUMNS,
+    )
+
+    moved = from_ids != to_ids
+    attributes = table.loc[moved, ["state_fips", "from_district", "to_district", "overlap_m2"]]
+    changed = gpd.GeoDataFrame(
+        attributes.rename(columns={"overlap_m2": "area_m2"}),
+        geometry=overlap[moved],
+        crs=old_gdf.crs,
+    )
+    return changed, table
+
+
+def _read_state(path: Path) -> gpd.GeoDataFrame:
+    instrument.add(bytes_read=path.stat().st_size)
+    return gpd.read_file(path)
+
+
+def _diff_one(
+    state_fips: str, old_path: Path, new_path: Path, old: Vintage, new: Vintage, min_area: float
+) -> tuple[gpd.GeoDataFrame, pd.DataFrame]:
+    with instrument.span(old_path.parent.name, category="state", fips=state_fips):
+        old_gdf, new_gdf = _read_state(old_path), _read_state(new_path)
+        changed, table = diff_state(
+            old_gdf, new_gdf, old.district_column, new.district_column, state_fips, min_area
+        )
+        instrument.add(features=len(old_gdf) + len(new_gdf))
+        return changed, table
+
+
+def _state_pairs(old: Vintage, new: Vintage) -> tuple[dict[str, tuple[Path, Path]], list[str]]:
+    """Match the two vintages' exported state files by FIPS code."""
+    old_entries = read_cd118_manifest_entries(old)
+    new_entries = read_cd118_manifest_entries(new)
+    pairs: dict[str, tuple[Path, Path]] = {}
+    for fips in sorted(old_entries.keys() & new_entries.keys()):
+        old_path = old.state_out_path(old_entries[fips]["state_name"])
+        new_path = new.state_out_path(new_entries[fips]["state_name"])
+        if old_path.exists() and new_path.exists():
+            pairs[fips] = (old_path, new_path)
+    unmatched = sorted((old_entries.keys() | new_entries.keys()) - pairs.keys())
+    return pairs, unmatched
+
+
+def diff_vintages(
+    old_name: str,
+    new_name: str,
+    min_area: float = DEFAULT_MIN_AREA_M2,
+    workers: int | None = None,
+) -> DiffResult:
+    """Compare two vintages' state exports and write the changed areas and overlaps.
+
+    Args:
+        old_name (str): Vintage to compare from (e.g. "cd118").
+        new_name (str): Vintage to compare to (e.g. "cd119").
+        min_area (float): Overlaps smaller than this (m²) are dropped as slivers.
+        workers (int | None): Worker threads (default: CPU count).
+
+    Returns:
+        DiffResult: The written paths and the states compared.
+    """
+    old, new = get_vintage(old_name), get_vintage(new_name)
+    pairs, unmatched = _state_pairs(old, new)
+    if unmatched:
+        logger.warning(f"[DIFF] States exported by only one vintage, skipped: {unmatched}")
+    if not pairs:
+        raise ValueError(f"No state is exported by both {old.name} and {new.name}")
+
+    diff_one = instrument.bind(_diff_one)
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        futures = [
+            pool.submit(diff_one, fips, old_path, new_path, old, new, min_area)
+            for fips, (old_path, new_path) in pairs.items()
+        ]
+        results = [f.result() for f in futures]
+
+    changed_path, overlaps_path = diff_paths_for(old, new)
+    changed_path.parent.mkdir(parents=True, exist_ok=True)
+    changed = pd.concat([c for c, _ in results], ignore_index=True)
+    gpd.GeoDataFrame(changed, geometry="geometry", crs=results[0][0].crs).to_file(
+        changed_path, driver="GeoJSON"
+    )
+    table = pd.concat([t for _, t in results], ignore_index=True)
+    table.to_csv(overlaps_path, index=False)
+    instrument.add(bytes_written=changed_path.stat().st_size + overlaps_path.stat().st_size)
+
+    logger.info(
+        f"[DIFF] {old.name} -> {new.name}: {len(changed)} changed pieces, "
+        f"{len(table)} overlapping pairs in {len(pairs)} states"
+    )
+    return DiffResult(changed_path, overlaps_path, list(pairs), unmatched)
+
+
+def main(
+    old: str,
+    new: str,
+    min_area: float = DEFAULT_MIN_AREA_M2,
+    workers: int | None = None,
+) -> int:
+    """Run a vintage diff.
+
+    Returns:
+        int: 0 if successful, 1 on error.
+    """
+    try:
+        with instrument.run("diff"):
+            result = diff_vintages(old, new, min_area=min_area, workers=workers)
+        logger.info(f"[DIFF] Written {result.changed_path} and {result.overlaps_path}")
+        return 0
+    except Exception as e:
+        logger.error(f"Diff failed: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(old=sys.argv[1], new=sys.argv[2]))
@@ -6,72 +6,126 @@ This module provides functionality to:
 - Handle both state-split and nationwide layer processing
 """
 
+from pathlib import Path
+import shutil
 import sys
+from typing import Any
 
 from civic_lib_core import log_utils
 from civic_lib_geo.cli.chunk_geojson import (  # pyright: ignore[reportMissingTypeStubs]
-    apply_to_geojson_folder,  # pyright: ignore[reportUnknownVariableType]
     chunk_one,
 )
 
+from civic_data_boundaries_us_cd118.chunking import (
+    CHUNK_MODES,
+    LEGACY_CHUNKS_DIR_SUFFIX,
+    chunk_spatial,
+    chunks_dir_for,
+)
 from civic_data_boundaries_us_cd118.export_cd118 import export_cd118
-from civic_data_boundaries_us_cd118.utils.config_utils import load_layer_config
+from civic_data_boundaries_us_cd118.utils import instrument
 from civic_data_boundaries_us_cd118.utils.get_paths import get_data_out_dir
+from civic_data_boundaries_us_cd118.vintages import load_vintages
 
 logger = log_utils.logger
 
 
-def chunk_layers():
+def _chunk_by_features(geojson: Path, max_features: int) -> None:
+    """Slice a GeoJSON into fixed-size chunks under ``<stem>_chunks/``.
+
+    The chunks live in the same directory as spatial chunks, which the index
+    and the export's ``*.geojson`` globs already skip.
+    """
+    legacy_dir = geojson.with_name(geojson.stem + LEGACY_CHUNKS_DIR_SUFFIX)
+    if legacy_dir.is_dir():
+        shutil.rmtree(legacy_dir)
+
+    chunks_dir = chunks_dir_for(geojson)
+    if chunks_dir.is_dir():
+        for stale in chunks_dir.iterdir():
+            stale.unlink()
+    chunk_one(geojson, max_features=max_features, output_dir=chunks_dir)
+
+
+def chunk_folder(folder: Path, cfg: dict[str, Any]) -> None:
+    """Chunk every GeoJSON in a folder using the layer's configured chunk mode."""
+    chunk_mode = cfg.get("chunk_mode") or "features"
+    chunk_max_features = cfg.get("chunk_max_features") or 500
+    sources = [p for p in sorted(folder.glob("*.geojson")) if p.is_file()]
+
+    with instrument.span(folder.name, category="folder", mode=chunk_mode) as span:
+        span.add(bytes_read=sum(p.stat().st_size for p in sources))
+
+        if chunk_mode == "features":
+            for geojson in sources:
+                _chunk_by_features(geojson, chunk_max_features)
+            return
+
+        for geojson in sources:
+            records = chunk_spatial(
+                geojson,
+                mode=chunk_mode,
+                target_bytes=cfg.get("chunk_target_bytes") or 250_000,
+                max_features=chunk_max_features,
+            )
+            span.add(
+                features=sum(r["features"] for r in records),
+                bytes_written=sum(r["bytes"] for r in records),
+            )
+
+
+def chunk_layers(vintages: list[str] | None = None):
     """Chunk all exported geojsons in data-out/, based on YAML configs.
 
-    Handles both split-by-state folders and single nationwide layers.
+    Handles both split-by-state folders and single nationwide layers, for
+    each configured vintage. Each layer's ``chunk_mode`` selects plain
+    feature-count slicing ("features") or spatially coherent chunks ordered
+    by Hilbert curve or quadtree, sized by ``chunk_target_bytes``.
     """
-    cfg = load_layer_config("cd118")
-
-    chunk_max_features = cfg.get("chunk_max_features", 500)
-    simplify_tolerance = cfg.get("simplify_tolerance", 0.01)
-
-    logger.info("[CHUNKING] Loaded config:")
-    logger.info(f"  chunk_max_features: {chunk_max_features}")
-    logger.info(f"  simplify_tolerance: {simplify_tolerance}")
-
-    out_dir = get_data_out_dir()
-    layer_output_dir = out_dir / cfg.get("output_dir", "cd118")
-
-    if not layer_output_dir.exists():
-        logger.info(f"Skipping non-existing output dir: {layer_output_dir}")
-        return
-
-    if cfg.get("split_by") == "fips" or cfg.get("split_by") == "state":
-        # Process each subfolder (e.g. minnesota, oregon)
-        for subfolder in layer_output_dir.iterdir():
-            if subfolder.is_dir():
-                logger.info(f"Chunking per state: {subfolder}")
-                apply_to_geojson_folder(
-                    subfolder,
-                    action_fn=chunk_one,
-                    max_features=chunk_max_features,
-                    suffix="_chunked.geojson",
-                    tolerance=simplify_tolerance,
-                )
-    else:
-        # Process the layer's main folder directly
-        logger.info(f"Chunking layer: {layer_output_dir}")
-        apply_to_geojson_folder(
-            layer_output_dir,
-            action_fn=chunk_one,
-            max_features=chunk_max_features,
-            suffix="_chunked.geojson",
-            tolerance=simplify_tolerance,
-        )
-
-
-def main() -> int:
+    for vintage in load_vintages(vintages):
+        layers = [(vintage.layer, vintage.states_out_dir, True)]
+        if vintage.national:
+            layers.append((vintage.national, vintage.national_out_dir, False))
+
+        for cfg, layer_output_dir, split_by_state in layers:
+            layer_name = cfg["name"]
+            chunk_mode = cfg.get("chunk_mode") or "features"
+            if chunk_mode not in CHUNK_MODES:
+                raise ValueError(f"Unknown chunk_mode '{chunk_mode}' for layer {layer_name}")
+
+            logger.info(f"[CHUNKING] Loaded config for {layer_name}:")
+            logger.info(f"  chunk_mode: {chunk_mode}")
+            logger.info(f"  chunk_max_features: {cfg.get('chunk_max_features')}")
+            logger.info(f"  chunk_target_bytes: {cfg.get('chunk_target_bytes')}")
+
+            if not layer_output_dir.exists():
+                logger.info(f"Skipping non-existing output dir: {layer_output_dir}")
+                continue
+
+            with instrument.span(layer_name):
+                if split_by_state:
+                    # Process each subfolder (e.g. minnesota, oregon)
+                    for subfolder in sorted(layer_output_dir.iterdir()):
+                        if subfolder.is_dir():
+                            logger.info(f"Chunking per state: {subfolder}")
+                            chunk_folder(subfolder, cfg)
+                else:
+                    # Process the layer's main folder directly
+                    logger.info(f"Chunking layer: {layer_output_dir}")
+                    chunk_folder(layer_output_dir, cfg)
+
+
+def main(force: bool = False, vintages: list[str] | None = None, workers: int | None = None) -> int:
     """Export and chunk TIGER data for layers.
 
-    - CD118
+    - Every enabled vintage (CD118 and any others in data-config/)
     - Chunking output geojsons
 
+    Args:
+        force (bool): Re-export states even if their manifest stamp is unchanged.
+        vintages (list[str] | None): Vintages to export; None for all enabled.
+        workers (int | None): Worker threads shared by every vintage.
+
     Returns:
         int: 0 on success, 1 on error
     """
@@ -82,13 +136,16 @@ def main() -> int:
         out_dir.mkdir(parents=True, exist_ok=True)
         logger.debug(f"Data output directory: {out_dir}")
 
-        # Export congressional districts
-        logger.info("Exporting CD118 boundaries...")
-        export_cd118()
+        with instrument.run("export"):
+            # Export congressional districts
+            logger.info("Exporting congressional district boundaries...")
+            with instrument.span("export_cd118"):
+                export_cd118(force=force, vintages=vintages, workers=workers)
 
-        # Chunk geojsons
-        logger.info("Starting chunking process...")
-        chunk_layers()
+            # Chunk geojsons
+            logger.info("Starting chunking process...")
+            with instrument.span("chunk_layers", rollup_features=False):
+                chunk_layers(vintages)
 
         logger.info("Export and chunking complete.")
         return 0
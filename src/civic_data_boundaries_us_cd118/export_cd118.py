@@ -2,29 +2,89 @@
 
 Produces one GeoJSON file per state and writes a manifest YAML.
 
+Every configured vintage (see vintages.py) is exported in one run: the states
+of all vintages share one worker pool, and each vintage writes into its own
+output namespace.
+
 File: export_cd118.py
 """
 
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+import os
 from pathlib import Path
+import shutil
 import sys
-from typing import cast
+from typing import Any, NamedTuple, cast
 
 from civic_lib_core import log_utils
 from civic_lib_core.date_utils import today_utc_str
 from civic_lib_core.yaml_utils import read_yaml, write_yaml
 from civic_lib_geo.us_constants import US_STATE_FIPS_TO_ABBR, get_state_dir_name  # type: ignore
 import geopandas as gpd  # type: ignore
+import numpy as np
 import pandas as pd  # type: ignore
-
-from civic_data_boundaries_us_cd118.utils.config_utils import load_layer_config
-from civic_data_boundaries_us_cd118.utils.get_paths import (
-    get_national_out_dir,
-    get_states_out_dir,
-    get_tiger_in_dir,
+import pyogrio  # type: ignore
+import pyogrio.raw  # type: ignore
+
+from civic_data_boundaries_us_cd118.adjacency import (
+    DEFAULT_KEY_COLUMN,
+    adjacency_paths_for,
+    compute_adjacency,
+    write_adjacency,
+)
+from civic_data_boundaries_us_cd118.compact import (
+    compact_path_for,
+    coordinate_precision,
+    geojson_write_options,
+    quantize_layer,
+    write_compact,
 )
+from civic_data_boundaries_us_cd118.geopackage import geopackage_path_for, write_geopackage
+from civic_data_boundaries_us_cd118.outlines import outline_paths_for, write_outlines
+from civic_data_boundaries_us_cd118.utils import instrument
+from civic_data_boundaries_us_cd118.utils.fingerprint import (
+    SHAPEFILE_EXTENSIONS,
+    config_hash,
+    package_version,
+    shapefile_fingerprint,
+    shapefile_stat,
+)
+from civic_data_boundaries_us_cd118.utils.get_paths import get_data_out_dir
+from civic_data_boundaries_us_cd118.validation import GEOMETRY_REPORT_KEYS, validate_layer
+from civic_data_boundaries_us_cd118.vintages import Vintage, get_vintage, load_vintages
 
 logger = log_utils.logger
 
+try:
+    import pyarrow  # type: ignore  # noqa: F401
+
+    _HAS_ARROW = True
+except ImportError:
+    _HAS_ARROW = False
+
+# Layer settings that change the bytes export_state writes
+EXPORT_CONFIG_KEYS = (
+    "simplify_tolerance",
+    "drop_columns",
+    "repair_geometry",
+    "coordinate_precision",
+    "write_compact",
+)
+
+# Settings that only apply to the nationwide layer
+NATIONAL_CONFIG_KEYS = (
+    *EXPORT_CONFIG_KEYS,
+    "write_adjacency",
+    "adjacency_tolerance",
+    "write_geopackage",
+    "write_outlines",
+)
+
+# Stamp fields that decide whether a state is re-exported; source_stat only
+# tells whether the recorded fingerprint can be reused without re-hashing
+STAMP_KEYS = ("config_hash", "source_fingerprint", "package_version")
+
 
 def validate_columns(gdf: gpd.GeoDataFrame, columns: list[str], label: str):
     """Validate that a GeoDataFrame contains all required columns.
@@ -49,53 +109,74 @@ def validate_columns(gdf: gpd.GeoDataFrame, columns: list[str], label: str):
         raise ValueError(f"{label} is missing columns: {missing}")
 
 
-def load_cd118_layer(shp_path: Path) -> gpd.GeoDataFrame:
-    """Load a single CD118 shapefile."""
-    gdf = gpd.read_file(shp_path)
-    validate_columns(gdf, ["CD118FP"], label=shp_path.name)
+class RawLayer(NamedTuple):
+    """A layer read in bulk: attribute columns and geometries as WKB."""
+
+    attributes: pd.DataFrame
+    wkb: np.ndarray  # object array of WKB bytes (None for missing geometry)
+    crs: str | None
+
+
+def read_cd118_raw(
+    shp_path: Path, drop_columns: list[str] | None = None, district_column: str = "CD118FP"
+) -> RawLayer:
+    """Read a CD118 shapefile in one bulk call, skipping ``drop_columns``.
+
+    Dropped columns are never read: the read requests only the remaining
+    fields. Uses pyogrio's Arrow reader when pyarrow is installed, and its
+    numpy reader otherwise; both return geometries as WKB.
+    """
+    info = pyogrio.read_info(shp_path)
+    fields = [str(f) for f in info["fields"]]
+    # The district column identifies the district; never drop it
+    drop = set(drop_columns or []) - {district_column}
+    unknown = sorted(drop - set(fields))
+    if unknown:
+        logger.warning(f"[CD118 EXPORT] drop_columns not in {shp_path.name}: {unknown}")
+    columns = [f for f in fields if f not in drop]
+    if len(columns) < len(fields):
+        logger.debug(f"[CD118 EXPORT] Not reading columns: {[f for f in fields if f in drop]}")
+
+    if _HAS_ARROW:
+        meta, table = pyogrio.read_arrow(shp_path, columns=columns)
+        geometry_name = meta["geometry_name"] or "wkb_geometry"
+        wkb = table.column(geometry_name).to_numpy(zero_copy_only=False)
+        attributes = table.drop_columns([geometry_name]).to_pandas()
+    else:
+        meta, _, wkb, field_data = pyogrio.raw.read(shp_path, columns=columns)
+        attributes = pd.DataFrame(dict(zip(meta["fields"], field_data, strict=True)))
+
+    return RawLayer(attributes, wkb, meta["crs"])
+
+
+def load_cd118_layer(
+    shp_path: Path, drop_columns: list[str] | None = None, district_column: str = "CD118FP"
+) -> gpd.GeoDataFrame:
+    """Load a single CD118 shapefile, without reading ``drop_columns``."""
+    raw = read_cd118_raw(shp_path, drop_columns, district_column)
+    gdf = gpd.GeoDataFrame(
+        raw.attributes, geometry=gpd.GeoSeries.from_wkb(raw.wkb, crs=raw.crs), crs=raw.crs
+    )
+    validate_columns(gdf, [district_column], label=shp_path.name)
+    instrument.add(
+        bytes_read=sum(
+            p.stat().st_size
+            for p in (shp_path.with_suffix(ext) for ext in SHAPEFILE_EXTENSIONS)
+            if p.exists()
+        )
+    )
     return gdf
 
 
-def export_cd118():
-    """Export CD118 boundaries.
+def iter_cd118_shapefiles(vintage: Vintage | None = None) -> Iterator[tuple[Path, str, str]]:
+    """Yield (shapefile, state FIPS, state directory name) for each of a vintage's shapefiles.
 
-    - a nationwide GeoJSON
-    - one GeoJSON per state
+    Only files matching the vintage's ``filename_pattern`` are considered;
+    unknown FIPS codes are logged and skipped.
     """
-    logger.info("Starting CD118 export...")
-    cd118_dir = get_tiger_in_dir()
-    logger.debug(f"Data output directory: {cd118_dir}")
-    national_dir = get_national_out_dir()
-    logger.debug(f"national_dir: {national_dir}")
-    national_dir.mkdir(parents=True, exist_ok=True)
-
-    cfg = load_layer_config("cd118")
-    cfg_national = load_layer_config("cd118_national")
-    if not cfg or not cfg_national:
-        logger.error("Failed to load CD118 configuration.")
-        return
-    logger.debug(f"CD118 config: {cfg}")
-    logger.debug(f"CD118 national config: {cfg_national}")
-
-    # Load configuration settings
-    simplify_tolerance = cfg.get("simplify_tolerance")
-    drop_columns = cfg.get("drop_columns", [])
-
-    logger.info("[CD118 EXPORT] Settings loaded from config:")
-    logger.info(f"  simplify_tolerance: {simplify_tolerance}")
-    logger.info(f"  drop_columns: {drop_columns}")
-
-    nationwide_gdfs: list[gpd.GeoDataFrame] = []
-    manifest_entries: list[dict[str, str | int]] = []
-
-    for shp_file in cd118_dir.glob("**/*.shp"):
+    vintage = vintage or get_vintage()
+    for shp_file, state_fips in vintage.iter_shapefiles():
         logger.debug(f"shp_file: {shp_file}")
-        parts = shp_file.stem.split("_")
-        if len(parts) < 3:
-            logger.warning(f"Unexpected CD118 filename: {shp_file.name}")
-            continue
-
-        state_fips = parts[2]
 
         # Skip invalid FIPS codes
         state_abbr = US_STATE_FIPS_TO_ABBR.get(state_fips)
@@ -103,94 +184,496 @@ def export_cd118():
             logger.warning(f"Unknown FIPS code: {state_fips} in {shp_file.name}")
             continue
 
-        state_name = get_state_dir_name(state_abbr)
-        logger.debug(f"Processing CD118 shapefile for {state_name}: {shp_file.name}")
+        yield shp_file, state_fips, get_state_dir_name(state_abbr)
+
+
+def state_config(cfg: dict[str, Any], state_fips: str) -> dict[str, Any]:
+    """Return the export settings for one state.
+
+    Starts from the layer's ``EXPORT_CONFIG_KEYS`` and applies any
+    ``state_overrides`` entry for the state's FIPS code.
+    """
+    settings = {key: cfg.get(key) for key in EXPORT_CONFIG_KEYS}
+    overrides = (cfg.get("state_overrides") or {}).get(state_fips) or {}
+    settings.update({k: v for k, v in overrides.items() if k in EXPORT_CONFIG_KEYS})
+    return settings
+
+
+def export_stamp(
+    shp_file: Path, settings: dict[str, Any], fingerprint: str | None = None
+) -> dict[str, Any]:
+    """Return the stamp identifying what produced a state's export.
+
+    Recorded on each manifest entry; a state whose stamp is unchanged and whose
+    output still exists does not need to be exported again.
+
+    Args:
+        shp_file (Path): The state's shapefile.
+        settings (dict): The state's export settings, see ``state_config``.
+        fingerprint (str | None): Shapefile fingerprint already known to be
+            current; hashed from the files if None.
+    """
+    return {
+        "config_hash": config_hash(settings),
+        "source_fingerprint": fingerprint or shapefile_fingerprint(shp_file),
+        "source_stat": shapefile_stat(shp_file),
+        "package_version": package_version(),
+    }
+
+
+def _known_fingerprint(shp_file: Path, entry: dict[str, Any] | None) -> str | None:
+    """Return the entry's fingerprint if the shapefile's sizes and mtimes are unchanged."""
+    if entry is None or entry.get("source_stat") != shapefile_stat(shp_file):
+        return None
+    return entry.get("source_fingerprint")
+
+
+def _stamp_matches(entry: dict[str, Any] | None, stamp: dict[str, Any]) -> bool:
+    return entry is not None and all(entry.get(k) == stamp[k] for k in STAMP_KEYS)
+
 
-        gdf = load_cd118_layer(shp_file)
+def national_settings_hash(cfg: dict[str, Any]) -> str:
+    """Return a hash of the nationwide layer settings (``NATIONAL_CONFIG_KEYS``)."""
+    return config_hash({key: cfg.get(key) for key in NATIONAL_CONFIG_KEYS})
 
-        # Drop columns dynamically
-        if drop_columns:
-            drop_existing = [c for c in drop_columns if c in gdf.columns]
-            if drop_existing:
-                gdf = gdf.drop(columns=drop_existing)
-                logger.debug(f"[CD118 EXPORT] Dropped columns: {drop_existing}")
-            else:
-                logger.debug(f"[CD118 EXPORT] None of the drop_columns exist in {shp_file.name}")
+
+def _read_cd118_manifest(vintage: Vintage) -> dict[str, Any]:
+    manifest_path = vintage.national_out_dir / "manifest.yaml"
+    if not manifest_path.exists():
+        return {}
+    return read_yaml(manifest_path) or {}
+
+
+def read_cd118_manifest_entries(vintage: Vintage | None = None) -> dict[str, dict[str, Any]]:
+    """Return the per-state entries of national/manifest.yaml keyed by state FIPS."""
+    manifest = _read_cd118_manifest(vintage or get_vintage())
+    return {str(e.get("state_fips")): e for e in manifest.get("states") or []}
+
+
+def state_out_path(state_name: str, vintage: Vintage | None = None) -> Path:
+    """Return the per-state GeoJSON output path for a state directory name."""
+    return (vintage or get_vintage()).state_out_path(state_name)
+
+
+def export_state(
+    shp_file: Path,
+    state_fips: str,
+    state_name: str,
+    cfg: dict[str, Any],
+    vintage: Vintage | None = None,
+    stamp: dict[str, Any] | None = None,
+) -> tuple[gpd.GeoDataFrame, dict[str, Any]]:
+    """Export one state's CD118 shapefile to GeoJSON.
+
+    Args:
+        shp_file (Path): The state's CD118 shapefile.
+        state_fips (str): Two-digit state FIPS code.
+        state_name (str): State directory name (e.g. "new_york").
+        cfg (dict): Export settings for the state, see ``state_config``.
+        vintage (Vintage | None): Vintage being exported; defaults to cd118.
+        stamp (dict | None): The state's ``export_stamp``, if the caller already
+            computed it; computed here otherwise.
+
+    Returns:
+        tuple: The exported GeoDataFrame and its manifest entry.
+    """
+    vintage = vintage or get_vintage()
+    with instrument.span(state_name, category="state", fips=state_fips, vintage=vintage.name):
+        simplify_tolerance = cfg.get("simplify_tolerance")
+        # The key and state columns are needed by adjacency and the GeoPackage
+        required = {vintage.key_column, vintage.state_column}
+        drop_columns = [c for c in cfg.get("drop_columns") or [] if c not in required]
+
+        logger.debug(f"Processing {vintage.name} shapefile for {state_name}: {shp_file.name}")
+        # Dropped columns are left out of the read itself
+        gdf = load_cd118_layer(
+            shp_file, drop_columns=drop_columns, district_column=vintage.district_column
+        )
+
+        # Check and repair geometries before simplifying; None means repair
+        gdf, geometry_report = validate_layer(
+            gdf, state_name, repair=cfg.get("repair_geometry") is not False
+        )
 
         # Simplify dynamically
         if simplify_tolerance:
             gdf["geometry"] = gdf.geometry.simplify(simplify_tolerance, preserve_topology=True)
 
-        nationwide_gdfs.append(cast("gpd.GeoDataFrame", gdf))
+        # Keep only the coordinate precision the tolerance justifies
+        precision = coordinate_precision(cfg)
+        if precision is not None:
+            gdf = quantize_layer(gdf, precision)
+
+        out_path = vintage.state_out_path(state_name)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        gdf.to_file(out_path, driver="GeoJSON", **geojson_write_options(precision))
+        written = out_path.stat().st_size
+        if cfg.get("write_compact"):
+            written += write_compact(gdf, compact_path_for(out_path), precision).stat().st_size
+        else:
+            compact_path_for(out_path).unlink(missing_ok=True)
+        instrument.add(features=len(gdf), bytes_written=written)
+
+        logger.info(f"Exported CD118 GeoJSON for {state_name}: {out_path}")
+
+        entry: dict[str, Any] = {
+            "state_name": state_name,
+            "state_fips": state_fips,
+            "geojson_path": str(out_path.relative_to(get_data_out_dir().parent)),
+            "feature_count": len(gdf),
+            "coordinate_precision": precision,
+            "geometry": dict(geometry_report),
+            **(stamp or export_stamp(shp_file, cfg)),
+        }
+        return cast("gpd.GeoDataFrame", gdf), entry
 
-        state_out_dir = get_states_out_dir() / state_name
-        state_out_dir.mkdir(parents=True, exist_ok=True)
 
-        state_out_path = state_out_dir / f"cd118_{state_name}.geojson"
-        gdf.to_file(state_out_path, driver="GeoJSON")
+def write_nationwide(
+    gdfs: list[gpd.GeoDataFrame],
+    cfg: dict[str, Any],
+    vintage: Vintage | None = None,
+    state_fips: list[str] | None = None,
+) -> Path | None:
+    """Concatenate per-state frames and write the nationwide GeoJSON.
 
-        logger.info(f"Exported CD118 GeoJSON for {state_name}: {state_out_path}")
+    With ``write_outlines`` set and ``state_fips`` (one code per frame)
+    given, the state and US outlines are dissolved from the same frames.
 
-        manifest_entries.append(
-            {
-                "state_name": state_name,
-                "state_fips": state_fips,
-                "geojson_path": str(state_out_path.relative_to(cd118_dir.parent.parent)),
-                "feature_count": len(gdf),
-            }
-        )
+    Returns:
+        Path to the nationwide file, or None if there was nothing to write.
+    """
+    vintage = vintage or get_vintage()
+    if not gdfs:
+        logger.warning(f"No {vintage.name} data found to export for nationwide layer.")
+        return None
 
-    # Export nationwide GeoJSON
-    if nationwide_gdfs:
-        combined_df = pd.concat(nationwide_gdfs, ignore_index=True)
+    # The states' features were counted when they were exported
+    with instrument.span("nationwide", rollup_features=False, vintage=vintage.name):
+        combined_df = pd.concat(gdfs, ignore_index=True)
 
         combined_gdf = gpd.GeoDataFrame(
             combined_df,
             geometry="geometry",
-            crs=nationwide_gdfs[0].crs if nationwide_gdfs else None,
+            crs=gdfs[0].crs,
         )
-        nationwide_filename = cfg.get("filename", "cd118_us.geojson")
-        nationwide_path = national_dir / nationwide_filename
-        combined_gdf.to_file(nationwide_path, driver="GeoJSON")  # type: ignore
+        national_dir = vintage.national_out_dir
+        national_dir.mkdir(parents=True, exist_ok=True)
+        nationwide_path = national_dir / cfg.get("filename", f"{vintage.name}_us.geojson")
+
+        precision = coordinate_precision(cfg)
+        if precision is not None:
+            combined_gdf = quantize_layer(combined_gdf, precision)
+        options = geojson_write_options(precision)
+        combined_gdf.to_file(nationwide_path, driver="GeoJSON", **options)  # type: ignore
+        written = nationwide_path.stat().st_size
+        if cfg.get("write_compact"):
+            compact_path = compact_path_for(nationwide_path)
+            written += write_compact(combined_gdf, compact_path, precision).stat().st_size
+        instrument.add(features=len(combined_gdf), bytes_written=written)
+        if cfg.get("write_adjacency"):
+            write_nationwide_adjacency(combined_gdf, nationwide_path, cfg, vintage.key_column)
+        if cfg.get("write_geopackage"):
+            write_nationwide_geopackage(combined_gdf, nationwide_path, vintage)
+        if cfg.get("write_outlines") and state_fips is not None:
+            write_outlines(dict(zip(state_fips, gdfs, strict=True)), vintage)
+        _remove_disabled_sidecars(nationwide_path, cfg, vintage)
         logger.info(f"[CD118 EXPORT] Nationwide file written to: {nationwide_path}")
         logger.info(
             f"[CD118 EXPORT] Nationwide file size: {nationwide_path.stat().st_size / 1e6:.2f} MB"
         )
         logger.info(f"[CD118 EXPORT] Nationwide feature count: {len(combined_gdf)}")
+        return nationwide_path
+
+
+def write_nationwide_adjacency(
+    gdf: gpd.GeoDataFrame,
+    nationwide_path: Path,
+    cfg: dict[str, Any],
+    key_column: str = DEFAULT_KEY_COLUMN,
+) -> tuple[Path, Path]:
+    """Compute district adjacency for the nationwide layer and write it next to it."""
+    with instrument.span("adjacency"):
+        tolerance = cfg.get("adjacency_tolerance") or 0.0
+        graph = compute_adjacency(gdf, key_column=key_column, tolerance=tolerance)
+        paths = write_adjacency(graph, nationwide_path, key_column, tolerance)
+        instrument.add(features=len(graph.ids), bytes_written=sum(p.stat().st_size for p in paths))
+        return paths
+
+
+def write_nationwide_geopackage(
+    gdf: gpd.GeoDataFrame, nationwide_path: Path, vintage: Vintage
+) -> Path:
+    """Write the nationwide layer to an indexed GeoPackage next to its GeoJSON."""
+    with instrument.span("geopackage"):
+        path = write_geopackage(
+            gdf,
+            geopackage_path_for(nationwide_path),
+            table=vintage.name,
+            state_column=vintage.state_column,
+            district_column=vintage.district_column,
+            key_column=vintage.key_column,
+            ocd_pattern=vintage.layer.get("ocd_pattern"),
+        )
+        instrument.add(features=len(gdf), bytes_written=path.stat().st_size)
+        return path
 
-    else:
-        logger.warning("No CD118 data found to export for nationwide layer.")
 
-    # Write manifest
-    manifest_path = national_dir / "manifest.yaml"
+def write_cd118_manifest(
+    manifest_entries: list[dict[str, Any]], vintage: Vintage | None = None
+) -> Path:
+    """Write (or update) national/manifest.yaml with the per-state export entries."""
+    vintage = vintage or get_vintage()
+    manifest_path = vintage.national_out_dir / "manifest.yaml"
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
     manifest = read_yaml(manifest_path) if manifest_path.exists() else {}
 
     total_features = sum((e["feature_count"] for e in manifest_entries), 0)
+    geometry_totals = {
+        key: sum((e.get("geometry") or {}).get(key, 0) for e in manifest_entries)
+        for key in GEOMETRY_REPORT_KEYS
+    }
 
     manifest.update(
         {
-            "layer": "cd118",
-            "description": "US 118th Congressional District boundaries from TIGER/Line 2022",
-            "source": "US Census TIGER/Line 2022",
+            "layer": vintage.name,
+            "description": vintage.layer.get("description"),
+            "source": f"{vintage.layer.get('source')} {vintage.layer.get('year')}",
             "last_updated": today_utc_str(),
             "total_states": len(manifest_entries),
             "total_features": total_features,
+            "geometry_totals": geometry_totals,
             "states": manifest_entries,
         }
     )
+    if vintage.national:
+        manifest["national_settings_hash"] = national_settings_hash(vintage.national)
 
     write_yaml(manifest, manifest_path)
     logger.info(f"Manifest written to {manifest_path}")
+    return manifest_path
 
 
-def main() -> int:
+def _read_export(path: Path) -> gpd.GeoDataFrame:
+    """Read back a previously exported state GeoJSON."""
+    instrument.add(bytes_read=path.stat().st_size)
+    return gpd.read_file(path)
+
+
+def _sidecars_by_flag(nationwide_path: Path, vintage: Vintage) -> dict[str, list[Path]]:
+    """Return the files written next to the nationwide GeoJSON, keyed by their ``write_*`` flag."""
+    return {
+        "write_compact": [compact_path_for(nationwide_path)],
+        "write_adjacency": list(adjacency_paths_for(nationwide_path)),
+        "write_geopackage": [geopackage_path_for(nationwide_path)],
+        "write_outlines": list(outline_paths_for(vintage)),
+    }
+
+
+def _remove_disabled_sidecars(nationwide_path: Path, cfg: dict[str, Any], vintage: Vintage) -> None:
+    """Delete sidecars left by an earlier export whose ``write_*`` flag is now off."""
+    for flag, paths in _sidecars_by_flag(nationwide_path, vintage).items():
+        if cfg.get(flag):
+            continue
+        for path in paths:
+            if path.exists():
+                logger.info(f"[CD118 EXPORT] {flag} is off; removing {path.name}")
+                path.unlink()
+
+
+def nationwide_sidecars(vintage: Vintage) -> list[Path]:
+    """Return the files the nationwide layer's settings ask for next to its GeoJSON."""
+    by_flag = _sidecars_by_flag(vintage.national_path, vintage)
+    return [path for flag, paths in by_flag.items() if vintage.national.get(flag) for path in paths]
+
+
+def _write_vintage_nationwide(
+    vintage: Vintage,
+    sources: list["Future[tuple[gpd.GeoDataFrame, dict[str, Any]]] | Path"],
+    state_fips: list[str],
+) -> Path | None:
+    """Write one vintage's nationwide file, reading skipped states back from disk."""
+    gdfs = [_read_export(src) if isinstance(src, Path) else src.result()[0] for src in sources]
+    return write_nationwide(gdfs, vintage.national, vintage, state_fips)
+
+
+class ExportResult(NamedTuple):
+    """What ``export_cd118`` did for one vintage; state lists are in FIPS order."""
+
+    vintage: Vintage
+    exported: list[str]  # states written in this run
+    reused: list[str]  # states whose stamp matched
+    removed: list[str]  # states in the last manifest that have no shapefile any more
+    written: list[Path]  # GeoJSON files rewritten: exported states, nationwide file, outlines
+
+
+class _VintagePlan(NamedTuple):
+    """A vintage's states in FIPS order: queued exports (futures) or reused outputs."""
+
+    vintage: Vintage
+    sources: list[Any]  # Future of (gdf, entry), or the reused state's GeoJSON path
+    entries: list[Any]  # Future of (gdf, entry), or the reused manifest entry
+    state_fips: list[str]
+    removed: list[str]  # states dropped from the input since the last manifest
+    unchanged: bool  # nothing queued and the same states as the last manifest
+    national_settings_changed: bool  # nationwide settings differ from the last manifest
+
+
+def _remove_state_outputs(vintage: Vintage, entry: dict[str, Any]) -> None:
+    """Delete the folder of a state that is no longer in the input (GeoJSON, compact, chunks)."""
+    state_dir = vintage.state_out_path(entry["state_name"]).parent
+    if state_dir.exists():
+        logger.info(f"[{vintage.name.upper()} EXPORT] No shapefile any more; removing {state_dir}")
+        shutil.rmtree(state_dir)
+
+
+def _queue_vintage(pool: ThreadPoolExecutor, vintage: Vintage, force: bool) -> _VintagePlan:
+    """Submit a vintage's stale states to the pool without waiting for them."""
+    cfg = vintage.layer
+    tag = f"[{vintage.name.upper()} EXPORT]"
+    logger.info(f"{tag} Settings loaded from config:")
+    logger.info(f"  simplify_tolerance: {cfg.get('simplify_tolerance')}")
+    logger.info(f"  drop_columns: {cfg.get('drop_columns', [])}")
+
+    manifest = _read_cd118_manifest(vintage)
+    previous = {str(e.get("state_fips")): e for e in manifest.get("states") or []}
+    export_one = instrument.bind(export_state)
+    sources: list[Any] = []
+    entries: list[Any] = []
+    state_fips_codes: list[str] = []
+
+    for shp_file, state_fips, state_name in iter_cd118_shapefiles(vintage):
+        settings = state_config(cfg, state_fips)
+        out_path = vintage.state_out_path(state_name)
+        prev = None if force else previous.get(state_fips)
+        state_fips_codes.append(state_fips)
+
+        stamp = export_stamp(shp_file, settings, _known_fingerprint(shp_file, prev))
+        if out_path.exists() and _stamp_matches(prev, stamp):
+            logger.info(f"{tag} Unchanged, skipping {state_name}")
+            sources.append(out_path)
+            entries.append(cast("dict[str, Any]", prev))
+            continue
+
+        future = pool.submit(export_one, shp_file, state_fips, state_name, settings, vintage, stamp)
+        sources.append(future)
+        entries.append(future)
+
+    removed = sorted(set(previous) - set(state_fips_codes))
+    for state_fips in removed:
+        _remove_state_outputs(vintage, previous[state_fips])
+
+    unchanged = all(isinstance(e, dict) for e in entries) and {
+        e["state_fips"] for e in entries
+    } == set(previous)
+    settings_changed = bool(vintage.national) and manifest.get(
+        "national_settings_hash"
+    ) != national_settings_hash(vintage.national)
+    return _VintagePlan(
+        vintage, sources, entries, state_fips_codes, removed, unchanged, settings_changed
+    )
+
+
+def _export_result(
+    plan: _VintagePlan, entries: list[dict[str, Any]], national: Path | None
+) -> ExportResult:
+    """Summarize a finished plan, given its manifest entries and the nationwide file written."""
+    result = ExportResult(plan.vintage, exported=[], reused=[], removed=plan.removed, written=[])
+    for entry, source in zip(entries, plan.entries, strict=True):
+        if isinstance(source, Future):
+            result.exported.append(entry["state_fips"])
+            result.written.append(plan.vintage.state_out_path(entry["state_name"]))
+        else:
+            result.reused.append(entry["state_fips"])
+    if national is not None:
+        result.written.append(national)
+        if plan.vintage.national.get("write_outlines"):
+            result.written.extend(outline_paths_for(plan.vintage))
+    return result
+
+
+def export_cd118(
+    force: bool = False, vintages: list[str] | None = None, workers: int | None = None
+) -> dict[str, ExportResult]:
+    """Export the configured vintages (CD118, plus any others enabled in data-config/).
+
+    For each vintage:
+    - a nationwide GeoJSON
+    - one GeoJSON per state
+
+    States whose manifest stamp (export settings hash, shapefile fingerprint and
+    package version) is unchanged, and whose GeoJSON still exists, are skipped;
+    a shapefile whose sizes and mtimes match the last manifest is not re-hashed.
+    The nationwide file is only rewritten if some state was exported or the
+    nationwide settings changed, and sidecars whose ``write_*`` flag was turned
+    off are removed. The outputs of states that were in the last manifest but
+    no longer have a shapefile are deleted. States and nationwide files of
+    every vintage run on one shared thread pool.
+
+    Args:
+        force (bool): Export every state regardless of its stamp.
+        vintages (list[str] | None): Vintages to export; None for all enabled.
+        workers (int | None): Worker threads (default: CPU count).
+
+    Returns:
+        dict: An ExportResult per vintage name.
+    """
+    selected = load_vintages(vintages)
+    logger.info(f"Starting export of {', '.join(v.name for v in selected) or 'no vintages'}...")
+
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        # Queue every stale state of every vintage before waiting on any of them
+        plans = [_queue_vintage(pool, vintage, force) for vintage in selected]
+
+        writes: list[Future | None] = []
+        for plan in plans:
+            vintage = plan.vintage
+            stale = (
+                plan.national_settings_changed
+                or not vintage.national_path.exists()
+                or not all(p.exists() for p in nationwide_sidecars(vintage))
+            )
+            if not plan.sources or not vintage.national or (plan.unchanged and not stale):
+                if plan.sources and vintage.national:
+                    logger.info(
+                        f"[{vintage.name.upper()} EXPORT] No state changed; nationwide file left as is."
+                    )
+                writes.append(None)
+                continue
+            writes.append(
+                pool.submit(
+                    instrument.bind(_write_vintage_nationwide),
+                    vintage,
+                    plan.sources,
+                    plan.state_fips,
+                )
+            )
+
+        results: dict[str, ExportResult] = {}
+        for plan, write in zip(plans, writes, strict=True):
+            national = write.result() if write is not None else None
+            entries = [e.result()[1] if isinstance(e, Future) else e for e in plan.entries]
+            if entries or plan.removed:
+                write_cd118_manifest(entries, plan.vintage)
+            if not entries:
+                logger.info(f"[{plan.vintage.name.upper()} EXPORT] No shapefiles found.")
+            results[plan.vintage.name] = _export_result(plan, entries, national)
+        return results
+
+
+def main(force: bool = False, vintages: list[str] | None = None, workers: int | None = None) -> int:
     """Run CD118 export.
 
+    Args:
+        force (bool): Export every state even if its manifest stamp matches.
+        vintages (list[str] | None): Vintages to export; None for all enabled.
+        workers (int | None): Worker threads (default: CPU count).
+
     Returns:
         int: 0 if successful, 1 on error.
     """
     try:
-        export_cd118()
+        with instrument.run("export_cd118"):
+            export_cd118(force=force, vintages=vintages, workers=workers)
         logger.info("CD118 export complete.")
         return 0
     except Exception as e:
@@ -3,13 +3,13 @@
 File: fetch.py
 
 This script:
-- Loads YAML config files describing layers to download
-- Downloads TIGER/Line zip files
+- Loads the layers of each configured vintage (see vintages.py) from YAML configs
+- Downloads TIGER/Line zip files (through the shared download cache if CIVIC_CACHE_DIR is set)
 - Extracts shapefiles into appropriate directories
 """
 
 from pathlib import Path
-from typing import NotRequired, TypedDict, cast
+from typing import IO, NotRequired, TypedDict, cast
 
 from civic_lib_core import log_utils
 from civic_lib_geo.us_constants import (  # pyright: ignore[reportMissingTypeStubs]
@@ -17,8 +17,14 @@ from civic_lib_geo.us_constants import (  # pyright: ignore[reportMissingTypeStu
 )
 import requests
 
-from civic_data_boundaries_us_cd118.utils.config_utils import load_layer_config
+from civic_data_boundaries_us_cd118.utils import instrument
+from civic_data_boundaries_us_cd118.utils.download_cache import (
+    DownloadCache,
+    get_download_cache,
+    link_into,
+)
 from civic_data_boundaries_us_cd118.utils.get_paths import get_data_in_dir
+from civic_data_boundaries_us_cd118.vintages import load_vintages
 
 logger = log_utils.logger
 
@@ -38,9 +44,24 @@ class LayerConfig(TypedDict, total=False):
     base_url: NotRequired[str]  # e.g. "https://..."
 
 
-def download_file(url: str, dest_path: Path) -> Path:
+def _stream_download(url: str, f: IO[bytes]) -> int:
+    """Stream a URL's body into an open binary file and return the bytes written."""
+    response = requests.get(url, stream=True, timeout=60)
+    response.raise_for_status()
+
+    written = 0
+    for chunk in response.iter_content(chunk_size=8192):
+        if chunk:
+            written += f.write(chunk)
+    return written
+
+
+def download_file(url: str, dest_path: Path, cache: DownloadCache | None = None) -> Path:
     """Download a file from a URL to a destination path.
 
+    If a download cache is configured (``CIVIC_CACHE_DIR``, or ``cache``), the
+    file is fetched into the cache once per host and linked into place.
+
     Returns:
         Path to the downloaded file.
 
@@ -54,18 +75,31 @@ def download_file(url: str, dest_path: Path) -> Path:
         logger.info(f"Skipping download. File already exists: {dest_path}")
         return dest_path
 
-    logger.info(f"Downloading: {url}")
+    cache = cache or get_download_cache()
 
     try:
-        response = requests.get(url, stream=True, timeout=60)
-        response.raise_for_status()
-
         dest_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with dest_path.open("wb") as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
+        if cache is not None:
+            blob, downloaded = cache.fetch(url, _stream_download)
+            if downloaded:
+                instrument.add(bytes_written=blob.stat().st_size)
+            method = link_into(blob, dest_path)
+            logger.info(
+                f"{'Downloaded' if downloaded else 'Cache hit for'} {url}; {method} to {dest_path}"
+            )
+            return dest_path
+
+        logger.info(f"Downloading: {url}")
+        # Write under a temporary name so a failed download never looks complete
+        partial = dest_path.with_name(dest_path.name + ".part")
+        try:
+            with partial.open("wb") as f:
+                written = _stream_download(url, f)
+            partial.replace(dest_path)
+        finally:
+            partial.unlink(missing_ok=True)
+        instrument.add(bytes_written=written)
 
         logger.info(f"Downloaded file saved to: {dest_path}")
         return dest_path
@@ -119,6 +153,18 @@ def process_layer(layer: LayerConfig) -> None:
         return
 
     # Per-FIPS state-level layers
+    for fips_code in layer_state_fips(layer):
+        fetch_state(layer, fips_code)
+
+
+def layer_state_fips(layer: LayerConfig) -> list[str]:
+    """Return the state FIPS codes a per-FIPS layer covers (fips_start to fips_end).
+
+    Codes that are not states in TIGER data are logged and left out.
+
+    Raises:
+        FetchError if the layer is missing a per-FIPS key.
+    """
     for key in ("fips_start", "fips_end", "filename_pattern", "base_url"):
         if key not in layer:
             raise FetchError(f"Missing required key '{key}' in per-FIPS layer config: {layer}")
@@ -133,9 +179,7 @@ def process_layer(layer: LayerConfig) -> None:
 
     valid_fips: set[str] = set(US_STATE_ABBR_TO_FIPS.values())
 
-    filename_pattern: str = layer["filename_pattern"]  # type: ignore[typeddict-item]
-    base_url: str = layer["base_url"]  # type: ignore[typeddict-item]
-
+    codes: list[str] = []
     for fips in range(start, end):
         fips_code = f"{fips:02d}"
         if fips_code not in valid_fips:
@@ -143,44 +187,58 @@ def process_layer(layer: LayerConfig) -> None:
                 f"Skipping invalid FIPS {fips_code} — no such state exists in TIGER data."
             )
             continue
+        codes.append(fips_code)
+    return codes
+
+
+def fetch_state(layer: LayerConfig, fips_code: str) -> None:
+    """Download and extract one state's file of a per-FIPS layer."""
+    filename_pattern: str = layer["filename_pattern"]  # type: ignore[typeddict-item]
+    base_url: str = layer["base_url"]  # type: ignore[typeddict-item]
+    output_dir: str = layer["output_dir"]  # type: ignore[typeddict-item]
 
-        filename = filename_pattern.format(fips=fips_code)
-        url = f"{base_url}/{filename}"
+    filename = filename_pattern.format(fips=fips_code)
+    url = f"{base_url}/{filename}"
 
-        state_dir = output_dir / fips_code
-        state_dir.mkdir(parents=True, exist_ok=True)
+    state_dir = get_data_in_dir() / output_dir / fips_code
+    state_dir.mkdir(parents=True, exist_ok=True)
 
-        zip_path = state_dir / filename
-        extract_path = state_dir / Path(filename).stem
+    zip_path = state_dir / filename
+    extract_path = state_dir / Path(filename).stem
 
-        logger.info(f"Processing FIPS {fips_code} from {url}")
+    logger.info(f"Processing FIPS {fips_code} from {url}")
+    with instrument.span(fips_code, category="state", url=url):
         downloaded = download_file(url, zip_path)
         extract_zip(downloaded, extract_path)
 
 
-def main() -> int:
-    """Fetch all layers defined in YAML configs.
+def main(vintages: list[str] | None = None) -> int:
+    """Fetch the layers of every configured vintage.
+
+    Args:
+        vintages (list[str] | None): Vintages to fetch; None for all enabled.
 
     Returns:
         0 if successful, 1 otherwise.
     """
     logger.info("Starting TIGER download process...")
 
-    # Load all layer configurations
-    layers = ["cd118", "cd118_national"]
-
-    for layer_name in layers:
-        layer_config = load_layer_config(layer_name)
-        if not layer_config:
-            logger.warning(f"No configuration found for layer: {layer_name}")
-            continue
-
-        # Skip layers without download URLs (locally generated layers)
-        if not layer_config.get("url") and not layer_config.get("base_url"):
-            logger.info(f"Skipping {layer_name} - no download URL (locally generated layer)")
-            continue
-
-        process_layer(cast("LayerConfig", layer_config))
+    with instrument.run("fetch"):
+        for vintage in load_vintages(vintages):
+            for layer_config in (vintage.layer, vintage.national):
+                if not layer_config:
+                    continue
+                layer_name = layer_config["name"]
+
+                # Skip layers without download URLs (locally generated layers)
+                if not layer_config.get("url") and not layer_config.get("base_url"):
+                    logger.info(
+                        f"Skipping {layer_name} - no download URL (locally generated layer)"
+                    )
+                    continue
+
+                with instrument.span(layer_name, vintage=vintage.name):
+                    process_layer(cast("LayerConfig", layer_config))
     logger.info("All TIGER layers fetched and extracted successfully.")
     return 0
 
@@ -194,6 +252,8 @@ if __name__ == "__main__":
 __all__ = [
     "download_file",
     "extract_zip",
+    "fetch_state",
+    "layer_state_fips",
     "process_layer",
     "main",
 ]
@@ -0,0 +1,149 @@
+"""GeoPackage output for SQL consumers of the nationwide layer.
+
+File: geopackage.py
+
+``write_geopackage`` writes every district into one table of a GeoPackage
+(a SQLite file readable by GDAL, QGIS, SpatiaLite and plain sqlite3), with:
+
+    rtree_<table>_geom   R-tree spatial index on the geometry column
+    idx_<table>_<col>    B-tree indexes on the state FIPS, district number
+                         and OCD ID columns
+
+Rows go in through pyogrio in one transaction (Arrow batches when pyarrow is
+installed), and GDAL builds the R-tree in bulk once all rows are in rather
+than updating it per insert. The attribute indexes are created afterwards,
+and the file is only moved into place once complete.
+"""
+
+from pathlib import Path
+import sqlite3
+
+from civic_lib_core import log_utils
+from civic_lib_geo.us_constants import US_STATE_FIPS_TO_ABBR  # type: ignore
+import geopandas as gpd  # type: ignore
+import pyogrio  # type: ignore
+
+logger = log_utils.logger
+
+__all__ = [
+    "GEOPACKAGE_SUFFIX",
+    "OCD_ID_COLUMN",
+    "geopackage_path_for",
+    "ocd_ids",
+    "write_geopackage",
+]
+
+GEOPACKAGE_SUFFIX = ".gpkg"
+OCD_ID_COLUMN = "ocd_id"
+
+try:
+    import pyarrow  # type: ignore  # noqa: F401
+
+    _HAS_ARROW = True
+except ImportError:
+    _HAS_ARROW = False
+
+
+def geopackage_path_for(geojson_path: Path) -> Path:
+    """Return the GeoPackage path written alongside a GeoJSON export."""
+    return geojson_path.with_suffix(GEOPACKAGE_SUFFIX)
+
+
+def ocd_ids(state_fips: list[str], districts: list[str], pattern: str) -> list[str | None]:
+    """Format Open Civic Data division ids from state FIPS codes and district numbers.
+
+    ``pattern`` is a layer's ``ocd_pattern``, with ``{state}`` (lower-case
+    postal code) and ``{district}`` (district number without leading zeros)
+    fields. Rows with an unknown state or a non-numeric district get None.
+    """
+    ids: list[str | None] = []
+    for fips, district in zip(state_fips, districts, strict=True):
+        abbr = US_STATE_FIPS_TO_ABBR.get(str(fips))
+        if abbr is None or not str(district).isdigit():
+            ids.append(None)
+            continue
+        ids.append(pattern.format(state=abbr.lower(), district=int(district)))
+    return ids
+
+
+def _with_index_columns(
+    gdf: gpd.GeoDataFrame,
+    state_column: str,
+    district_column: str,
+    key_column: str,
+    ocd_pattern: str | None,
+) -> tuple[gpd.GeoDataFrame, list[str]]:
+    """Return the frame to write (adding state FIPS and OCD ID) and the columns to index."""
+    frame = gdf.copy()
+    if state_column not in frame.columns and key_column in frame.columns:
+        # District keys (GEOID) start with the state FIPS code
+        frame[state_column] = frame[key_column].astype(str).str[:2]
+
+    indexed = [c for c in (state_column, district_column) if c in frame.columns]
+    if ocd_pattern and len(indexed) == 2:
+        frame[OCD_ID_COLUMN] = ocd_ids(
+            frame[state_column].astype(str).tolist(),
+            frame[district_column].astype(str).tolist(),
+            ocd_pattern,
+        )
+        indexed.append(OCD_ID_COLUMN)
+    return frame, indexed
+
+
+def write_geopackage(
+    gdf: gpd.GeoDataFrame,
+    path: Path,
+    table: str,
+    state_column: str = "STATEFP",
+    district_column: str = "CD118FP",
+    key_column: str = "GEOID",
+    ocd_pattern: str | None = None,
+) -> Path:
+    """Write a layer to a GeoPackage with an R-tree and attribute indexes.
+
+    Args:
+        gdf (gpd.GeoDataFrame): Districts to write.
+        path (Path): Output ``.gpkg`` file; replaced if it exists.
+        table (str): Name of the feature table (e.g. "cd118").
+        state_column (str): State FIPS column; derived from ``key_column`` if missing.
+        district_column (str): District number column (e.g. CD118FP).
+        key_column (str): Unique district id (e.g. GEOID20).
+        ocd_pattern (str | None): Adds an ``ocd_id`` column, see ``ocd_ids``.
+
+    Returns:
+        Path: The written GeoPackage.
+    """
+    frame, indexed = _with_index_columns(
+        gdf, state_column, district_column, key_column, ocd_pattern
+    )
+    missing = {state_column, district_column} - set(indexed)
+    if missing:
+        logger.warning(f"[GEOPACKAGE] No {sorted(missing)} column(s); not indexed")
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Keep the .gpkg extension: GDAL checks it when creating the file
+    partial = path.with_suffix(".part" + GEOPACKAGE_SUFFIX)
+    partial.unlink(missing_ok=True)
+    try:
+        pyogrio.write_dataframe(
+            frame,
+            partial,
+            layer=table,
+            driver="GPKG",
+            promote_to_multi=True,
+            use_arrow=_HAS_ARROW,
+            layer_options={"SPATIAL_INDEX": "YES"},
+        )
+        with sqlite3.connect(partial) as conn:
+            for column in indexed:
+                conn.execute(
+                    f'CREATE INDEX "idx_{table}_{column.lower()}" ON "{table}" ("{column}")'
+                )
+            conn.execute("ANALYZE")
+        conn.close()
+        partial.replace(path)
+    finally:
+        partial.unlink(missing_ok=True)
+
+    logger.info(f"[GEOPACKAGE] {len(frame)} features written to {path.name}, indexed on {indexed}")
+    return path
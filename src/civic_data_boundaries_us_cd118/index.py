@@ -6,8 +6,10 @@ Used by civic-usa-cd118 CLI:
     civic-usa-cd118 index
 
 Currently builds:
-- index.json with bounding boxes
-- manifest.json with dataset summary
+- index.json with bounding boxes (and per-chunk bboxes for spatially chunked files,
+  compact, adjacency and GeoPackage files where they exist), each entry tagged with the
+  vintage whose output namespace holds it, plus the size and sha256 of each file
+- manifest.json with dataset summary and the size and sha256 of every published file
 """
 
 import json
@@ -17,7 +19,23 @@ from typing import Any
 from civic_lib_core import date_utils, log_utils
 import geopandas as gpd
 
+from civic_data_boundaries_us_cd118.adjacency import adjacency_paths_for
+from civic_data_boundaries_us_cd118.checksums import (
+    FileChecksum,
+    checksum_outputs,
+    load_manifest_checksums,
+)
+from civic_data_boundaries_us_cd118.chunking import (
+    CHUNKS_DIR_SUFFIX,
+    LEGACY_CHUNKS_DIR_SUFFIX,
+    chunks_dir_for,
+    read_chunk_sidecar,
+)
+from civic_data_boundaries_us_cd118.compact import compact_path_for
+from civic_data_boundaries_us_cd118.geopackage import geopackage_path_for
+from civic_data_boundaries_us_cd118.utils import instrument
 from civic_data_boundaries_us_cd118.utils.get_paths import get_data_out_dir
+from civic_data_boundaries_us_cd118.vintages import load_vintages, vintage_for_path
 
 logger = log_utils.logger
 
@@ -34,6 +52,7 @@ def compute_bbox(geojson_path: Path) -> list[float] | None:
     """
     try:
         gdf: gpd.GeoDataFrame = gpd.read_file(geojson_path)
+        instrument.add(bytes_read=geojson_path.stat().st_size)
         bounds = gdf.total_bounds
         return [round(x, 6) for x in bounds]
     except Exception as e:
@@ -49,6 +68,7 @@ def compute_feature_count(geojson_path: Path) -> int | None:
     """
     try:
         gdf: gpd.GeoDataFrame = gpd.read_file(geojson_path)
+        instrument.add(bytes_read=geojson_path.stat().st_size)
         return len(gdf)
     except Exception as e:
         logger.warning(f"Could not read {geojson_path.name} to count features: {e}")
@@ -61,6 +81,7 @@ def write_manifest(
     index_data: list[dict[str, Any]],
     manifest_filename: str = "manifest.json",
     days_back: int | None = None,
+    files: dict[str, FileChecksum] | None = None,
 ) -> None:
     """Write a manifest file containing metadata about a geospatial dataset.
 
@@ -74,6 +95,9 @@ def write_manifest(
             Defaults to "manifest.json".
         days_back (int | None, optional): Number of days back to include in date range.
             If None, no date range is included. Defaults to None.
+        files (dict[str, FileChecksum] | None, optional): Size and sha256 of every
+            published file, keyed by path relative to ``out_dir``. Written as
+            ``files`` and checked by ``civic-us-cd118 verify``. Defaults to None.
 
     Returns:
         None
@@ -109,6 +133,9 @@ def write_manifest(
         "generated_at": date_utils.now_utc_str(),
         "date_range": date_range_list,
     }
+    if files is not None:
+        manifest["total_bytes"] = sum(checksum["size"] for checksum in files.values())
+        manifest["files"] = files
 
     manifest_path = out_dir / manifest_filename
     with Path.open(manifest_path, "w", encoding="utf-8") as f:
@@ -117,28 +144,105 @@ def write_manifest(
     logger.info(f"Manifest written to {manifest_path}")
 
 
-def build_index_main() -> int:
+def _load_previous_index(index_file: Path) -> dict[str, dict[str, Any]]:
+    """Return the existing index.json entries keyed by path, or {} if unavailable."""
+    if not index_file.exists():
+        return {}
+    try:
+        with index_file.open(encoding="utf-8") as f:
+            return {entry["path"]: entry for entry in json.load(f)}
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.warning(f"Ignoring unreadable {index_file.name}: {e}")
+        return {}
+
+
+def _sha256_of(checksums: dict[str, FileChecksum], rel_path: str) -> dict[str, str]:
+    checksum = checksums.get(rel_path)
+    return {"sha256": checksum["sha256"]} if checksum else {}
+
+
+def _size_and_sha256_of(checksums: dict[str, FileChecksum], rel_path: str) -> dict[str, Any]:
+    checksum = checksums.get(rel_path)
+    return {"size": checksum["size"], "sha256": checksum["sha256"]} if checksum else {}
+
+
+def build_index_main(changed: set[str] | None = None) -> int:
     """Build an index.json summarizing exported GeoJSONs.
 
+    Args:
+        changed (set[str] | None): Paths (relative to data-out/) that were rewritten.
+            When given, entries for all other files are reused from the existing
+            index.json instead of re-reading the GeoJSON, and files whose size
+            and mtime match manifest.json keep their recorded sha256. None
+            re-reads and re-hashes everything.
+
     Returns:
         0 if successful, 1 on failure.
     """
     try:
         out_dir = get_data_out_dir()
+        vintages = load_vintages(include_disabled=True)
         index: list[dict[str, Any]] = []
+        previous = _load_previous_index(out_dir / "index.json") if changed is not None else {}
+
+        logger.info(f"Hashing outputs in {out_dir}...")
+        with instrument.span("checksums"):
+            known = load_manifest_checksums(out_dir) if changed is not None else {}
+            checksums = checksum_outputs(out_dir, previous=known)
 
         logger.info(f"Scanning {out_dir} for GeoJSONs...")
 
         for geojson in out_dir.rglob("*.geojson"):
-            logger.debug(f"Processing {geojson}")
-            bbox = compute_bbox(geojson)
-            feature_count = compute_feature_count(geojson)
+            # Spatial chunks are listed under their source file, not on their own
+            chunk_dir_suffixes = (CHUNKS_DIR_SUFFIX, LEGACY_CHUNKS_DIR_SUFFIX)
+            if not geojson.is_file() or geojson.parent.name.endswith(chunk_dir_suffixes):
+                continue
+
+            rel_path = str(geojson.relative_to(out_dir))
+            cached = (
+                previous.get(rel_path) if changed is not None and rel_path not in changed else None
+            )
+            if cached is not None:
+                bbox, feature_count = cached.get("bbox"), cached.get("features")
+            else:
+                logger.debug(f"Processing {geojson}")
+                bbox = compute_bbox(geojson)
+                feature_count = compute_feature_count(geojson)
+                instrument.add(features=feature_count or 0)
 
             index_entry: dict[str, Any] = {
-                "path": str(geojson.relative_to(out_dir)),
+                "path": rel_path,
+                "vintage": vintage_for_path(rel_path, vintages),
                 "bbox": bbox,
                 "features": feature_count,
+                **_size_and_sha256_of(checksums, rel_path),
             }
+
+            compact = compact_path_for(geojson)
+            if compact.exists():
+                index_entry["compact"] = str(compact.relative_to(out_dir))
+
+            edges_path, csr_path = adjacency_paths_for(geojson)
+            if edges_path.exists() and csr_path.exists():
+                index_entry["adjacency"] = {
+                    "edges": str(edges_path.relative_to(out_dir)),
+                    "csr": str(csr_path.relative_to(out_dir)),
+                }
+
+            geopackage = geopackage_path_for(geojson)
+            if geopackage.exists():
+                index_entry["geopackage"] = str(geopackage.relative_to(out_dir))
+
+            chunks = read_chunk_sidecar(geojson)
+            if chunks is not None:
+                chunks_dir = chunks_dir_for(geojson)
+                index_entry["chunks"] = []
+                for chunk in chunks:
+                    chunk_path = str((chunks_dir / chunk["path"]).relative_to(out_dir))
+                    index_entry["chunks"].append(
+                        {**chunk, "path": chunk_path, **_sha256_of(checksums, chunk_path)}
+                    )
+
             index.append(index_entry)
 
         # Save index.json
@@ -166,6 +270,7 @@ def build_index_main() -> int:
             layer_config=dummy_layer_config,
             index_data=index,
             days_back=7,
+            files=checksums,
         )
 
         return 0
@@ -178,7 +283,8 @@ def build_index_main() -> int:
 def main() -> int:
     """CLI entry point for index."""
     try:
-        return build_index_main()
+        with instrument.run("index"):
+            return build_index_main()
     except Exception as e:
         logger.error(f"Index command failed unexpectedly: {e}")
         return 1
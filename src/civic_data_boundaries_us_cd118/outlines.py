@@ -0,0 +1,123 @@
+"""State and US outlines dissolved from the exported districts.
+
+File: outlines.py
+
+With ``write_outlines`` on a vintage's nationwide layer, the export that
+writes the nationwide file also writes, under ``<vintage>/outlines/``:
+
+    <vintage>_states.geojson      one feature per state, the union of its districts
+    <vintage>_us_outline.geojson  one feature, the union of the state outlines
+
+Outlines come from the same in-memory (simplified) district frames as the
+nationwide file, so their borders match the districts exactly. Each state
+is dissolved with a single cascaded union (``shapely.union_all``) on a
+thread pool, and the US outline unions the 50-odd state outlines rather
+than every district again.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import os
+from pathlib import Path
+from typing import Any
+
+from civic_lib_core import log_utils
+from civic_lib_geo.us_constants import US_STATE_FIPS_TO_ABBR  # type: ignore
+import geopandas as gpd  # type: ignore
+import shapely
+
+from civic_data_boundaries_us_cd118.compact import coordinate_precision, geojson_write_options
+from civic_data_boundaries_us_cd118.utils import instrument
+from civic_data_boundaries_us_cd118.vintages import Vintage
+
+logger = log_utils.logger
+
+__all__ = [
+    "OUTLINES_DIR",
+    "dissolve_states",
+    "outline_paths_for",
+    "us_outline",
+    "write_outlines",
+]
+
+OUTLINES_DIR = "outlines"
+
+
+def outline_paths_for(vintage: Vintage) -> tuple[Path, Path]:
+    """Return the (state outlines, US outline) GeoJSON paths of a vintage."""
+    outlines_dir = vintage.out_dir / OUTLINES_DIR
+    return (
+        outlines_dir / f"{vintage.name}_states.geojson",
+        outlines_dir / f"{vintage.name}_us_outline.geojson",
+    )
+
+
+def _dissolve(gdf: gpd.GeoDataFrame) -> Any:
+    return shapely.union_all(gdf.geometry.to_numpy())
+
+
+def dissolve_states(
+    frames: dict[str, gpd.GeoDataFrame], state_column: str = "STATEFP", workers: int | None = None
+) -> gpd.GeoDataFrame:
+    """Dissolve each state's districts into one outline, in parallel across states.
+
+    Args:
+        frames (dict[str, gpd.GeoDataFrame]): District frames keyed by state FIPS.
+        state_column (str): Name of the state FIPS column in the result.
+        workers (int | None): Worker threads (default: CPU count).
+
+    Returns:
+        gpd.GeoDataFrame: One row per state, in FIPS order, with the state
+        FIPS, postal code and district count.
+    """
+    fips = sorted(frames)
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        geoms = list(pool.map(_dissolve, [frames[f] for f in fips]))
+    crs = next((frames[f].crs for f in fips), None)
+    return gpd.GeoDataFrame(
+        {
+            state_column: fips,
+            "STUSPS": [US_STATE_FIPS_TO_ABBR.get(f) for f in fips],
+            "districts": [len(frames[f]) for f in fips],
+        },
+        geometry=geoms,
+        crs=crs,
+    )
+
+
+def us_outline(states: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+    """Union state outlines into a single US outline feature."""
+    return gpd.GeoDataFrame(
+        {"states": [len(states)], "districts": [int(states["districts"].to_numpy().sum())]},
+        geometry=[shapely.union_all(states.geometry.to_numpy())],
+        crs=states.crs,
+    )
+
+
+def write_outlines(
+    frames: dict[str, gpd.GeoDataFrame], vintage: Vintage, workers: int | None = None
+) -> tuple[Path, Path]:
+    """Dissolve a vintage's district frames and write its state and US outlines.
+
+    Args:
+        frames (dict[str, gpd.GeoDataFrame]): District frames keyed by state FIPS.
+        vintage (Vintage): Vintage the frames belong to.
+        workers (int | None): Worker threads for the per-state dissolve.
+
+    Returns:
+        tuple: The (state outlines, US outline) paths.
+    """
+    states_path, us_path = outline_paths_for(vintage)
+    with instrument.span("outlines", vintage=vintage.name):
+        states = dissolve_states(frames, vintage.state_column, workers)
+        options = geojson_write_options(coordinate_precision(vintage.national))
+        states_path.parent.mkdir(parents=True, exist_ok=True)
+        states.to_file(states_path, driver="GeoJSON", **options)
+        us_outline(states).to_file(us_path, driver="GeoJSON", **options)
+        instrument.add(
+            features=len(states) + 1,
+            bytes_written=states_path.stat().st_size + us_path.stat().st_size,
+        )
+    logger.info(
+        f"[OUTLINES] {len(states)} state outlines and the US outline written to {us_path.parent}"
+    )
+    return states_path, us_path
@@ -1,23 +1,71 @@
 """Remote data access for civic-data-boundaries-us-cd118.
 
 File: src/civic_data_boundaries_us_cd118/remote.py
+
+``iter_features`` reads a GeoJSON FeatureCollection (local file or URL) as a
+stream and yields one feature at a time, so large layers such as
+``cd118_us.geojson`` never have to be held in memory whole.
 """
 
 from __future__ import annotations
 
+from collections.abc import Collection, Iterable, Iterator
+from contextlib import contextmanager
+import gzip
+import io
 import json
-from typing import Any
+from json.decoder import WHITESPACE  # type: ignore[attr-defined]
+import os
+from pathlib import Path
+from typing import IO, Any
 from urllib.request import urlopen
 
-BASE = "https://raw.githubusercontent.com/civic-interconnect/civic-data-boundaries-us-cd118/refs/heads/main/data-out"
+DEFAULT_BASE = "https://raw.githubusercontent.com/civic-interconnect/civic-data-boundaries-us-cd118/refs/heads/main/data-out"
+
+# Point the client at a mirror or a local `civic-us-cd118 serve` instance
+BASE_ENV = "CIVIC_REMOTE_BASE"
+
+BASE = os.environ.get(BASE_ENV, DEFAULT_BASE).rstrip("/")
+
+# Compact delta-encoded layers (see compact.py), written next to their GeoJSON
+COMPACT_FORMAT = "cd118-compact"
+COMPACT_VERSION = 1
+COMPACT_SUFFIX = ".compact.json"
+
+# Characters read from a stream at a time by iter_features
+STREAM_CHUNK_SIZE = 1 << 16
+
+BBox = tuple[float, float, float, float]
+
+
+def set_base(url: str | None) -> str:
+    """Set the base URL used by this module, or restore the default with None.
+
+    Returns:
+        str: The base URL now in effect.
+    """
+    global BASE
+    BASE = (url or DEFAULT_BASE).rstrip("/")
+    return BASE
+
+
+def _read_json(url: str) -> Any:
+    # URL scheme validation to ensure only http/https are allowed
+    if not url.startswith(("http:", "https:")):
+        raise ValueError("URL must start with 'http:' or 'https:'")
+    with urlopen(url) as r:  # nosec B310  # noqa: S310
+        return json.load(r)
 
 
-def load_index() -> list[dict[str, Any]]:
+def load_index(vintage: str | None = None) -> list[dict[str, Any]]:
     """Load the index of available congressional district boundaries from a remote JSON file.
 
     This function fetches the index.json file from the base URL which contains
     metadata about available congressional district boundary files.
 
+    Args:
+        vintage (str | None): Only return entries of this vintage (e.g. "cd119").
+
     Returns:
         list[dict[str, Any]]: A list of dictionaries containing metadata for each
             available congressional district boundary file. Each dictionary typically
@@ -29,12 +77,10 @@ def load_index() -> list[dict[str, Any]]:
         URLError: If there's an issue accessing the remote URL.
         JSONDecodeError: If the response cannot be parsed as valid JSON.
     """
-    url = f"{BASE}/index.json"
-    # URL scheme validation to ensure only http/https are allowed
-    if not url.startswith(("http:", "https:")):
-        raise ValueError("URL must start with 'http:' or 'https:'")
-    with urlopen(url) as r:  # nosec B310  # noqa: S310
-        return json.load(r)
+    index = _read_json(f"{BASE}/index.json")
+    if vintage is None:
+        return index
+    return [entry for entry in index if entry.get("vintage") == vintage]
 
 
 def file_url(rel_path: str) -> str:
@@ -54,3 +100,257 @@ def file_url(rel_path: str) -> str:
         "https://example.com/data/boundaries.json"
     """
     return f"{BASE}/{rel_path.lstrip('/')}"
+
+
+def _decode_ring(flat: list[int], scale: float) -> list[list[float]]:
+    """Undo the delta encoding of one ring and close it again."""
+    ring: list[list[float]] = []
+    x = y = 0
+    for i in range(0, len(flat), 2):
+        x += flat[i]
+        y += flat[i + 1]
+        ring.append([x / scale, y / scale])
+    if ring:
+        ring.append(ring[0])
+    return ring
+
+
+def decode_compact(doc: dict[str, Any]) -> dict[str, Any]:
+    """Convert a compact delta-encoded layer into a GeoJSON FeatureCollection.
+
+    Args:
+        doc (dict): Parsed contents of a ``*.compact.json`` file.
+
+    Returns:
+        dict: A GeoJSON FeatureCollection with Polygon or MultiPolygon features.
+
+    Raises:
+        ValueError: If the document is not a supported compact layer.
+    """
+    if doc.get("format") != COMPACT_FORMAT or doc.get("version") != COMPACT_VERSION:
+        raise ValueError(
+            f"Not a {COMPACT_FORMAT} v{COMPACT_VERSION} document: "
+            f"{doc.get('format')!r} v{doc.get('version')!r}"
+        )
+
+    scale = 10 ** doc["precision"]
+    columns = doc["columns"]
+    features: list[dict[str, Any]] = []
+    for feature in doc["features"]:
+        geometry: dict[str, Any] | None = None
+        if feature["g"] is not None:
+            polygons = [[_decode_ring(r, scale) for r in polygon] for polygon in feature["g"]]
+            if len(polygons) == 1:
+                geometry = {"type": "Polygon", "coordinates": polygons[0]}
+            else:
+                geometry = {"type": "MultiPolygon", "coordinates": polygons}
+        features.append(
+            {
+                "type": "Feature",
+                "properties": dict(zip(columns, feature["p"], strict=True)),
+                "geometry": geometry,
+            }
+        )
+
+    collection: dict[str, Any] = {"type": "FeatureCollection", "features": features}
+    if doc.get("bbox"):
+        collection["bbox"] = doc["bbox"]
+    return collection
+
+
+def load_compact(rel_path: str) -> dict[str, Any]:
+    """Download a compact layer and decode it to a GeoJSON FeatureCollection.
+
+    Args:
+        rel_path (str): Path of the ``*.compact.json`` file relative to the data root,
+            e.g. the ``compact`` field of an index.json entry.
+
+    Returns:
+        dict: The decoded GeoJSON FeatureCollection.
+    """
+    return decode_compact(_read_json(file_url(rel_path)))
+
+
+def _iter_positions(coords: Any) -> Iterable[tuple[float, float]]:
+    """Yield (x, y) positions from arbitrarily nested GeoJSON coordinates."""
+    if not coords:
+        return
+    if isinstance(coords[0], int | float):
+        yield coords[0], coords[1]
+        return
+    for part in coords:
+        yield from _iter_positions(part)
+
+
+def feature_bbox(feature: dict[str, Any]) -> BBox | None:
+    """Compute the bounding box of a GeoJSON feature.
+
+    Returns:
+        (minx, miny, maxx, maxy), or None if the feature has no coordinates.
+    """
+    geometry = feature.get("geometry") or {}
+    if geometry.get("type") == "GeometryCollection":
+        coords: Any = [g.get("coordinates", []) for g in geometry.get("geometries", [])]
+    else:
+        coords = geometry.get("coordinates", [])
+
+    xs: list[float] = []
+    ys: list[float] = []
+    for x, y in _iter_positions(coords):
+        xs.append(x)
+        ys.append(y)
+    if not xs:
+        return None
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+class _JSONStream:
+    """Decodes JSON values one at a time from a text stream, reading as needed."""
+
+    def __init__(self, f: IO[str], chunk_size: int = STREAM_CHUNK_SIZE):
+        self._f = f
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Append more input, at least doubling the unread part; False at EOF."""
+        if self._eof:
+            return False
+        pending = self._buf[self._pos :]
+        data = self._f.read(max(self._chunk_size, len(pending)))
+        if not data:
+            self._eof = True
+            return False
+        self._buf, self._pos = pending + data, 0
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character ("" at end of input)."""
+        while True:
+            self._pos = WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        """Consume ``char`` as the next non-whitespace character."""
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} in GeoJSON stream, found {found or 'end'!r}")
+        self._pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self._buf) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+
+def _iter_collection(stream: _JSONStream) -> Iterator[dict[str, Any]]:
+    """Yield the members of a FeatureCollection's "features" array, skipping other keys."""
+    stream.expect("{")
+    if stream.peek() == "}":
+        return
+    while True:
+        key = stream.value()
+        stream.expect(":")
+        if key != "features":
+            stream.value()
+        else:
+            stream.expect("[")
+            if stream.peek() == "]":
+                return
+            while True:
+                yield stream.value()
+                if stream.peek() == "]":
+                    # Nothing after the features is needed
+                    return
+                stream.expect(",")
+        if stream.peek() == "}":
+            return
+        stream.expect(",")
+
+
+@contextmanager
+def _open_text(path_or_url: str | os.PathLike[str]) -> Iterator[IO[str]]:
+    """Open a local file (optionally .gz) or an http(s) URL as a UTF-8 text stream."""
+    source = os.fspath(path_or_url)
+    if source.startswith(("http:", "https:")):
+        with urlopen(source) as r:  # nosec B310  # noqa: S310
+            yield io.TextIOWrapper(r, encoding="utf-8")
+    elif source.endswith(".gz"):
+        with gzip.open(source, "rt", encoding="utf-8") as f:
+            yield f
+    else:
+        with Path(source).open(encoding="utf-8") as f:
+            yield f
+
+
+def _allowed_values(properties: dict[str, Any] | None) -> dict[str, Collection[Any]]:
+    """Normalize a property filter to {key: allowed values}."""
+    return {
+        key: wanted if isinstance(wanted, Collection) and not isinstance(wanted, str) else (wanted,)
+        for key, wanted in (properties or {}).items()
+    }
+
+
+def _matches(
+    feature: dict[str, Any], bbox: BBox | None, allowed: dict[str, Collection[Any]]
+) -> bool:
+    if allowed:
+        props = feature.get("properties") or {}
+        if any(props.get(key) not in values for key, values in allowed.items()):
+            return False
+    if bbox is None:
+        return True
+    fb = feature_bbox(feature)
+    return fb is not None and not (
+        fb[0] > bbox[2] or fb[2] < bbox[0] or fb[1] > bbox[3] or fb[3] < bbox[1]
+    )
+
+
+def iter_features(
+    path_or_url: str | os.PathLike[str],
+    bbox: BBox | None = None,
+    properties: dict[str, Any] | None = None,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+) -> Iterator[dict[str, Any]]:
+    """Stream the features of a GeoJSON FeatureCollection one at a time.
+
+    Only the current feature (plus a read buffer) is held in memory, and
+    the rest of the document is not read once the features array ends.
+
+    Args:
+        path_or_url (str | PathLike): Local file (``.gz`` is decompressed) or
+            http(s) URL, e.g. ``file_url("national/cd118_us.geojson")``.
+        bbox (tuple | None): (minx, miny, maxx, maxy); only features whose
+            bounding box intersects it are yielded.
+        properties (dict | None): Only features whose properties match, e.g.
+            ``{"STATEFP20": "27"}``; a list or set value matches any of its items.
+        chunk_size (int): Characters read from the source at a time.
+
+    Yields:
+        dict: Each matching GeoJSON feature, in document order.
+
+    Raises:
+        ValueError: If the source is not a JSON object or is malformed.
+    """
+    allowed = _allowed_values(properties)
+    with _open_text(path_or_url) as f:
+        for feature in _iter_collection(_JSONStream(f, chunk_size)):
+            if _matches(feature, bbox, allowed):
+                yield feature
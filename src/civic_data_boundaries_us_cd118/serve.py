@@ -0,0 +1,559 @@
+"""Static HTTP server for data-out/ with the cache semantics a CDN expects.
+
+File: serve.py
+
+Used by civic-us-cd118 CLI:
+    civic-us-cd118 serve --port 8000
+
+An asyncio HTTP/1.1 server (GET, HEAD and CORS preflight, keep-alive) that
+supports:
+- strong ETags with If-None-Match (and If-Modified-Since) for 304 responses
+- single byte ranges (Range, If-Range) for 206 and 416 responses
+- precompressed sidecars: ``file.br`` / ``file.gz`` are sent with
+  Content-Encoding when the client accepts them (``--precompress`` writes .gz)
+- an in-memory LRU of small, frequently requested files, revalidated by
+  size and mtime on every request
+
+Point the Python client at it with ``remote.set_base("http://127.0.0.1:8000")``
+or the CIVIC_REMOTE_BASE environment variable.
+"""
+
+import asyncio
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager, suppress
+from email.utils import formatdate, parsedate_to_datetime
+import gzip
+import mimetypes
+import os
+from pathlib import Path
+import shutil
+import sys
+import threading
+from typing import NamedTuple
+from urllib.parse import unquote, urlsplit
+
+from civic_lib_core import log_utils
+
+from civic_data_boundaries_us_cd118.utils.get_paths import get_data_out_dir
+
+logger = log_utils.logger
+
+__all__ = [
+    "DEFAULT_CACHE_BYTES",
+    "DEFAULT_CACHE_FILE_BYTES",
+    "DEFAULT_MAX_AGE",
+    "ENCODINGS",
+    "HotCache",
+    "ServeConfig",
+    "accepted_encodings",
+    "main",
+    "make_etag",
+    "parse_range",
+    "precompress",
+    "running_server",
+    "start_server",
+]
+
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+DEFAULT_CACHE_FILE_BYTES = 4 * 1024 * 1024
+DEFAULT_MAX_AGE = 300
+
+# Sidecar encodings in order of preference, with their file suffixes
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+# Only these are worth precompressing; tiles and zips are already compressed
+COMPRESSIBLE_SUFFIXES = (".json", ".geojson", ".yaml", ".csv", ".txt")
+
+_STREAM_BLOCK = 256 * 1024
+_MAX_HEADERS = 100
+
+_CONTENT_TYPES = {
+    ".geojson": "application/geo+json",
+    ".json": "application/json",
+    ".pmtiles": "application/vnd.pmtiles",
+    ".npz": "application/octet-stream",
+    ".yaml": "application/yaml",
+}
+
+_PREFLIGHT_HEADERS = {
+    "Allow": "GET, HEAD, OPTIONS",
+    "Access-Control-Allow-Methods": "GET, HEAD, OPTIONS",
+    "Access-Control-Allow-Headers": "Range, If-None-Match, If-Modified-Since",
+    "Access-Control-Max-Age": "86400",
+}
+
+_REASONS = {
+    200: "OK",
+    204: "No Content",
+    206: "Partial Content",
+    304: "Not Modified",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    416: "Range Not Satisfiable",
+}
+
+
+class ServeConfig(NamedTuple):
+    """Settings for one server instance."""
+
+    root: Path
+    cache_bytes: int = DEFAULT_CACHE_BYTES
+    cache_file_bytes: int = DEFAULT_CACHE_FILE_BYTES
+    max_age: int = DEFAULT_MAX_AGE
+
+
+class _Representation(NamedTuple):
+    """The file chosen to answer a request: the original or a compressed sidecar."""
+
+    path: Path
+    size: int
+    mtime_ns: int
+    encoding: str | None
+
+
+class HotCache:
+    """LRU of file contents, keyed by path and validated by (size, mtime_ns)."""
+
+    def __init__(
+        self, max_bytes: int = DEFAULT_CACHE_BYTES, max_file_bytes: int = DEFAULT_CACHE_FILE_BYTES
+    ):
+        """Keep at most ``max_bytes`` in total, and no file over ``max_file_bytes``."""
+        self.max_bytes = max_bytes
+        self.max_file_bytes = max_file_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Path, tuple[tuple[int, int], bytes]] = OrderedDict()
+
+    def get(self, rep: _Representation) -> bytes | None:
+        """Return the cached bytes of a file, reading and caching it if it is small enough."""
+        if rep.size > self.max_file_bytes or rep.size > self.max_bytes:
+            return None
+        stamp = (rep.size, rep.mtime_ns)
+        entry = self._entries.get(rep.path)
+        if entry is not None and entry[0] == stamp:
+            self._entries.move_to_end(rep.path)
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        data = rep.path.read_bytes()
+        if len(data) != rep.size:
+            return data  # changed while reading; serve it but do not cache
+        if entry is not None:
+            self.nbytes -= len(entry[1])
+        self._entries[rep.path] = (stamp, data)
+        self._entries.move_to_end(rep.path)
+        self.nbytes += len(data)
+        while self.nbytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.nbytes -= len(evicted)
+        return data
+
+
+def make_etag(size: int, mtime_ns: int, encoding: str | None = None) -> str:
+    """Return a strong ETag for one representation of a file."""
+    tag = f"{size:x}-{mtime_ns:x}"
+    return f'"{tag}-{encoding}"' if encoding else f'"{tag}"'
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """Return True if an If-None-Match header matches (weak comparison)."""
+    if header.strip() == "*":
+        return True
+    bare = etag.removeprefix("W/")
+    return any(t.strip().removeprefix("W/") == bare for t in header.split(","))
+
+
+def accepted_encodings(header: str | None) -> set[str]:
+    """Return the content codings an Accept-Encoding header allows (q > 0)."""
+    accepted: set[str] = set()
+    for part in (header or "").split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if name and q > 0:
+            accepted.add(name.lower())
+    if "*" in accepted:
+        accepted.update(name for name, _ in ENCODINGS)
+    return accepted
+
+
+def parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """Parse a single-range ``Range: bytes=...`` header against a file size.
+
+    Returns:
+        (start, end) inclusive, or None if the header should be ignored
+        (malformed or several ranges; the full file is sent instead).
+
+    Raises:
+        ValueError: If the range cannot be satisfied (416).
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = (part.strip() for part in spec.strip().partition("-"))
+    if not sep or not (first.isdigit() or last.isdigit()):
+        return None
+    if (first and not first.isdigit()) or (last and not last.isdigit()):
+        return None
+    if not first:
+        suffix = int(last)
+        if suffix == 0 or size == 0:
+            raise ValueError("empty suffix range")
+        return max(size - suffix, 0), size - 1
+    start, end = int(first), int(last) if last else size - 1
+    if start >= size:
+        raise ValueError(f"range start {start} beyond size {size}")
+    if start > end:
+        return None
+    return start, min(end, size - 1)
+
+
+def _resolve(root: Path, target: str) -> Path | None:
+    """Map a request target to a file under root, or None (no traversal, no dirs)."""
+    path = unquote(urlsplit(target).path)
+    if "\x00" in path:
+        return None
+    candidate = (root / path.lstrip("/")).resolve()
+    if not candidate.is_relative_to(root) or not candidate.is_file():
+        return None
+    return candidate
+
+
+def _choose(path: Path, accept_encoding: str | None) -> _Representation:
+    """Pick the best precompressed sidecar the client accepts, else the file itself."""
+    st = path.stat()
+    accepted = accepted_encodings(accept_encoding)
+    for encoding, suffix in ENCODINGS:
+        if encoding not in accepted:
+            continue
+        sidecar = path.with_name(path.name + suffix)
+        try:
+            sst = sidecar.stat()
+        except OSError:
+            continue
+        # A sidecar older than its source is stale
+        if sst.st_mtime_ns >= st.st_mtime_ns:
+            return _Representation(sidecar, sst.st_size, sst.st_mtime_ns, encoding)
+    return _Representation(path, st.st_size, st.st_mtime_ns, None)
+
+
+def _has_sidecar(path: Path) -> bool:
+    return any(path.with_name(path.name + suffix).exists() for _, suffix in ENCODINGS)
+
+
+def _content_type(path: Path) -> str:
+    return (
+        _CONTENT_TYPES.get(path.suffix)
+        or mimetypes.guess_type(path.name)[0]
+        or "application/octet-stream"
+    )
+
+
+def _not_modified(headers: dict[str, str], etag: str, mtime_ns: int) -> bool:
+    if "if-none-match" in headers:
+        return _etag_matches(headers["if-none-match"], etag)
+    since = headers.get("if-modified-since")
+    if since:
+        try:
+            return int(mtime_ns // 1_000_000_000) <= int(parsedate_to_datetime(since).timestamp())
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _requested_range(headers: dict[str, str], etag: str, size: int) -> tuple[int, int] | None:
+    """Return the byte range to send, honouring If-Range; raises ValueError for 416."""
+    range_header = headers.get("range")
+    if_range = headers.get("if-range")
+    if not range_header or (if_range is not None and if_range.strip() != etag):
+        return None
+    return parse_range(range_header, size)
+
+
+async def _read_request(
+    reader: asyncio.StreamReader,
+) -> tuple[str, str, str, dict[str, str]] | None:
+    """Read a request line and headers; None on EOF."""
+    line = await reader.readline()
+    if not line:
+        return None
+    parts = line.decode("latin-1").split()
+    if len(parts) != 3:
+        raise ValueError("malformed request line")
+    method, target, version = parts
+
+    headers: dict[str, str] = {}
+    for _ in range(_MAX_HEADERS + 1):
+        raw = await reader.readline()
+        if raw in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = raw.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    else:
+        raise ValueError("too many headers")
+
+    # GET/HEAD bodies carry no meaning; drain them so keep-alive stays in sync
+    length = int(headers.get("content-length") or 0)
+    if length:
+        await reader.readexactly(length)
+    return method, target, version, headers
+
+
+def _head(status: int, headers: dict[str, str]) -> bytes:
+    lines = [f"HTTP/1.1 {status} {_REASONS.get(status, '')}"]
+    lines += [f"{k}: {v}" for k, v in headers.items()]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+async def _send_file(
+    writer: asyncio.StreamWriter, rep: _Representation, start: int, length: int, cache: HotCache
+) -> None:
+    data = cache.get(rep)
+    if data is not None:
+        writer.write(data[start : start + length])
+        await writer.drain()
+        return
+
+    with rep.path.open("rb") as f:
+        f.seek(start)
+        remaining = length
+        while remaining > 0:
+            block = await asyncio.to_thread(f.read, min(_STREAM_BLOCK, remaining))
+            if not block:
+                break
+            writer.write(block)
+            await writer.drain()
+            remaining -= len(block)
+
+
+def _entity_headers(path: Path, rep: _Representation, etag: str, max_age: int) -> dict[str, str]:
+    """Return the validator and caching headers shared by 200, 206, 304 and 416."""
+    entity = {
+        "ETag": etag,
+        "Last-Modified": formatdate(rep.mtime_ns / 1e9, usegmt=True),
+        "Cache-Control": f"public, max-age={max_age}",
+        "Accept-Ranges": "bytes",
+        "Access-Control-Expose-Headers": "ETag, Content-Range, Content-Length, Content-Encoding",
+    }
+    if rep.encoding or _has_sidecar(path):
+        entity["Vary"] = "Accept-Encoding"
+    return entity
+
+
+async def _respond(
+    writer: asyncio.StreamWriter,
+    cfg: ServeConfig,
+    cache: HotCache,
+    method: str,
+    target: str,
+    headers: dict[str, str],
+    keep_alive: bool,
+) -> int:
+    """Answer one request and return its status code."""
+    common = {
+        "Date": formatdate(usegmt=True),
+        "Server": "civic-us-cd118",
+        "Access-Control-Allow-Origin": "*",
+        "Connection": "keep-alive" if keep_alive else "close",
+    }
+
+    def simple(status: int, extra: dict[str, str] | None = None) -> int:
+        writer.write(_head(status, {**common, **(extra or {}), "Content-Length": "0"}))
+        return status
+
+    if method == "OPTIONS":
+        return simple(204, _PREFLIGHT_HEADERS)
+    if method not in ("GET", "HEAD"):
+        return simple(405, {"Allow": "GET, HEAD, OPTIONS"})
+
+    path = _resolve(cfg.root, target)
+    if path is None:
+        return simple(404)
+
+    rep = _choose(path, headers.get("accept-encoding"))
+    etag = make_etag(rep.size, rep.mtime_ns, rep.encoding)
+    entity = _entity_headers(path, rep, etag, cfg.max_age)
+
+    if _not_modified(headers, etag, rep.mtime_ns):
+        return simple(304, entity)
+
+    try:
+        byte_range = _requested_range(headers, etag, rep.size)
+    except ValueError:
+        return simple(416, {**entity, "Content-Range": f"bytes */{rep.size}"})
+    status, start, length = 200, 0, rep.size
+    if byte_range is not None:
+        status, start = 206, byte_range[0]
+        length = byte_range[1] - byte_range[0] + 1
+        entity["Content-Range"] = f"bytes {byte_range[0]}-{byte_range[1]}/{rep.size}"
+
+    response = {
+        **common,
+        **entity,
+        "Content-Type": _content_type(path),
+        "Content-Length": str(length),
+    }
+    if rep.encoding:
+        response["Content-Encoding"] = rep.encoding
+    writer.write(_head(status, response))
+    if method == "GET" and length:
+        await _send_file(writer, rep, start, length, cache)
+    return status
+
+
+async def _handle(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter, cfg: ServeConfig, cache: HotCache
+) -> None:
+    """Serve requests on one connection until it closes."""
+    try:
+        while True:
+            try:
+                request = await _read_request(reader)
+            except (ValueError, asyncio.LimitOverrunError, asyncio.IncompleteReadError):
+                writer.write(_head(400, {"Content-Length": "0", "Connection": "close"}))
+                break
+            if request is None:
+                break
+            method, target, version, headers = request
+            connection = headers.get("connection", "").lower()
+            keep_alive = connection != "close" and (
+                version == "HTTP/1.1" or connection == "keep-alive"
+            )
+
+            status = await _respond(writer, cfg, cache, method, target, headers, keep_alive)
+            await writer.drain()
+            logger.debug(f"[SERVE] {method} {target} {status}")
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.CancelledError):
+        pass
+    finally:
+        writer.close()
+        with suppress(ConnectionError):
+            await writer.wait_closed()
+
+
+async def start_server(
+    cfg: ServeConfig, host: str = "127.0.0.1", port: int = 8000
+) -> asyncio.Server:
+    """Start serving ``cfg.root`` and return the asyncio server (port 0 picks a free port)."""
+    cfg = cfg._replace(root=cfg.root.resolve())
+    cache = HotCache(cfg.cache_bytes, cfg.cache_file_bytes)
+
+    async def handler(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        await _handle(reader, writer, cfg, cache)
+
+    return await asyncio.start_server(handler, host, port)
+
+
+@contextmanager
+def running_server(cfg: ServeConfig, host: str = "127.0.0.1") -> Iterator[str]:
+    """Run a server on a free port in a background thread and yield its base URL."""
+    started = threading.Event()
+    state: dict = {}
+
+    async def run() -> None:
+        try:
+            server = await start_server(cfg, host, 0)
+        except OSError as e:
+            state["error"] = e
+            started.set()
+            return
+        stop = asyncio.get_running_loop().create_future()
+        state.update(
+            loop=asyncio.get_running_loop(), stop=stop, port=server.sockets[0].getsockname()[1]
+        )
+        started.set()
+        async with server:
+            await stop
+
+    # asyncio.run cancels open keep-alive connections cleanly on the way out
+    thread = threading.Thread(target=asyncio.run, args=(run(),), daemon=True)
+    thread.start()
+    started.wait()
+    if "error" in state:
+        raise state["error"]
+    try:
+        yield f"http://{host}:{state['port']}"
+    finally:
+        state["loop"].call_soon_threadsafe(state["stop"].set_result, None)
+        thread.join()
+
+
+def precompress(root: Path, min_bytes: int = 1024) -> int:
+    """Write ``.gz`` sidecars for compressible files under root that lack a fresh one.
+
+    Returns:
+        int: Number of sidecars written.
+    """
+    written = 0
+    for path in sorted(root.rglob("*")):
+        if not path.is_file() or path.suffix not in COMPRESSIBLE_SUFFIXES:
+            continue
+        st = path.stat()
+        if st.st_size < min_bytes:
+            continue
+        sidecar = path.with_name(path.name + ".gz")
+        if sidecar.exists() and sidecar.stat().st_mtime_ns >= st.st_mtime_ns:
+            continue
+        tmp = sidecar.with_name(sidecar.name + ".tmp")
+        # mtime=0 keeps the output byte-identical across runs
+        with path.open("rb") as src, gzip.GzipFile(tmp, "wb", compresslevel=9, mtime=0) as dst:
+            shutil.copyfileobj(src, dst)
+        tmp.replace(sidecar)
+        written += 1
+    logger.info(f"[SERVE] Wrote {written} .gz sidecar(s) under {root}")
+    return written
+
+
+async def _serve_forever(cfg: ServeConfig, host: str, port: int) -> None:
+    server = await start_server(cfg, host, port)
+    addresses = ", ".join(
+        f"http://{s.getsockname()[0]}:{s.getsockname()[1]}" for s in server.sockets
+    )
+    logger.info(f"[SERVE] Serving {cfg.root} on {addresses} (Ctrl+C to stop)")
+    async with server:
+        await server.serve_forever()
+
+
+def main(
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    cache_mb: int = DEFAULT_CACHE_BYTES // (1024 * 1024),
+    max_age: int = DEFAULT_MAX_AGE,
+    precompress_files: bool = False,
+) -> int:
+    """Serve data-out/ over HTTP until interrupted.
+
+    Returns:
+        int: 0 on a clean shutdown, 1 on error.
+    """
+    try:
+        root = get_data_out_dir()
+        if not root.is_dir():
+            raise FileNotFoundError(f"Nothing to serve; {root} does not exist")
+        if precompress_files:
+            precompress(root)
+        cfg = ServeConfig(root, cache_bytes=cache_mb * 1024 * 1024, max_age=max_age)
+        asyncio.run(_serve_forever(cfg, host, port))
+        return 0
+    except KeyboardInterrupt:
+        logger.info("[SERVE] Stopped.")
+        return 0
+    except Exception as e:
+        logger.error(f"Serve failed: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(port=int(os.environ.get("PORT", "8000"))))
@@ -0,0 +1,379 @@
+"""Sharded build: plan per-state work, run shards on many nodes, reduce.
+
+File: shards.py
+
+Used by civic-us-cd118 CLI:
+    civic-us-cd118 shard plan    [--shard-size N]
+    civic-us-cd118 shard work    [--processes N]    (on every node)
+    civic-us-cd118 shard reduce
+
+``plan`` splits the per-FIPS work of each vintage (fetch plus export, as in
+fetch.process_layer and export_cd118) into shards of a few states and writes
+them to ``plan.json`` in a work directory shared by all nodes. ``work``
+claims shards one at a time by taking an exclusive, non-blocking ``flock`` on
+the shard's lock file, fetches and exports its states, and records the
+manifest entries in ``results/<shard>.json``. A node that dies releases its
+locks, so its shard is picked up by the next ``work`` run. ``reduce`` fails
+until every shard has a result, then writes each vintage's nationwide file
+and manifest, chunks, and rebuilds index.json.
+
+Layout of the work directory (default: shards/ next to data-out/):
+    plan.json                  {"version", "created", "shards": [{"id", "vintage", "fips"}]}
+    locks/<shard>.lock         held while a node runs the shard
+    results/<shard>.json       {"id", "vintage", "host", "finished_at", "entries"}
+    reports/<host>-<pid>/      run report of each work process
+
+State GeoJSONs are written straight to data-out/, so nodes must share it
+(e.g. ``--data-out`` on a network filesystem) for ``reduce`` to read them.
+"""
+
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+import json
+import os
+from pathlib import Path
+import shutil
+import socket
+import sys
+from typing import Any, NamedTuple, cast
+
+from civic_lib_core import date_utils, log_utils
+from civic_lib_geo.us_constants import (  # type: ignore
+    US_STATE_FIPS_TO_ABBR,
+    get_state_dir_name,
+)
+import geopandas as gpd  # type: ignore
+
+from civic_data_boundaries_us_cd118.export import chunk_layers
+from civic_data_boundaries_us_cd118.export_cd118 import (
+    export_state,
+    state_config,
+    write_cd118_manifest,
+    write_nationwide,
+)
+from civic_data_boundaries_us_cd118.fetch import LayerConfig, fetch_state, layer_state_fips
+from civic_data_boundaries_us_cd118.index import build_index_main
+from civic_data_boundaries_us_cd118.utils import instrument
+from civic_data_boundaries_us_cd118.utils.get_paths import get_data_out_dir
+from civic_data_boundaries_us_cd118.vintages import Vintage, get_vintage, load_vintages
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = log_utils.logger
+
+__all__ = [
+    "DEFAULT_SHARD_SIZE",
+    "SHARD_PLAN_FILENAME",
+    "Shard",
+    "ShardError",
+    "default_work_dir",
+    "load_plan",
+    "main",
+    "plan_shards",
+    "reduce_shards",
+    "run_shard",
+    "work",
+    "work_local",
+]
+
+SHARD_PLAN_FILENAME = "plan.json"
+SHARD_PLAN_VERSION = 1
+DEFAULT_SHARD_SIZE = 4
+
+
+class ShardError(RuntimeError):
+    """Raised when a shard plan is missing or incomplete, or a shard cannot run."""
+
+
+class Shard(NamedTuple):
+    """A unit of work: some states of one vintage."""
+
+    id: str
+    vintage: str
+    fips: list[str]
+
+
+def default_work_dir() -> Path:
+    """Return the default shared work directory (shards/ next to data-out/)."""
+    return get_data_out_dir().parent / "shards"
+
+
+def _write_json_atomic(path: Path, data: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{socket.gethostname()}.{os.getpid()}.tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    tmp.replace(path)
+
+
+def _result_path(work_dir: Path, shard: Shard) -> Path:
+    return work_dir / "results" / f"{shard.id}.json"
+
+
+def plan_shards(
+    work_dir: Path, vintages: list[str] | None = None, shard_size: int = DEFAULT_SHARD_SIZE
+) -> list[Shard]:
+    """Split each vintage's states into shards and write plan.json.
+
+    Results and locks of any previous plan in ``work_dir`` are removed, so
+    run this before starting workers.
+
+    Args:
+        work_dir (Path): Directory shared by every node.
+        vintages (list[str] | None): Vintages to plan; None for all enabled.
+        shard_size (int): States per shard.
+
+    Returns:
+        list[Shard]: The planned shards.
+    """
+    if shard_size < 1:
+        raise ShardError(f"shard_size must be at least 1, got {shard_size}")
+
+    shards: list[Shard] = []
+    for vintage in load_vintages(vintages):
+        codes = layer_state_fips(cast("LayerConfig", vintage.layer))
+        for n, start in enumerate(range(0, len(codes), shard_size)):
+            shards.append(
+                Shard(f"{vintage.name}-{n:03d}", vintage.name, codes[start : start + shard_size])
+            )
+
+    for stale in ("results", "locks"):
+        shutil.rmtree(work_dir / stale, ignore_errors=True)
+    _write_json_atomic(
+        work_dir / SHARD_PLAN_FILENAME,
+        {
+            "version": SHARD_PLAN_VERSION,
+            "created": date_utils.now_utc_str(),
+            "shards": [shard._asdict() for shard in shards],
+        },
+    )
+    logger.info(f"[SHARD] Planned {len(shards)} shards in {work_dir}")
+    return shards
+
+
+def load_plan(work_dir: Path) -> list[Shard]:
+    """Read the shards of plan.json in ``work_dir``.
+
+    Raises:
+        ShardError: If there is no plan, or it was written by another version.
+    """
+    plan_path = work_dir / SHARD_PLAN_FILENAME
+    if not plan_path.exists():
+        raise ShardError(f"No shard plan at {plan_path}; run 'shard plan' first")
+    with plan_path.open(encoding="utf-8") as f:
+        plan = json.load(f)
+    if plan.get("version") != SHARD_PLAN_VERSION:
+        raise ShardError(f"Unsupported shard plan version {plan.get('version')!r}")
+    return [Shard(s["id"], s["vintage"], list(s["fips"])) for s in plan["shards"]]
+
+
+@contextmanager
+def _claim(lock_path: Path) -> Iterator[bool]:
+    """Try to take an exclusive lock on a shard without waiting; yields whether it was taken."""
+    if fcntl is None:
+        raise ShardError("Claiming shards needs fcntl file locks (not available on Windows)")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with lock_path.open("a") as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _state_shapefile(vintage: Vintage, state_fips: str) -> Path:
+    for shp_file, fips in vintage.iter_shapefiles():
+        if fips == state_fips:
+            return shp_file
+    raise ShardError(f"No {vintage.name} shapefile for FIPS {state_fips} in {vintage.in_dir}")
+
+
+def run_shard(shard: Shard, fetch: bool = True) -> list[dict[str, Any]]:
+    """Fetch (unless ``fetch`` is False) and export the states of one shard.
+
+    Returns:
+        list[dict]: The states' manifest entries, in FIPS order.
+    """
+    vintage = get_vintage(shard.vintage)
+    layer = vintage.layer
+    entries: list[dict[str, Any]] = []
+    with instrument.span(shard.id, vintage=vintage.name):
+        for state_fips in shard.fips:
+            if fetch and layer.get("base_url"):
+                fetch_state(cast("LayerConfig", layer), state_fips)
+            state_name = get_state_dir_name(US_STATE_FIPS_TO_ABBR[state_fips])
+            _, entry = export_state(
+                _state_shapefile(vintage, state_fips),
+                state_fips,
+                state_name,
+                state_config(layer, state_fips),
+                vintage,
+            )
+            entries.append(entry)
+    return entries
+
+
+def work(work_dir: Path, fetch: bool = True, max_shards: int | None = None) -> list[str]:
+    """Claim and run shards until none is left unclaimed.
+
+    Shards with a result or locked by another node are skipped.
+
+    Args:
+        work_dir (Path): Directory holding plan.json.
+        fetch (bool): Download each state's shapefile before exporting it.
+        max_shards (int | None): Stop after running this many shards.
+
+    Returns:
+        list[str]: Ids of the shards this call ran.
+    """
+    ran: list[str] = []
+    for shard in load_plan(work_dir):
+        if max_shards is not None and len(ran) >= max_shards:
+            break
+        result_path = _result_path(work_dir, shard)
+        if result_path.exists():
+            continue
+        with _claim(work_dir / "locks" / f"{shard.id}.lock") as claimed:
+            # Another node may have finished it between the check and the claim
+            if not claimed or result_path.exists():
+                continue
+            logger.info(f"[SHARD] Running {shard.id} ({', '.join(shard.fips)})")
+            entries = run_shard(shard, fetch=fetch)
+            _write_json_atomic(
+                result_path,
+                {
+                    "id": shard.id,
+                    "vintage": shard.vintage,
+                    "host": socket.gethostname(),
+                    "finished_at": date_utils.now_utc_str(),
+                    "entries": entries,
+                },
+            )
+            ran.append(shard.id)
+    return ran
+
+
+def _work_process(work_dir: Path, fetch: bool) -> list[str]:
+    """Run ``work`` as its own command, with its own run report."""
+    report_dir = work_dir / "reports" / f"{socket.gethostname()}-{os.getpid()}"
+    with instrument.run("shard-work", out_dir=report_dir):
+        return work(work_dir, fetch=fetch)
+
+
+def work_local(work_dir: Path, processes: int | None = None, fetch: bool = True) -> list[str]:
+    """Run ``work`` in several local processes, standing in for several nodes.
+
+    Returns:
+        list[str]: Ids of the shards run, across all processes.
+    """
+    processes = processes or os.cpu_count() or 1
+    if processes == 1:
+        return _work_process(work_dir, fetch)
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [pool.submit(_work_process, work_dir, fetch) for _ in range(processes)]
+        return sorted(shard_id for future in futures for shard_id in future.result())
+
+
+def _read_results(work_dir: Path, shards: list[Shard]) -> dict[str, list[dict[str, Any]]]:
+    """Return every vintage's manifest entries from the shard results, in FIPS order."""
+    missing = [shard.id for shard in shards if not _result_path(work_dir, shard).exists()]
+    if missing:
+        raise ShardError(f"{len(missing)} shard(s) not finished: {missing}")
+
+    entries: dict[str, list[dict[str, Any]]] = {}
+    for shard in shards:
+        with _result_path(work_dir, shard).open(encoding="utf-8") as f:
+            entries.setdefault(shard.vintage, []).extend(json.load(f)["entries"])
+    return {
+        name: sorted(vintage_entries, key=lambda e: e["state_fips"])
+        for name, vintage_entries in entries.items()
+    }
+
+
+def _read_state(vintage: Vintage, entry: dict[str, Any]) -> gpd.GeoDataFrame:
+    path = vintage.state_out_path(entry["state_name"])
+    instrument.add(bytes_read=path.stat().st_size)
+    return gpd.read_file(path)
+
+
+def reduce_shards(work_dir: Path, workers: int | None = None) -> dict[str, Path | None]:
+    """Merge finished shards into each vintage's nationwide file, manifest and index.json.
+
+    Args:
+        work_dir (Path): Directory holding plan.json and the shard results.
+        workers (int | None): Threads reading the state GeoJSONs back.
+
+    Returns:
+        dict: Nationwide file written per vintage (None if it has no nationwide layer).
+
+    Raises:
+        ShardError: If some shard has no result yet.
+    """
+    shards = load_plan(work_dir)
+    results = _read_results(work_dir, shards)
+    written: dict[str, Path | None] = {}
+
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        read_state = instrument.bind(_read_state)
+        for name, entries in results.items():
+            vintage = get_vintage(name)
+            with instrument.span("reduce", vintage=name):
+                written[name] = None
+                if vintage.national:
+                    gdfs = list(pool.map(read_state, [vintage] * len(entries), entries))
+                    written[name] = write_nationwide(
+                        gdfs, vintage.national, vintage, [e["state_fips"] for e in entries]
+                    )
+                write_cd118_manifest(entries, vintage)
+
+    with instrument.span("chunk", rollup_features=False):
+        chunk_layers(list(results))
+    with instrument.span("index", rollup_features=False):
+        if build_index_main() != 0:
+            raise ShardError("Index build failed.")
+    return written
+
+
+def main(
+    step: str,
+    work_dir: Path | None = None,
+    vintages: list[str] | None = None,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    processes: int | None = None,
+    fetch: bool = True,
+    workers: int | None = None,
+) -> int:
+    """Run one step of a sharded build: "plan", "work" or "reduce".
+
+    Returns:
+        int: 0 if successful, 1 on error.
+    """
+    work_dir = work_dir or default_work_dir()
+    try:
+        if step == "plan":
+            with instrument.run("shard-plan"):
+                plan_shards(work_dir, vintages, shard_size)
+        elif step == "work":
+            ran = work_local(work_dir, processes, fetch)
+            logger.info(f"[SHARD] Ran {len(ran)} shard(s) on {socket.gethostname()}")
+        elif step == "reduce":
+            with instrument.run("shard-reduce"):
+                reduce_shards(work_dir, workers)
+        else:
+            raise ShardError(f"Unknown shard step '{step}'; use plan, work or reduce")
+        return 0
+    except Exception as e:
+        logger.error(f"Shard {step} failed: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1] if len(sys.argv) > 1 else "work"))
@@ -0,0 +1,254 @@
+"""Compact, columnar in-memory store of exported districts.
+
+File: store.py
+
+Meant for long-lived processes (API workers) that hold all districts in
+memory. Instead of a GeoDataFrame or per-district dicts, a DistrictStore keeps:
+- numeric properties in typed numpy arrays (integers downcast to fit)
+- string properties dictionary-encoded: small integer codes plus one tuple of values
+- all geometries as a single WKB buffer with an offsets array, decoded lazily
+- a bounds array for bbox queries and point lookups without decoding
+
+Example:
+    store = DistrictStore.from_geojson(get_national_out_dir() / "cd118_us.geojson")
+    district = store.locate(-93.26, 44.98)
+    print(district["GEOID20"], district.geometry.area)
+"""
+
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import geopandas as gpd  # type: ignore
+import numpy as np
+import pandas as pd  # type: ignore
+import shapely
+
+__all__ = [
+    "DEFAULT_KEY_COLUMN",
+    "District",
+    "DistrictStore",
+]
+
+# Unique district identifier in the TIGER/Line 2022 CD118 attributes
+DEFAULT_KEY_COLUMN = "GEOID20"
+
+
+class District:
+    """Lightweight view of one district in a DistrictStore.
+
+    Holds only a reference to the store and a row number; properties and
+    geometry are read from the store on access.
+    """
+
+    __slots__ = ("index", "store")
+
+    def __init__(self, store: "DistrictStore", index: int):
+        """Create a view of row ``index`` of ``store``."""
+        self.store = store
+        self.index = index
+
+    def __getitem__(self, column: str) -> Any:
+        """Return one property value."""
+        return self.store.value(self.index, column)
+
+    def __repr__(self) -> str:
+        """Return a short description using the store's key column."""
+        return f"District({self.key!r})"
+
+    @property
+    def key(self) -> Any:
+        """Return the value of the store's key column (GEOID20 by default)."""
+        return self.store.value(self.index, self.store.key_column)
+
+    @property
+    def properties(self) -> dict[str, Any]:
+        """Return all properties as a new dict."""
+        return {c: self.store.value(self.index, c) for c in self.store.columns}
+
+    @property
+    def bbox(self) -> tuple[float, float, float, float]:
+        """Return (minx, miny, maxx, maxy) without decoding the geometry."""
+        minx, miny, maxx, maxy = self.store.bounds[self.index]
+        return float(minx), float(miny), float(maxx), float(maxy)
+
+    @property
+    def geometry(self) -> Any:
+        """Decode and return the shapely geometry (not cached)."""
+        return self.store.geometry(self.index)
+
+
+class _DictColumn:
+    """A dictionary-encoded string column: integer codes into a tuple of values."""
+
+    __slots__ = ("codes", "values")
+
+    def __init__(self, codes: np.ndarray, values: tuple[Any, ...]):
+        self.codes = codes
+        self.values = values
+
+    def get(self, i: int) -> Any:
+        code = int(self.codes[i])
+        return None if code < 0 else self.values[code]
+
+    def to_numpy(self) -> np.ndarray:
+        lookup = np.array([*self.values, None], dtype=object)
+        return lookup[self.codes]  # code -1 maps to the trailing None
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + sum(len(str(v)) for v in self.values)
+
+
+def _smallest_int_dtype(max_value: int) -> type[np.signedinteger]:
+    for dtype in (np.int8, np.int16, np.int32):
+        if max_value <= np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def _encode_column(series: pd.Series) -> np.ndarray | _DictColumn:
+    if pd.api.types.is_bool_dtype(series) or pd.api.types.is_float_dtype(series):
+        return series.to_numpy()
+    if pd.api.types.is_integer_dtype(series):
+        return np.asarray(pd.to_numeric(series, downcast="integer"))
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    dtype = _smallest_int_dtype(len(uniques))
+    return _DictColumn(codes.astype(dtype), tuple(uniques.tolist()))
+
+
+class DistrictStore:
+    """All districts of a layer in typed arrays plus one WKB buffer."""
+
+    __slots__ = ("_columns", "_offsets", "_wkb", "bounds", "crs", "key_column")
+
+    def __init__(
+        self,
+        columns: dict[str, np.ndarray | _DictColumn],
+        wkb: bytes,
+        offsets: np.ndarray,
+        bounds: np.ndarray,
+        crs: str | None = None,
+        key_column: str = DEFAULT_KEY_COLUMN,
+    ):
+        """Create a store from encoded parts; use ``from_frame`` or ``from_geojson``."""
+        self._columns = columns
+        self._wkb = wkb
+        self._offsets = offsets
+        self.bounds = bounds
+        self.crs = crs
+        self.key_column = key_column
+
+    @classmethod
+    def from_frame(
+        cls, gdf: gpd.GeoDataFrame, key_column: str = DEFAULT_KEY_COLUMN
+    ) -> "DistrictStore":
+        """Build a store from a GeoDataFrame (e.g. a per-state or nationwide export)."""
+        geoms = gdf.geometry.to_numpy()
+        blobs = shapely.to_wkb(geoms)
+        lengths = np.fromiter((0 if b is None else len(b) for b in blobs), np.int64, len(blobs))
+        offsets = np.zeros(len(blobs) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+
+        columns = {
+            str(name): _encode_column(series)
+            for name, series in gdf.items()
+            if name != gdf.geometry.name
+        }
+        return cls(
+            columns=columns,
+            wkb=b"".join(b for b in blobs if b is not None),
+            offsets=offsets,
+            bounds=shapely.bounds(geoms),
+            crs=gdf.crs.to_string() if gdf.crs else None,
+            key_column=key_column,
+        )
+
+    @classmethod
+    def from_geojson(cls, path: Path, key_column: str = DEFAULT_KEY_COLUMN) -> "DistrictStore":
+        """Build a store straight from an exported GeoJSON file."""
+        return cls.from_frame(gpd.read_file(path), key_column=key_column)
+
+    def __len__(self) -> int:
+        """Return the number of districts."""
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> District:
+        """Return a view of one district by row number."""
+        if not -len(self) <= index < len(self):
+            raise IndexError(f"district index out of range: {index}")
+        return District(self, index % len(self))
+
+    def __iter__(self) -> Iterator[District]:
+        """Iterate over views of all districts."""
+        return (District(self, i) for i in range(len(self)))
+
+    @property
+    def columns(self) -> list[str]:
+        """Return the property column names."""
+        return list(self._columns)
+
+    @property
+    def nbytes(self) -> int:
+        """Return the approximate memory held by properties, geometry and bounds."""
+        props = sum(c.nbytes for c in self._columns.values())
+        return props + len(self._wkb) + self._offsets.nbytes + self.bounds.nbytes
+
+    def value(self, index: int, column: str) -> Any:
+        """Return one property value as a plain Python object."""
+        col = self._columns[column]
+        if isinstance(col, _DictColumn):
+            return col.get(index)
+        return col[index].item()
+
+    def column(self, column: str) -> np.ndarray:
+        """Return a whole property column as a numpy array."""
+        col = self._columns[column]
+        return col.to_numpy() if isinstance(col, _DictColumn) else col
+
+    def geometry(self, index: int) -> Any:
+        """Decode one geometry from the WKB buffer, or return None if it is missing."""
+        start, end = self._offsets[index], self._offsets[index + 1]
+        if start == end:
+            return None
+        return shapely.from_wkb(self._wkb[start:end])
+
+    def geometries(self, indices: np.ndarray | list[int] | None = None) -> np.ndarray:
+        """Decode several geometries at once (all if ``indices`` is None)."""
+        rows = np.arange(len(self)) if indices is None else np.asarray(indices, dtype=np.int64)
+        blobs = np.array(
+            [self._wkb[self._offsets[i] : self._offsets[i + 1]] or None for i in rows],
+            dtype=object,
+        )
+        return shapely.from_wkb(blobs)
+
+    def find(self, column: str, value: Any) -> list[District]:
+        """Return the districts whose ``column`` equals ``value``."""
+        col = self._columns[column]
+        if isinstance(col, _DictColumn):
+            if value not in col.values:
+                return []
+            matches = np.flatnonzero(col.codes == col.values.index(value))
+        else:
+            matches = np.flatnonzero(col == value)
+        return [District(self, int(i)) for i in matches]
+
+    def get(self, key: Any) -> District | None:
+        """Return the district with the given key (GEOID20 by default), if any."""
+        found = self.find(self.key_column, key)
+        return found[0] if found else None
+
+    def query_bbox(self, minx: float, miny: float, maxx: float, maxy: float) -> np.ndarray:
+        """Return the row numbers of districts whose bbox intersects the given box."""
+        b = self.bounds
+        hits = (b[:, 0] <= maxx) & (b[:, 2] >= minx) & (b[:, 1] <= maxy) & (b[:, 3] >= miny)
+        return np.flatnonzero(hits)
+
+    def locate(self, x: float, y: float) -> District | None:
+        """Return the district containing a point, decoding only bbox candidates."""
+        candidates = self.query_bbox(x, y, x, y)
+        if not len(candidates):
+            return None
+        inside = shapely.intersects_xy(self.geometries(candidates), x, y)
+        hits = candidates[inside]
+        return District(self, int(hits[0])) if len(hits) else None
@@ -0,0 +1,630 @@
+"""Builds a Mapbox Vector Tile pyramid from a vintage's nationwide export.
+
+File: tiles.py
+
+Used by civic-us-cd118 CLI:
+    civic-us-cd118 tiles
+
+This module:
+- Projects the nationwide GeoJSON to Web Mercator once
+- Simplifies the districts once per zoom level, before starting the workers
+- Clips districts per tile, in parallel across tiles
+- Encodes each tile as a gzipped MVT (protobuf) layer
+- Packs all tiles into a single PMTiles v3 archive with a directory index
+"""
+
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+import gzip
+import hashlib
+import json
+import math
+import os
+from pathlib import Path
+import struct
+import sys
+from typing import Any, NamedTuple
+
+from civic_lib_core import log_utils
+import geopandas as gpd  # type: ignore
+import numpy as np
+import shapely
+
+from civic_data_boundaries_us_cd118.chunking import hilbert_index
+from civic_data_boundaries_us_cd118.utils import instrument
+from civic_data_boundaries_us_cd118.vintages import DEFAULT_VINTAGE, get_vintage
+
+logger = log_utils.logger
+
+__all__ = [
+    "TileEntry",
+    "build_tiles",
+    "encode_mvt_layer",
+    "main",
+    "read_tile",
+    "write_pmtiles",
+    "zxy_to_tileid",
+]
+
+EXTENT = 4096
+BUFFER = 64  # tile units of overlap so strokes don't show seams at tile edges
+WORLD_HALF = 20037508.342789244  # Web Mercator half-width in meters
+TILE_BATCH_SIZE = 256
+
+PMTILES_HEADER_SIZE = 127
+PMTILES_ROOT_MAX = 16384 - PMTILES_HEADER_SIZE
+PMTILES_COMPRESSION_GZIP = 2
+PMTILES_TILE_TYPE_MVT = 1
+
+_HEADER_FORMAT = "<7sB11Q6B4iB2i"
+
+_MVT_POLYGON = 3
+_CMD_MOVE_TO = 1
+_CMD_LINE_TO = 2
+_CMD_CLOSE_PATH = 7
+
+
+class TileEntry(NamedTuple):
+    """A PMTiles directory entry; run_length 0 marks a leaf directory pointer."""
+
+    tile_id: int
+    offset: int
+    length: int
+    run_length: int
+
+
+# ---------- Protobuf / MVT encoding ----------
+
+
+def _varint(n: int) -> bytes:
+    out = bytearray()
+    while n > 0x7F:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+    return bytes(out)
+
+
+def _zigzag(n: int) -> int:
+    return (n << 1) ^ (n >> 63)
+
+
+def _key(field: int, wire_type: int) -> bytes:
+    return _varint((field << 3) | wire_type)
+
+
+def _length_delimited(field: int, payload: bytes) -> bytes:
+    return _key(field, 2) + _varint(len(payload)) + payload
+
+
+def _packed(field: int, values: Iterable[int]) -> bytes:
+    return _length_delimited(field, b"".join(_varint(v) for v in values))
+
+
+def _encode_value(value: Any) -> bytes:
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, bool):
+        return _key(7, 0) + _varint(int(value))
+    if isinstance(value, int):
+        return _key(6, 0) + _varint(_zigzag(value))
+    if isinstance(value, float):
+        return _key(3, 1) + struct.pack("<d", value)
+    return _length_delimited(1, str(value).encode("utf-8"))
+
+
+def _ring_commands(ring: np.ndarray, cursor: list[int]) -> list[int]:
+    """Encode one closed ring (without its repeated last point) as MVT commands."""
+    commands = [(_CMD_MOVE_TO & 0x7) | (1 << 3)]
+    x, y = int(ring[0, 0]), int(ring[0, 1])
+    commands += [_zigzag(x - cursor[0]), _zigzag(y - cursor[1])]
+    cursor[0], cursor[1] = x, y
+
+    commands.append((_CMD_LINE_TO & 0x7) | ((len(ring) - 1) << 3))
+    for px, py in ring[1:]:
+        x, y = int(px), int(py)
+        commands += [_zigzag(x - cursor[0]), _zigzag(y - cursor[1])]
+        cursor[0], cursor[1] = x, y
+
+    commands.append((_CMD_CLOSE_PATH & 0x7) | (1 << 3))
+    return commands
+
+
+def _prepare_ring(coords: np.ndarray, exterior: bool) -> np.ndarray | None:
+    """Drop repeated points and orient a tile-space ring as the MVT spec requires.
+
+    Exterior rings need a positive shoelace area in tile coordinates (y down)
+    and interior rings a negative one. Rings that collapse are dropped.
+    """
+    ring = coords[:-1] if len(coords) > 1 and (coords[0] == coords[-1]).all() else coords
+    if len(ring) > 1:
+        keep = np.ones(len(ring), dtype=bool)
+        keep[1:] = (np.diff(ring, axis=0) != 0).any(axis=1)
+        ring = ring[keep]
+        if len(ring) > 1 and (ring[0] == ring[-1]).all():
+            ring = ring[:-1]
+    if len(ring) < 3:
+        return None
+
+    x, y = ring[:, 0], ring[:, 1]
+    area = int(np.sum(x * np.roll(y, -1) - np.roll(x, -1) * y))
+    if area == 0:
+        return None
+    if (area > 0) != exterior:
+        ring = ring[::-1]
+    return ring
+
+
+def encode_polygons(polygons: list[list[np.ndarray]]) -> list[int]:
+    """Encode polygons (lists of integer tile-space rings, exterior first) as MVT geometry."""
+    cursor = [0, 0]
+    commands: list[int] = []
+    for rings in polygons:
+        exterior = _prepare_ring(rings[0], exterior=True)
+        if exterior is None:
+            continue
+        commands += _ring_commands(exterior, cursor)
+        for hole in rings[1:]:
+            interior = _prepare_ring(hole, exterior=False)
+            if interior is not None:
+                commands += _ring_commands(interior, cursor)
+    return commands
+
+
+def encode_mvt_layer(
+    name: str,
+    features: list[tuple[int, dict[str, Any], list[int]]],
+    extent: int = EXTENT,
+) -> bytes:
+    """Encode a single-layer MVT tile.
+
+    Args:
+        name (str): Layer name.
+        features (list): (feature id, properties, polygon geometry commands) tuples.
+        extent (int): Tile extent in integer units.
+
+    Returns:
+        bytes: The uncompressed protobuf tile.
+    """
+    keys: dict[str, int] = {}
+    values: dict[tuple[type, Any], int] = {}
+    encoded_features: list[bytes] = []
+
+    for fid, props, geometry in features:
+        tags: list[int] = []
+        for k, v in props.items():
+            if v is None or (isinstance(v, float) and math.isnan(v)):
+                continue
+            tags.append(keys.setdefault(k, len(keys)))
+            tags.append(values.setdefault((type(v), v), len(values)))
+        feature = _key(1, 0) + _varint(fid)
+        feature += _packed(2, tags)
+        feature += _key(3, 0) + _varint(_MVT_POLYGON)
+        feature += _packed(4, geometry)
+        encoded_features.append(_length_delimited(2, feature))
+
+    layer = _key(15, 0) + _varint(2)
+    layer += _length_delimited(1, name.encode("utf-8"))
+    layer += b"".join(encoded_features)
+    layer += b"".join(_length_delimited(3, k.encode("utf-8")) for k in keys)
+    layer += b"".join(_length_delimited(4, _encode_value(v)) for _, v in values)
+    layer += _key(5, 0) + _varint(extent)
+    return _length_delimited(3, layer)
+
+
+# ---------- Tile rendering (runs in worker processes) ----------
+
+_WORKER: dict[str, Any] = {}
+
+
+def _init_worker(
+    wkb: list[bytes],
+    simplified: dict[int, list[bytes]],
+    props: list[dict[str, Any]],
+    layer_name: str,
+) -> None:
+    geoms = shapely.from_wkb(np.asarray(wkb, dtype=object))
+    _WORKER.update(
+        tree=shapely.STRtree(geoms),
+        simplified={
+            z: shapely.from_wkb(np.asarray(zoom_wkb, dtype=object))
+            for z, zoom_wkb in simplified.items()
+        },
+        props=props,
+        layer_name=layer_name,
+    )
+
+
+def _tile_size(z: int) -> float:
+    return 2 * WORLD_HALF / (1 << z)
+
+
+def _simplify_for_zooms(geoms: np.ndarray, zooms: Iterable[int]) -> dict[int, list[bytes]]:
+    """Simplify all geometries to about one tile unit at each zoom, as WKB per zoom."""
+    return {
+        z: list(
+            shapely.to_wkb(shapely.simplify(geoms, _tile_size(z) / EXTENT, preserve_topology=True))
+        )
+        for z in zooms
+    }
+
+
+def _iter_polygons(geom: Any) -> Iterable[Any]:
+    if geom.geom_type == "Polygon":
+        yield geom
+    elif geom.geom_type in ("MultiPolygon", "GeometryCollection"):
+        for part in geom.geoms:
+            yield from _iter_polygons(part)
+
+
+def render_tile(z: int, x: int, y: int) -> bytes | None:
+    """Clip, project and encode one tile; returns gzipped MVT, or None if empty."""
+    size = _tile_size(z)
+    minx = -WORLD_HALF + x * size
+    maxy = WORLD_HALF - y * size
+    pad = size * BUFFER / EXTENT
+    clip_box = (minx - pad, maxy - size - pad, minx + size + pad, maxy + pad)
+
+    hits = _WORKER["tree"].query(shapely.box(*clip_box))
+    if not len(hits):
+        return None
+    hits = np.sort(hits)
+    clipped = shapely.clip_by_rect(_WORKER["simplified"][z][hits], *clip_box)
+
+    scale = EXTENT / size
+    features: list[tuple[int, dict[str, Any], list[int]]] = []
+    for idx, geom in zip(hits, clipped, strict=True):
+        if geom is None or geom.is_empty:
+            continue
+        polygons: list[list[np.ndarray]] = []
+        for polygon in _iter_polygons(geom):
+            rings = [polygon.exterior, *polygon.interiors]
+            tile_rings = []
+            for ring in rings:
+                coords = shapely.get_coordinates(ring)
+                px = np.round((coords[:, 0] - minx) * scale)
+                py = np.round((maxy - coords[:, 1]) * scale)
+                tile_rings.append(np.column_stack([px, py]).astype(np.int64))
+            polygons.append(tile_rings)
+        geometry = encode_polygons(polygons)
+        if geometry:
+            features.append((int(idx) + 1, _WORKER["props"][idx], geometry))
+
+    if not features:
+        return None
+    tile = encode_mvt_layer(_WORKER["layer_name"], features)
+    return gzip.compress(tile, mtime=0)
+
+
+def _render_batch(z: int, xys: list[tuple[int, int]]) -> list[tuple[int, bytes]]:
+    rendered: list[tuple[int, bytes]] = []
+    for x, y in xys:
+        data = render_tile(z, x, y)
+        if data is not None:
+            rendered.append((zxy_to_tileid(z, x, y), data))
+    return rendered
+
+
+# ---------- PMTiles v3 archive ----------
+
+
+def zxy_to_tileid(z: int, x: int, y: int) -> int:
+    """Return the PMTiles tile id (Hilbert order within each zoom level)."""
+    base = ((1 << (2 * z)) - 1) // 3
+    return base + int(hilbert_index(np.array([x]), np.array([y]), order=z)[0])
+
+
+def _serialize_directory(entries: list[TileEntry]) -> bytes:
+    out = bytearray(_varint(len(entries)))
+    last_id = 0
+    for e in entries:
+        out += _varint(e.tile_id - last_id)
+        last_id = e.tile_id
+    for e in entries:
+        out += _varint(e.run_length)
+    for e in entries:
+        out += _varint(e.length)
+    for i, e in enumerate(entries):
+        prev = entries[i - 1] if i > 0 else None
+        if prev is not None and e.offset == prev.offset + prev.length:
+            out += _varint(0)
+        else:
+            out += _varint(e.offset + 1)
+    return gzip.compress(bytes(out), mtime=0)
+
+
+def _read_varint(buf: bytes, pos: int) -> tuple[int, int]:
+    result = shift = 0
+    while True:
+        b = buf[pos]
+        pos += 1
+        result |= (b & 0x7F) << shift
+        if not b & 0x80:
+            return result, pos
+        shift += 7
+
+
+def _deserialize_directory(data: bytes) -> list[TileEntry]:
+    buf = gzip.decompress(data)
+    count, pos = _read_varint(buf, 0)
+    ids, runs, lengths = [0] * count, [0] * count, [0] * count
+    last_id = 0
+    for i in range(count):
+        delta, pos = _read_varint(buf, pos)
+        last_id += delta
+        ids[i] = last_id
+    for i in range(count):
+        runs[i], pos = _read_varint(buf, pos)
+    for i in range(count):
+        lengths[i], pos = _read_varint(buf, pos)
+    entries: list[TileEntry] = []
+    for i in range(count):
+        raw, pos = _read_varint(buf, pos)
+        prev = entries[i - 1] if i > 0 else None
+        offset = prev.offset + prev.length if prev is not None and raw == 0 else raw - 1
+        entries.append(TileEntry(ids[i], offset, lengths[i], runs[i]))
+    return entries
+
+
+def _build_directories(entries: list[TileEntry]) -> tuple[bytes, bytes]:
+    """Return (root, leaves), splitting into leaf directories if the root is too large."""
+    root = _serialize_directory(entries)
+    if len(root) <= PMTILES_ROOT_MAX:
+        return root, b""
+
+    leaf_size = 4096
+    while True:
+        root_entries: list[TileEntry] = []
+        leaves = bytearray()
+        for i in range(0, len(entries), leaf_size):
+            leaf = _serialize_directory(entries[i : i + leaf_size])
+            root_entries.append(TileEntry(entries[i].tile_id, len(leaves), len(leaf), 0))
+            leaves += leaf
+        root = _serialize_directory(root_entries)
+        if len(root) <= PMTILES_ROOT_MAX:
+            return root, bytes(leaves)
+        leaf_size *= 2
+
+
+def write_pmtiles(
+    path: Path,
+    tiles: dict[int, bytes],
+    metadata: dict[str, Any],
+    min_zoom: int,
+    max_zoom: int,
+    bounds: tuple[float, float, float, float],
+) -> Path:
+    """Write gzipped MVT tiles, keyed by tile id, to a clustered PMTiles v3 archive.
+
+    Identical tiles are stored once; consecutive identical tiles share a run.
+    """
+    entries: list[TileEntry] = []
+    tile_data = bytearray()
+    seen: dict[bytes, tuple[int, int]] = {}
+
+    for tile_id in sorted(tiles):
+        data = tiles[tile_id]
+        digest = hashlib.sha256(data).digest()
+        if digest in seen:
+            offset, length = seen[digest]
+            last = entries[-1] if entries else None
+            if last and last.offset == offset and last.tile_id + last.run_length == tile_id:
+                entries[-1] = last._replace(run_length=last.run_length + 1)
+                continue
+        else:
+            offset, length = len(tile_data), len(data)
+            seen[digest] = (offset, length)
+            tile_data += data
+        entries.append(TileEntry(tile_id, offset, length, 1))
+
+    root, leaves = _build_directories(entries)
+    meta = gzip.compress(json.dumps(metadata).encode("utf-8"), mtime=0)
+
+    root_offset = PMTILES_HEADER_SIZE
+    meta_offset = root_offset + len(root)
+    leaves_offset = meta_offset + len(meta)
+    data_offset = leaves_offset + len(leaves)
+
+    minx, miny, maxx, maxy = bounds
+    header = struct.pack(
+        _HEADER_FORMAT,
+        b"PMTiles",
+        3,
+        root_offset,
+        len(root),
+        meta_offset,
+        len(meta),
+        leaves_offset,
+        len(leaves),
+        data_offset,
+        len(tile_data),
+        sum(e.run_length for e in entries),
+        len(entries),
+        len(seen),
+        1,  # clustered
+        PMTILES_COMPRESSION_GZIP,
+        PMTILES_COMPRESSION_GZIP,
+        PMTILES_TILE_TYPE_MVT,
+        min_zoom,
+        max_zoom,
+        round(minx * 1e7),
+        round(miny * 1e7),
+        round(maxx * 1e7),
+        round(maxy * 1e7),
+        min_zoom,
+        round((minx + maxx) / 2 * 1e7),
+        round((miny + maxy) / 2 * 1e7),
+    )
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("wb") as f:
+        f.write(header)
+        f.write(root)
+        f.write(meta)
+        f.write(leaves)
+        f.write(tile_data)
+    return path
+
+
+def read_tile(path: Path, z: int, x: int, y: int) -> bytes | None:
+    """Read one (still gzipped) tile from a PMTiles archive, or None if absent."""
+    tile_id = zxy_to_tileid(z, x, y)
+    with path.open("rb") as f:
+        header = struct.unpack(_HEADER_FORMAT, f.read(PMTILES_HEADER_SIZE))
+        if header[0] != b"PMTiles" or header[1] != 3:
+            raise ValueError(f"Not a PMTiles v3 archive: {path}")
+        root_offset, root_length = header[2], header[3]
+        leaves_offset, data_offset = header[6], header[8]
+
+        dir_offset, dir_length = root_offset, root_length
+        for _ in range(4):  # the spec allows at most three levels of leaves
+            f.seek(dir_offset)
+            entries = _deserialize_directory(f.read(dir_length))
+            match = None
+            for e in entries:
+                if e.tile_id > tile_id:
+                    break
+                match = e
+            if match is None:
+                return None
+            if match.run_length == 0:
+                dir_offset, dir_length = leaves_offset + match.offset, match.length
+                continue
+            if tile_id >= match.tile_id + match.run_length:
+                return None
+            f.seek(data_offset + match.offset)
+            return f.read(match.length)
+    return None
+
+
+# ---------- Pyramid build ----------
+
+
+def _tiles_for_zoom(bounds: np.ndarray, z: int) -> list[tuple[int, int]]:
+    """List the tiles touched by any geometry's bounding box at zoom z."""
+    n = 1 << z
+    size = _tile_size(z)
+    x0 = np.clip(np.floor((bounds[:, 0] + WORLD_HALF) / size), 0, n - 1).astype(int)
+    x1 = np.clip(np.floor((bounds[:, 2] + WORLD_HALF) / size), 0, n - 1).astype(int)
+    y0 = np.clip(np.floor((WORLD_HALF - bounds[:, 3]) / size), 0, n - 1).astype(int)
+    y1 = np.clip(np.floor((WORLD_HALF - bounds[:, 1]) / size), 0, n - 1).astype(int)
+
+    tiles: set[tuple[int, int]] = set()
+    for a, b, c, d in zip(x0, x1, y0, y1, strict=True):
+        tiles.update((x, y) for x in range(a, b + 1) for y in range(c, d + 1))
+    return sorted(tiles)
+
+
+def build_tiles(
+    source: Path,
+    out_path: Path,
+    layer_name: str = "cd118",
+    min_zoom: int = 0,
+    max_zoom: int = 8,
+    workers: int | None = None,
+) -> Path:
+    """Build a PMTiles vector tile pyramid from a GeoJSON layer.
+
+    Args:
+        source (Path): Input GeoJSON (typically the nationwide export).
+        out_path (Path): Output .pmtiles path.
+        layer_name (str): MVT layer name.
+        min_zoom (int): Lowest zoom level to build.
+        max_zoom (int): Highest zoom level to build.
+        workers (int | None): Worker processes; 1 renders in-process.
+
+    Returns:
+        Path: The archive written.
+    """
+    gdf = gpd.read_file(source)
+    lonlat_bounds = tuple(float(v) for v in gdf.to_crs(epsg=4326).total_bounds)
+    mercator = gdf.to_crs(epsg=3857)
+
+    props: list[dict[str, Any]] = mercator.drop(columns="geometry").to_dict("records")
+    geoms = mercator.geometry.to_numpy()
+    wkb: list[bytes] = list(shapely.to_wkb(geoms))
+    bounds = shapely.bounds(geoms)
+    # Each zoom is simplified once here rather than in every worker process
+    simplified = _simplify_for_zooms(geoms, range(min_zoom, max_zoom + 1))
+
+    batches: list[tuple[int, list[tuple[int, int]]]] = []
+    for z in range(min_zoom, max_zoom + 1):
+        xys = _tiles_for_zoom(bounds, z)
+        batches += [(z, xys[i : i + TILE_BATCH_SIZE]) for i in range(0, len(xys), TILE_BATCH_SIZE)]
+    logger.info(f"[TILES] Rendering {sum(len(b[1]) for b in batches)} candidate tiles")
+
+    tiles: dict[int, bytes] = {}
+    workers = workers or os.cpu_count() or 1
+    initargs = (wkb, simplified, props, layer_name)
+    if workers == 1:
+        _init_worker(*initargs)
+        for z, xys in batches:
+            tiles.update(_render_batch(z, xys))
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=initargs
+        ) as pool:
+            futures = [pool.submit(_render_batch, z, xys) for z, xys in batches]
+            for future in futures:
+                tiles.update(future.result())
+
+    fields = {k: "Number" if isinstance(v, int | float) else "String" for k, v in props[0].items()}
+    metadata = {
+        "name": layer_name,
+        "format": "pbf",
+        "vector_layers": [
+            {"id": layer_name, "fields": fields, "minzoom": min_zoom, "maxzoom": max_zoom}
+        ],
+    }
+    write_pmtiles(out_path, tiles, metadata, min_zoom, max_zoom, lonlat_bounds)  # type: ignore[arg-type]
+    logger.info(f"[TILES] Wrote {len(tiles)} tiles to {out_path}")
+    return out_path
+
+
+def main(
+    vintage: str = DEFAULT_VINTAGE,
+    min_zoom: int | None = None,
+    max_zoom: int | None = None,
+    workers: int | None = None,
+) -> int:
+    """Build a vintage's PMTiles archive next to its nationwide GeoJSON.
+
+    Args:
+        vintage (str): Vintage whose nationwide layer is tiled, e.g. cd119.
+        min_zoom (int | None): Lowest zoom; defaults to the layer's ``tiles_min_zoom``.
+        max_zoom (int | None): Highest zoom; defaults to the layer's ``tiles_max_zoom``.
+        workers (int | None): Worker processes (default: CPU count).
+
+    Returns:
+        int: 0 if successful, 1 on error.
+    """
+    try:
+        selected = get_vintage(vintage)
+        cfg = selected.national
+        if not cfg:
+            logger.error(f"Vintage {selected.name} has no nationwide layer to build tiles from.")
+            return 1
+        source = selected.national_path
+        if not source.exists():
+            logger.error(f"Nationwide GeoJSON not found: {source}. Run export first.")
+            return 1
+
+        with instrument.run("tiles") as span:
+            out_path = build_tiles(
+                source,
+                selected.national_out_dir
+                / cfg.get("tiles_filename", f"{selected.name}_us.pmtiles"),
+                layer_name=cfg.get("tiles_layer", selected.name),
+                min_zoom=cfg.get("tiles_min_zoom", 0) if min_zoom is None else min_zoom,
+                max_zoom=cfg.get("tiles_max_zoom", 8) if max_zoom is None else max_zoom,
+                workers=workers,
+            )
+            span.add(bytes_read=source.stat().st_size, bytes_written=out_path.stat().st_size)
+        return 0
+    except Exception as e:
+        logger.error(f"Tile build failed: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,49 +2,211 @@
 
 This module provides utilities for loading and merging YAML configuration files
 for geographic data layers, including global defaults and layer-specific overrides.
+
+All data-config/*.yaml files are parsed and validated once by a ConfigRegistry,
+which re-reads them only when a file's mtime or size changes (or on reload()).
 """
 
+import copy
 from pathlib import Path
 from typing import Any
 
 from civic_lib_core import log_utils
 import yaml
 
+from civic_data_boundaries_us_cd118.utils.get_paths import get_config_dir
+
 logger = log_utils.logger
 
+__all__ = [
+    "GLOBAL_DEFAULT_KEYS",
+    "LAYER_SCHEMA",
+    "ConfigError",
+    "ConfigRegistry",
+    "get_config_registry",
+    "load_layer_config",
+    "reload_config",
+]
 
-def load_layer_config(layer_name: str) -> dict[str, Any]:
-    """Load configuration for a given layer, merged with global defaults."""
-    yaml_dir = Path(__file__).parent.parent.parent.parent / "data-config"
-    logger.debug(f"Looking for YAML configs in {yaml_dir}")
+# Top-level keys that act as defaults for every layer in the same file
+GLOBAL_DEFAULT_KEYS = (
+    "simplify_tolerance",
+    "chunk_max_features",
+    "drop_columns",
+    "chunk_mode",
+    "chunk_target_bytes",
+)
+
+_NUMBER = (int, float)
+
+# Expected types of known layer keys; unknown keys are passed through unchecked
+LAYER_SCHEMA: dict[str, tuple[type, ...]] = {
+    "name": (str,),
+    "description": (str,),
+    "vintage": (str,),
+    "district_column": (str,),
+    "key_column": (str,),
+    "state_column": (str,),
+    "out_subdir": (str,),
+    "enabled": (bool,),
+    "year": (int,),
+    "source": (str,),
+    "license": (str,),
+    "geometry_type": (str,),
+    "nationwide": (bool,),
+    "url": (str,),
+    "base_url": (str,),
+    "fips_start": (str, int),
+    "fips_end": (str, int),
+    "filename_pattern": (str,),
+    "filename": (str,),
+    "ocd_pattern": (str,),
+    "output_dir": (str,),
+    "split_by": (str, bool),
+    "extract": (bool,),
+    "simplify_tolerance": _NUMBER,
+    "chunk_max_features": (int,),
+    "chunk_mode": (str,),
+    "chunk_target_bytes": (int,),
+    "drop_columns": (list,),
+    "repair_geometry": (bool,),
+    "coordinate_precision": (str, int),
+    "write_compact": (bool,),
+    "write_adjacency": (bool,),
+    "adjacency_tolerance": _NUMBER,
+    "write_geopackage": (bool,),
+    "write_outlines": (bool,),
+    "state_overrides": (dict,),
+    "tiles_filename": (str,),
+    "tiles_layer": (str,),
+    "tiles_min_zoom": (int,),
+    "tiles_max_zoom": (int,),
+}
+
+
+class ConfigError(ValueError):
+    """Raised when a data-config YAML file is malformed or fails validation."""
+
+
+def _check_type(value: Any, expected: tuple[type, ...], where: str) -> None:
+    if value is None:
+        return
+    # bool is a subclass of int; only accept it where bool is expected
+    is_stray_bool = isinstance(value, bool) and bool not in expected
+    if is_stray_bool or not isinstance(value, expected):
+        names = " or ".join(t.__name__ for t in expected)
+        raise ConfigError(f"{where} must be {names}, got {type(value).__name__}: {value!r}")
+
+
+def _validate_file(config: Any, yaml_file: Path) -> None:
+    if not isinstance(config, dict):
+        raise ConfigError(f"{yaml_file.name}: top level must be a mapping")
+
+    for key in GLOBAL_DEFAULT_KEYS:
+        if key in config:
+            _check_type(config[key], LAYER_SCHEMA[key], f"{yaml_file.name}: {key}")
+
+    layers = config.get("layers", [])
+    if not isinstance(layers, list):
+        raise ConfigError(f"{yaml_file.name}: 'layers' must be a list")
+
+    for i, layer in enumerate(layers):
+        if not isinstance(layer, dict) or not layer.get("name"):
+            raise ConfigError(f"{yaml_file.name}: layer #{i + 1} must be a mapping with a 'name'")
+        for key, value in layer.items():
+            if key in LAYER_SCHEMA:
+                where = f"{yaml_file.name}: layer '{layer['name']}' {key}"
+                _check_type(value, LAYER_SCHEMA[key], where)
+
+
+class ConfigRegistry:
+    """Parsed and validated layer configs from a data-config directory.
+
+    Layers are merged with their file's global defaults once per load. The
+    cache is keyed by each YAML file's name, mtime and size, so edits are
+    picked up automatically; ``reload()`` forces a re-parse.
+    """
 
-    yaml_files = list(yaml_dir.glob("*.yaml"))
-    if not yaml_files:
-        logger.warning(f"No YAML config files found in {yaml_dir}")
-        return {}
-    logger.debug(f"Found YAML config files: {[f.name for f in yaml_files]}")
+    def __init__(self, config_dir: Path | None = None):
+        """Create a registry for ``config_dir`` (defaults to ``get_paths.get_config_dir()``)."""
+        self.config_dir = config_dir or get_config_dir()
+        self._stamp: tuple[tuple[str, int, int], ...] | None = None
+        self._layers: dict[str, dict[str, Any]] = {}
 
-    for yaml_file in yaml_files:
-        with yaml_file.open(encoding="utf-8") as f:
+    def _current_stamp(self) -> tuple[tuple[str, int, int], ...]:
+        stamp: list[tuple[str, int, int]] = []
+        for yaml_file in sorted(self.config_dir.glob("*.yaml")):
+            st = yaml_file.stat()
+            stamp.append((yaml_file.name, st.st_mtime_ns, st.st_size))
+        return tuple(stamp)
+
+    def _load(self, stamp: tuple[tuple[str, int, int], ...]) -> None:
+        logger.debug(f"Looking for YAML configs in {self.config_dir}")
+        if not stamp:
+            logger.warning(f"No YAML config files found in {self.config_dir}")
+        else:
+            logger.debug(f"Found YAML config files: {[name for name, _, _ in stamp]}")
+
+        layers: dict[str, dict[str, Any]] = {}
+        for name, _, _ in stamp:
+            yaml_file = self.config_dir / name
             logger.debug(f"Loading config from {yaml_file.name}")
-            # Load the YAML file
-            config: dict[str, Any] = yaml.safe_load(f) or {}
+            with yaml_file.open(encoding="utf-8") as f:
+                try:
+                    config: Any = yaml.safe_load(f) or {}
+                except yaml.YAMLError as e:
+                    raise ConfigError(f"{yaml_file.name}: invalid YAML: {e}") from e
+
+            _validate_file(config, yaml_file)
 
-            # Check all layers in this file
             for layer in config.get("layers", []):
-                if layer.get("name") == layer_name:
-                    # Merge global defaults with layer-specific
-                    return {
-                        "simplify_tolerance": layer.get(
-                            "simplify_tolerance", config.get("simplify_tolerance")
-                        ),
-                        "chunk_max_features": layer.get(
-                            "chunk_max_features", config.get("chunk_max_features")
-                        ),
-                        "drop_columns": layer.get("drop_columns", config.get("drop_columns")),
-                        # Include all other layer-specific fields too:
-                        **layer,
-                    }
-
-    # If not found, return empty dict
-    return {}
+                if layer["name"] in layers:
+                    raise ConfigError(f"Duplicate layer '{layer['name']}' in {yaml_file.name}")
+                # Merge global defaults with layer-specific fields
+                defaults = {key: config.get(key) for key in GLOBAL_DEFAULT_KEYS}
+                layers[layer["name"]] = {**defaults, **layer}
+
+        self._layers = layers
+        self._stamp = stamp
+
+    def layers(self) -> dict[str, dict[str, Any]]:
+        """Return all merged layer configs keyed by name, re-parsing if files changed."""
+        stamp = self._current_stamp()
+        if stamp != self._stamp:
+            self._load(stamp)
+        return self._layers
+
+    def get(self, layer_name: str) -> dict[str, Any]:
+        """Return a copy of one layer's merged config, or {} if not defined."""
+        layer = self.layers().get(layer_name)
+        return copy.deepcopy(layer) if layer is not None else {}
+
+    def reload(self) -> None:
+        """Discard the cache and re-parse every YAML file now."""
+        self._load(self._current_stamp())
+
+
+_registry: ConfigRegistry | None = None
+
+
+def get_config_registry() -> ConfigRegistry:
+    """Return the process-wide ConfigRegistry, creating it on first use.
+
+    A new registry is created if the config directory has moved since (e.g.
+    CIVIC_CONFIG_DIR was set after the first lookup).
+    """
+    global _registry
+    config_dir = get_config_dir()
+    if _registry is None or _registry.config_dir != config_dir:
+        _registry = ConfigRegistry(config_dir)
+    return _registry
+
+
+def reload_config() -> None:
+    """Force the process-wide registry to re-parse data-config/ now."""
+    get_config_registry().reload()
+
+
+def load_layer_config(layer_name: str) -> dict[str, Any]:
+    """Load configuration for a given layer, merged with global defaults."""
+    return get_config_registry().get(layer_name)
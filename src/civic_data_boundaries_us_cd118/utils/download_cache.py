@@ -0,0 +1,199 @@
+"""Content-addressed download cache shared by checkouts on one host.
+
+File: utils/download_cache.py
+
+Enabled by pointing ``CIVIC_CACHE_DIR`` at a directory. Layout:
+    <cache>/blobs/sha256/<aa>/<sha256>   file contents, read-only, named by hash
+    <cache>/urls/<sha256 of url>.json    {"url", "sha256", "size", "fetched_at"}
+    <cache>/locks/<sha256 of url>.lock   held while one process downloads a URL
+
+``fetch`` returns the blob for a URL, downloading it only if no process on the
+host has done so before; concurrent callers wait on the URL's lock instead of
+downloading twice. ``link_into`` places a blob at its destination as a reflink
+(copy-on-write clone), a hardlink, or as a last resort a copy.
+"""
+
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+import hashlib
+import json
+import os
+from pathlib import Path
+import shutil
+import tempfile
+from typing import IO, Any
+
+from civic_lib_core import date_utils, log_utils
+
+from civic_data_boundaries_us_cd118.utils.get_paths import get_cache_dir
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = log_utils.logger
+
+__all__ = [
+    "DownloadCache",
+    "get_download_cache",
+    "link_into",
+]
+
+# Linux FICLONE ioctl: clone a whole file on btrfs, XFS (reflink=1), bcachefs
+_FICLONE = 0x40049409
+
+# Writes the response body to a file object and returns the number of bytes written
+Downloader = Callable[[str, IO[bytes]], int]
+
+
+def _url_key(url: str) -> str:
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+def _write_json_atomic(path: Path, data: dict[str, Any]) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    tmp.replace(path)
+
+
+class _HashingWriter:
+    """File wrapper that hashes everything written through it."""
+
+    def __init__(self, f: IO[bytes]):
+        self._f = f
+        self.digest = hashlib.sha256()
+
+    def write(self, data: bytes) -> int:
+        self.digest.update(data)
+        return self._f.write(data)
+
+
+class DownloadCache:
+    """A content-addressed cache of downloaded files under one root directory."""
+
+    def __init__(self, root: Path):
+        """Use (and create on demand) the cache under ``root``."""
+        self.root = root
+
+    def blob_path(self, sha256: str) -> Path:
+        """Return where the blob with the given hash is stored."""
+        return self.root / "blobs" / "sha256" / sha256[:2] / sha256
+
+    def _record_path(self, url: str) -> Path:
+        return self.root / "urls" / f"{_url_key(url)}.json"
+
+    def lookup(self, url: str) -> Path | None:
+        """Return the cached blob for a URL, or None if it is not (intact) in the cache."""
+        record_path = self._record_path(url)
+        if not record_path.exists():
+            return None
+        try:
+            with record_path.open(encoding="utf-8") as f:
+                record = json.load(f)
+            blob = self.blob_path(record["sha256"])
+            if record.get("url") == url and blob.stat().st_size == record["size"]:
+                return blob
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return None
+
+    @contextmanager
+    def _locked(self, url: str) -> Iterator[None]:
+        """Hold an exclusive per-URL lock across processes (no-op without fcntl)."""
+        lock_path = self.root / "locks" / f"{_url_key(url)}.lock"
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with lock_path.open("a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def fetch(self, url: str, download: Downloader) -> tuple[Path, bool]:
+        """Return the blob for ``url``, downloading it with ``download`` if needed.
+
+        Returns:
+            tuple: The blob path, and True if this call downloaded it.
+        """
+        blob = self.lookup(url)
+        if blob is not None:
+            return blob, False
+
+        with self._locked(url):
+            # Another process may have finished the download while we waited
+            blob = self.lookup(url)
+            if blob is not None:
+                return blob, False
+
+            tmp_dir = self.root / "tmp"
+            tmp_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=tmp_dir, prefix="download-")
+            tmp = Path(tmp_name)
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    writer = _HashingWriter(f)
+                    size = download(url, writer)  # type: ignore[arg-type]
+                sha256 = writer.digest.hexdigest()
+                blob = self.blob_path(sha256)
+                blob.parent.mkdir(parents=True, exist_ok=True)
+                tmp.chmod(0o444)  # hardlinked copies must not be edited in place
+                tmp.replace(blob)
+            finally:
+                tmp.unlink(missing_ok=True)
+
+            record_path = self._record_path(url)
+            record_path.parent.mkdir(parents=True, exist_ok=True)
+            _write_json_atomic(
+                record_path,
+                {
+                    "url": url,
+                    "sha256": sha256,
+                    "size": size,
+                    "fetched_at": date_utils.now_utc_str(),
+                },
+            )
+            logger.info(f"Cached {url} as sha256:{sha256[:12]} ({size} bytes)")
+            return blob, True
+
+
+def _reflink(src: Path, dest: Path) -> bool:
+    if fcntl is None or not hasattr(fcntl, "ioctl"):
+        return False
+    try:
+        with src.open("rb") as s, dest.open("wb") as d:
+            fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+        return True
+    except OSError:
+        dest.unlink(missing_ok=True)
+        return False
+
+
+def link_into(blob: Path, dest: Path) -> str:
+    """Place a cached blob at ``dest`` without duplicating data where possible.
+
+    Tries a reflink first (independent copy-on-write file), then a hardlink
+    (same read-only inode), then a plain copy (e.g. across filesystems).
+
+    Returns:
+        str: The method used: "reflink", "hardlink" or "copy".
+    """
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    dest.unlink(missing_ok=True)
+    if _reflink(blob, dest):
+        return "reflink"
+    try:
+        os.link(blob, dest)
+        return "hardlink"
+    except OSError:
+        shutil.copyfile(blob, dest)
+        return "copy"
+
+
+def get_download_cache() -> DownloadCache | None:
+    """Return the cache configured by ``CIVIC_CACHE_DIR`` (or --cache-dir), or None if unset."""
+    root = get_cache_dir()
+    return DownloadCache(root) if root is not None else None
@@ -0,0 +1,77 @@
+"""Content fingerprints for build inputs and outputs.
+
+Hashes used to decide whether a pipeline step needs to run again:
+source files, effective layer configs, and the package version.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any
+
+__all__ = [
+    "SHAPEFILE_EXTENSIONS",
+    "config_hash",
+    "file_sha256",
+    "package_version",
+    "shapefile_fingerprint",
+    "shapefile_stat",
+]
+
+# Components of a shapefile set that affect what export reads
+SHAPEFILE_EXTENSIONS = (".shp", ".shx", ".dbf", ".prj", ".cpg")
+
+_READ_SIZE = 1 << 20
+
+
+def file_sha256(path: Path) -> str:
+    """Return the hex sha256 of a file, streamed in 1 MiB blocks."""
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        while block := f.read(_READ_SIZE):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def shapefile_fingerprint(shp_path: Path) -> str:
+    """Return a sha256 over every component file of a shapefile set.
+
+    Component names are included so a missing .prj or .cpg changes the result.
+    """
+    digest = hashlib.sha256()
+    for ext in SHAPEFILE_EXTENSIONS:
+        component = shp_path.with_suffix(ext)
+        if component.exists():
+            digest.update(f"{ext}:{file_sha256(component)}\n".encode())
+    return digest.hexdigest()
+
+
+def shapefile_stat(shp_path: Path) -> list[list[int]]:
+    """Return [size, mtime_ns] of each shapefile component ([] if missing).
+
+    Cheap to compute; a fingerprint recorded with an unchanged stat can be reused.
+    """
+    stats: list[list[int]] = []
+    for ext in SHAPEFILE_EXTENSIONS:
+        component = shp_path.with_suffix(ext)
+        if component.exists():
+            st = component.stat()
+            stats.append([st.st_size, st.st_mtime_ns])
+        else:
+            stats.append([])
+    return stats
+
+
+def config_hash(config: dict[str, Any]) -> str:
+    """Return a stable sha256 of a (JSON-serializable) config mapping."""
+    payload = json.dumps(config, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def package_version() -> str:
+    """Return the installed package version, or "unknown" if it cannot be determined."""
+    try:
+        from civic_data_boundaries_us_cd118._version import __version__
+    except ImportError:
+        return "unknown"
+    return __version__
@@ -2,29 +2,89 @@
 
 Utilities for resolving paths to various data directories
 in the civic_data_boundaries_us_cd118 package.
+
+Each root can be set on its own with an environment variable (or the matching
+global CLI option, which sets the variable):
+
+    CIVIC_ROOT_DIR      --root        project root holding data-in/, data-out/, data-config/
+    CIVIC_DATA_IN_DIR   --data-in     raw downloads and extracted shapefiles
+    CIVIC_DATA_OUT_DIR  --data-out    exported GeoJSON, chunks, index and reports
+    CIVIC_CACHE_DIR     --cache-dir   shared download cache (off when unset)
+    CIVIC_CONFIG_DIR    --config-dir  layer YAML configs
+
+Without CIVIC_ROOT_DIR the root is the source checkout when running from one,
+and the current working directory otherwise (e.g. installed in site-packages).
 """
 
+import os
 from pathlib import Path
 
 __all__ = [
-    "get_repo_root",
+    "CACHE_DIR_ENV",
+    "CONFIG_DIR_ENV",
+    "DATA_IN_DIR_ENV",
+    "DATA_OUT_DIR_ENV",
+    "ROOT_DIR_ENV",
+    "get_cache_dir",
+    "get_cd118_in_dir",
+    "get_cd118_out_dir",
+    "get_config_dir",
     "get_data_in_dir",
     "get_data_out_dir",
-    "get_tiger_in_dir",
-    "get_states_out_dir",
     "get_national_out_dir",
-    "get_cd118_in_dir",
-    "get_cd118_out_dir",
+    "get_repo_root",
+    "get_states_out_dir",
+    "get_tiger_in_dir",
 ]
 
+ROOT_DIR_ENV = "CIVIC_ROOT_DIR"
+DATA_IN_DIR_ENV = "CIVIC_DATA_IN_DIR"
+DATA_OUT_DIR_ENV = "CIVIC_DATA_OUT_DIR"
+CACHE_DIR_ENV = "CIVIC_CACHE_DIR"
+CONFIG_DIR_ENV = "CIVIC_CONFIG_DIR"
+
+
+def _env_path(name: str) -> Path | None:
+    value = os.environ.get(name)
+    return Path(value).expanduser().resolve() if value else None
+
+
+def _source_checkout(levels_up: int = 3) -> Path | None:
+    """Return the repository this module runs from, or None if installed elsewhere.
+
+    Assumes this file is under src/civic_data_boundaries_us_cd118/utils/.
+    """
+    root = Path(__file__).resolve().parents[levels_up]
+    return root if (root / "pyproject.toml").is_file() and (root / "src").is_dir() else None
+
 
 def get_repo_root(levels_up: int = 3) -> Path:
-    """Return the root directory of this repo by walking up a fixed number of parent folders.
+    """Return the project root that data-in/ and data-out/ live under by default.
 
-    Defaults to 3 levels up, assuming this file is under:
-        src/civic_data_boundaries_us/utils/
+    Uses CIVIC_ROOT_DIR if set, else the source checkout (found by walking up
+    ``levels_up`` parent folders), else the current working directory.
     """
-    return Path(__file__).resolve().parents[levels_up]
+    return _env_path(ROOT_DIR_ENV) or _source_checkout(levels_up) or Path.cwd()
+
+
+def get_config_dir() -> Path:
+    """Return the directory holding the layer YAML configs.
+
+    Uses CIVIC_CONFIG_DIR if set. Otherwise configs travel with the code: the
+    source checkout's data-config/, falling back to data-config/ under the root.
+    """
+    env = _env_path(CONFIG_DIR_ENV)
+    if env is not None:
+        return env
+    checkout = _source_checkout()
+    if checkout is not None and (checkout / "data-config").is_dir():
+        return checkout / "data-config"
+    return get_repo_root() / "data-config"
+
+
+def get_cache_dir() -> Path | None:
+    """Return the shared download cache directory, or None if caching is off."""
+    return _env_path(CACHE_DIR_ENV)
 
 
 # ---------- DATA-IN ----------
@@ -32,7 +92,7 @@ def get_repo_root(levels_up: int = 3) -> Path:
 
 def get_data_in_dir() -> Path:
     """Return the root data-in directory for raw input data (downloads, archives)."""
-    return get_repo_root() / "data-in"
+    return _env_path(DATA_IN_DIR_ENV) or get_repo_root() / "data-in"
 
 
 def get_tiger_in_dir() -> Path:
@@ -50,7 +110,7 @@ def get_cd118_in_dir() -> Path:
 
 def get_data_out_dir() -> Path:
     """Return the root data-out directory for processed GeoJSON and chunked outputs."""
-    return get_repo_root() / "data-out"
+    return _env_path(DATA_OUT_DIR_ENV) or get_repo_root() / "data-out"
 
 
 def get_states_out_dir() -> Path:
@@ -0,0 +1,359 @@
+"""Structured timing, memory and throughput instrumentation for pipeline runs.
+
+File: utils/instrument.py
+
+A command wraps its work in ``run(name)``; stages and per-state work inside it
+open nested ``span(...)`` blocks. Each span records wall time, the CPU time
+of its own thread, process-wide CPU time and peak RSS, bytes read and written,
+and features processed. Counts roll up into the enclosing span, except the
+features of spans that re-read districts already counted elsewhere (the
+nationwide file, chunks and index). Per-state spans run concurrently on
+worker threads, so only ``cpu_s`` is theirs alone; the ``process_*`` fields
+include every thread. When the outermost run finishes, a JSON report and a
+Chrome trace (load in chrome://tracing or https://ui.perfetto.dev) are
+written to data-out/, next to manifest.json.
+
+Spans opened outside a run are measured but not recorded, so library callers
+pay almost nothing.
+"""
+
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+import json
+import os
+from pathlib import Path
+import sys
+import threading
+import time
+from typing import Any, TypedDict
+
+from civic_lib_core import date_utils, log_utils
+
+from civic_data_boundaries_us_cd118.utils.get_paths import get_data_out_dir
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = log_utils.logger
+
+__all__ = [
+    "RUN_REPORT_FILENAME",
+    "RUN_TRACE_FILENAME",
+    "Recorder",
+    "Span",
+    "SpanRecord",
+    "add",
+    "bind",
+    "current_recorder",
+    "peak_rss_bytes",
+    "run",
+    "span",
+]
+
+RUN_REPORT_FILENAME = "run_report.json"
+RUN_TRACE_FILENAME = "run_trace.json"
+
+
+class SpanRecord(TypedDict):
+    """One finished span, as stored in the run report."""
+
+    id: int
+    parent: int | None
+    name: str
+    category: str  # "command", "stage", "state" or "folder"
+    thread: int
+    status: str  # "ok" or "error"
+    start_s: float  # offset from the start of the run
+    wall_s: float
+    cpu_s: float  # CPU time of the thread the span ran on
+    process_cpu_s: float  # CPU time of all threads while the span was open
+    process_peak_rss_bytes: int | None  # process high-water mark when the span ended
+    process_rss_growth_bytes: int | None  # how much the high-water mark rose during the span
+    bytes_read: int
+    bytes_written: int
+    features: int
+    features_per_s: float | None
+    args: dict[str, Any]
+
+
+def peak_rss_bytes() -> int | None:
+    """Return the peak resident set size of this process, or None if unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return int(peak if sys.platform == "darwin" else peak * 1024)
+
+
+class Span:
+    """An open span; use ``add()`` to attribute work to it."""
+
+    __slots__ = (
+        "args",
+        "bytes_read",
+        "bytes_written",
+        "category",
+        "features",
+        "id",
+        "name",
+        "parent",
+    )
+
+    def __init__(
+        self, span_id: int, name: str, category: str, args: dict[str, Any], parent: "Span | None"
+    ):
+        """Create a span; normally done by ``Recorder.span``."""
+        self.id = span_id
+        self.name = name
+        self.category = category
+        self.args = args
+        self.parent = parent
+        self.features = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+
+    def add(self, features: int = 0, bytes_read: int = 0, bytes_written: int = 0) -> None:
+        """Add processed features and I/O byte counts to this span."""
+        self.features += features
+        self.bytes_read += bytes_read
+        self.bytes_written += bytes_written
+
+
+class Recorder:
+    """Collects the spans of one run and writes them as a report and trace."""
+
+    def __init__(self, name: str):
+        """Start a run named after the command being executed."""
+        self.name = name
+        self.started_at = date_utils.now_utc_str()
+        self.spans: list[SpanRecord] = []
+        self._t0 = time.perf_counter()
+        self._cpu0 = time.process_time()
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stack(self) -> list[Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def current(self) -> Span | None:
+        """Return the innermost open span on this thread."""
+        stack = self._stack()
+        return stack[-1] if stack else None
+
+    def add(self, features: int = 0, bytes_read: int = 0, bytes_written: int = 0) -> None:
+        """Attribute work to the innermost open span on this thread.
+
+        Worker threads share their submitter's span (see ``bind``), so the
+        update is locked.
+        """
+        current = self.current()
+        if current is not None:
+            with self._lock:
+                current.add(features, bytes_read, bytes_written)
+
+    @contextmanager
+    def span(
+        self, name: str, category: str = "stage", rollup_features: bool = True, **args: Any
+    ) -> Iterator[Span]:
+        """Record a span around the enclosed block.
+
+        With ``rollup_features`` False, the span's features are reported but not
+        added to its parent, for work on features already counted elsewhere.
+        """
+        stack = self._stack()
+        with self._lock:
+            span_id = self._next_id
+            self._next_id += 1
+        parent = stack[-1] if stack else None
+        current = Span(span_id, name, category, args, parent)
+        stack.append(current)
+
+        rss0 = peak_rss_bytes()
+        cpu0 = time.thread_time()
+        process_cpu0 = time.process_time()
+        t0 = time.perf_counter()
+        status = "ok"
+        try:
+            yield current
+        except BaseException:
+            status = "error"
+            raise
+        finally:
+            wall = time.perf_counter() - t0
+            cpu = time.thread_time() - cpu0
+            process_cpu = time.process_time() - process_cpu0
+            rss = peak_rss_bytes()
+            stack.pop()
+            if parent is not None:
+                # The parent may be shared with spans on other threads (see bind)
+                features = current.features if rollup_features else 0
+                with self._lock:
+                    parent.add(features, current.bytes_read, current.bytes_written)
+
+            record: SpanRecord = {
+                "id": span_id,
+                "parent": parent.id if parent is not None else None,
+                "name": name,
+                "category": category,
+                "thread": threading.get_ident(),
+                "status": status,
+                "start_s": round(t0 - self._t0, 6),
+                "wall_s": round(wall, 6),
+                "cpu_s": round(cpu, 6),
+                "process_cpu_s": round(process_cpu, 6),
+                "process_peak_rss_bytes": rss,
+                "process_rss_growth_bytes": (
+                    rss - rss0 if rss is not None and rss0 is not None else None
+                ),
+                "bytes_read": current.bytes_read,
+                "bytes_written": current.bytes_written,
+                "features": current.features,
+                "features_per_s": round(current.features / wall, 3)
+                if current.features and wall > 0
+                else None,
+                "args": args,
+            }
+            with self._lock:
+                self.spans.append(record)
+
+    def report(self) -> dict[str, Any]:
+        """Return the run report: run totals plus every span in start order."""
+        spans = sorted(self.spans, key=lambda s: s["id"])
+        root = next((s for s in spans if s["parent"] is None), None)
+        return {
+            "run": self.name,
+            "started_at": self.started_at,
+            "status": root["status"] if root else "ok",
+            "wall_s": round(time.perf_counter() - self._t0, 6),
+            "process_cpu_s": round(time.process_time() - self._cpu0, 6),
+            "process_peak_rss_bytes": peak_rss_bytes(),
+            "spans": spans,
+        }
+
+    def chrome_trace(self) -> dict[str, Any]:
+        """Return the spans in Chrome Trace Event format ("X" complete events)."""
+        pid = os.getpid()
+        events: list[dict[str, Any]] = []
+        for s in sorted(self.spans, key=lambda s: s["id"]):
+            metrics = {k: v for k, v in s.items() if k not in ("name", "category", "args")}
+            events.append(
+                {
+                    "name": s["name"],
+                    "cat": s["category"],
+                    "ph": "X",
+                    "ts": round(s["start_s"] * 1e6, 3),
+                    "dur": round(s["wall_s"] * 1e6, 3),
+                    "pid": pid,
+                    "tid": s["thread"],
+                    "args": {**s["args"], **metrics},
+                }
+            )
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"run": self.name, "started_at": self.started_at},
+        }
+
+    def write(self, out_dir: Path) -> tuple[Path, Path]:
+        """Write the run report and Chrome trace into ``out_dir``.
+
+        Returns:
+            tuple: Paths of the report and the trace.
+        """
+        out_dir.mkdir(parents=True, exist_ok=True)
+        report_path = out_dir / RUN_REPORT_FILENAME
+        trace_path = out_dir / RUN_TRACE_FILENAME
+        with report_path.open("w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2)
+        with trace_path.open("w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f)
+        return report_path, trace_path
+
+
+_active: Recorder | None = None
+
+
+def current_recorder() -> Recorder | None:
+    """Return the recorder of the run in progress, if any."""
+    return _active
+
+
+@contextmanager
+def span(
+    name: str, category: str = "stage", rollup_features: bool = True, **args: Any
+) -> Iterator[Span]:
+    """Record a span in the current run; outside a run the span is discarded.
+
+    See ``Recorder.span`` for ``rollup_features``.
+    """
+    recorder = _active
+    if recorder is None:
+        yield Span(-1, name, category, args, None)
+        return
+    with recorder.span(name, category, rollup_features, **args) as current:
+        yield current
+
+
+def bind[T](fn: Callable[..., T]) -> Callable[..., T]:
+    """Wrap ``fn`` so spans it opens on a worker thread nest under the caller's span.
+
+    Call in the submitting thread, e.g. ``pool.submit(instrument.bind(fn), ...)``.
+    """
+    recorder = _active
+    parent = recorder.current() if recorder is not None else None
+    if recorder is None or parent is None:
+        return fn
+
+    def bound(*args: Any, **kwargs: Any) -> T:
+        stack = recorder._stack()
+        stack.append(parent)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            stack.pop()
+
+    return bound
+
+
+def add(features: int = 0, bytes_read: int = 0, bytes_written: int = 0) -> None:
+    """Attribute work to the innermost open span of the current run (no-op outside one)."""
+    recorder = _active
+    if recorder is not None:
+        recorder.add(features, bytes_read, bytes_written)
+
+
+@contextmanager
+def run(name: str, out_dir: Path | None = None) -> Iterator[Span]:
+    """Instrument a command and write its report when it finishes.
+
+    Nested inside another run (e.g. fetch within build), this is just a span
+    of the outer run and writes nothing itself.
+
+    Args:
+        name (str): Command name, used as the root span name.
+        out_dir (Path | None): Where to write the report; defaults to data-out/.
+    """
+    global _active
+    if _active is not None:
+        with _active.span(name, category="command") as current:
+            yield current
+        return
+
+    recorder = Recorder(name)
+    _active = recorder
+    try:
+        with recorder.span(name, category="command") as current:
+            yield current
+    finally:
+        _active = None
+        try:
+            report_path, _ = recorder.write(out_dir or get_data_out_dir())
+            logger.info(f"Run report written to {report_path}")
+        except OSError as e:
+            logger.warning(f"Could not write run report: {e}")
@@ -0,0 +1,160 @@
+"""Vectorized geometry validation and repair for exported district layers.
+
+File: validation.py
+
+Runs on whole geometry arrays with shapely 2 operations (no per-feature
+Python loops) and checks for:
+- null and empty geometries
+- consecutive duplicate vertices
+- invalid polygons (self-intersections, bad rings)
+
+``repair_geometries`` fixes what it finds in bulk and returns counts that the
+export stage records per state in the manifest. It also rewinds rings to
+RFC 7946 order (exteriors counterclockwise, holes clockwise). Shapefiles store
+exteriors clockwise by spec, so that is a format conversion and is not counted.
+"""
+
+from typing import TypedDict
+
+from civic_lib_core import log_utils
+import geopandas as gpd  # type: ignore
+import numpy as np
+import shapely
+
+logger = log_utils.logger
+
+__all__ = [
+    "GEOMETRY_REPORT_KEYS",
+    "GeometryReport",
+    "duplicate_vertex_counts",
+    "misoriented_mask",
+    "repair_geometries",
+    "validate_layer",
+]
+
+
+class GeometryReport(TypedDict):
+    """Geometry check and repair counts for one layer."""
+
+    features: int
+    null: int
+    empty: int
+    invalid: int  # invalid after duplicate vertices were removed
+    repaired: int  # invalid geometries that make_valid fixed
+    unrepaired: int  # still invalid or empty after repair
+    duplicate_vertices: int  # geometries with consecutive repeated vertices
+    removed_vertices: int
+
+
+GEOMETRY_REPORT_KEYS = tuple(GeometryReport.__annotations__)
+
+
+def _polygon_rings(geoms: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return every polygon ring, the geometry it belongs to, and whether it is an exterior."""
+    parts, part_geom = shapely.get_parts(geoms, return_index=True)
+    rings, ring_part = shapely.get_rings(parts, return_index=True)
+    # get_rings lists each polygon's exterior first, then its holes
+    is_exterior = np.ones(len(rings), dtype=bool)
+    is_exterior[1:] = ring_part[1:] != ring_part[:-1]
+    return rings, part_geom[ring_part], is_exterior
+
+
+def duplicate_vertex_counts(geoms: np.ndarray) -> np.ndarray:
+    """Count consecutive repeated vertices within each geometry's rings."""
+    rings, ring_geom, _ = _polygon_rings(geoms)
+    coords, coord_ring = shapely.get_coordinates(rings, return_index=True)
+    repeated = np.zeros(len(coords), dtype=bool)
+    repeated[1:] = (coord_ring[1:] == coord_ring[:-1]) & np.all(coords[1:] == coords[:-1], axis=1)
+    return np.bincount(ring_geom[coord_ring[repeated]], minlength=len(geoms))
+
+
+def misoriented_mask(geoms: np.ndarray) -> np.ndarray:
+    """Return True for geometries with a clockwise exterior or a counterclockwise hole."""
+    rings, ring_geom, is_exterior = _polygon_rings(geoms)
+    wrong = shapely.is_ccw(rings) != is_exterior
+    return np.bincount(ring_geom[wrong], minlength=len(geoms)) > 0
+
+
+def repair_geometries(geoms: np.ndarray, repair: bool = True) -> tuple[np.ndarray, GeometryReport]:
+    """Check an array of (multi)polygons and, optionally, repair it in bulk.
+
+    Repairs are applied only to the geometries that need them, in order:
+    remove duplicate vertices, ``make_valid`` (keeping polygonal output), then
+    reorient rings to RFC 7946 (not counted in the report). Null geometries are
+    left in place.
+
+    Args:
+        geoms (np.ndarray): Object array of shapely geometries (may contain None).
+        repair (bool): If False, only count problems and return the input unchanged.
+
+    Returns:
+        tuple: The (possibly repaired) geometry array and a GeometryReport.
+    """
+    geoms = np.array(geoms, dtype=object)
+    null = shapely.is_missing(geoms)
+    empty = shapely.is_empty(geoms) & ~null
+    present = ~null & ~empty
+
+    dups = duplicate_vertex_counts(geoms)
+    has_dups = dups > 0
+    if repair and has_dups.any():
+        geoms[has_dups] = shapely.remove_repeated_points(geoms[has_dups], tolerance=0.0)
+
+    invalid = present & ~shapely.is_valid(geoms)
+    repaired = 0
+    unrepaired = int(invalid.sum())
+    if repair and invalid.any():
+        fixed = shapely.make_valid(geoms[invalid], method="structure", keep_collapsed=False)
+        ok = shapely.is_valid(fixed) & ~shapely.is_empty(fixed)
+        geoms[invalid] = fixed
+        repaired = int(ok.sum())
+        unrepaired = int((~ok).sum())
+
+    if repair:
+        misoriented = present & misoriented_mask(geoms)
+        if misoriented.any():
+            geoms[misoriented] = shapely.orient_polygons(geoms[misoriented], exterior_cw=False)
+
+    report: GeometryReport = {
+        "features": len(geoms),
+        "null": int(null.sum()),
+        "empty": int(empty.sum()),
+        "invalid": int(invalid.sum()),
+        "repaired": repaired,
+        "unrepaired": unrepaired,
+        "duplicate_vertices": int(has_dups.sum()),
+        "removed_vertices": int(dups.sum()),
+    }
+    return geoms, report
+
+
+def validate_layer(
+    gdf: gpd.GeoDataFrame, label: str, repair: bool = True
+) -> tuple[gpd.GeoDataFrame, GeometryReport]:
+    """Validate (and by default repair) the geometry column of a GeoDataFrame.
+
+    Args:
+        gdf (gpd.GeoDataFrame): Layer to check; not modified.
+        label (str): Name used in log messages, e.g. the state.
+        repair (bool): Repair problems in bulk instead of only counting them.
+
+    Returns:
+        tuple: A GeoDataFrame with repaired geometries and the GeometryReport.
+    """
+    geoms, report = repair_geometries(gdf.geometry.to_numpy(), repair=repair)
+
+    if report["invalid"] or report["duplicate_vertices"]:
+        logger.info(
+            f"[GEOMETRY] {label}: {report['invalid']} invalid "
+            f"({report['repaired']} repaired), "
+            f"{report['duplicate_vertices']} with duplicate vertices"
+            + ("" if repair else " (repair disabled)")
+        )
+    if report["unrepaired"]:
+        logger.warning(f"[GEOMETRY] {label}: {report['unrepaired']} geometries remain invalid")
+
+    if repair:
+        # Rings are rewound even when nothing else needed repair
+        gdf = gdf.copy()
+        gdf[gdf.geometry.name] = gpd.GeoSeries(geoms, index=gdf.index, crs=gdf.crs)
+    return gdf, report
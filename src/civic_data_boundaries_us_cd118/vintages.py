@@ -0,0 +1,177 @@
+"""Congress vintages (cd118, cd119, ...) defined by the data-config layers.
+
+File: vintages.py
+
+A vintage pairs a per-state layer (``split_by: fips``) with an optional
+nationwide layer carrying the same ``vintage`` key. The state layer supplies
+the column mapping and the output namespace:
+
+    district_column  district number column (default ``<VINTAGE>FP``, e.g. CD119FP)
+    key_column       unique district id, used for adjacency (default GEOID)
+    state_column     state FIPS column (default STATEFP)
+    out_subdir       folder under data-out/ (default the vintage name; "" is data-out/)
+
+Layers with ``enabled: false`` are skipped unless their vintage is asked for
+by name. Fetch, export, build and index all iterate ``load_vintages()``.
+"""
+
+from collections.abc import Iterator
+import copy
+from pathlib import Path
+import re
+from typing import Any, NamedTuple
+
+from civic_lib_core import log_utils
+
+from civic_data_boundaries_us_cd118.utils.config_utils import ConfigError, get_config_registry
+from civic_data_boundaries_us_cd118.utils.get_paths import get_data_in_dir, get_data_out_dir
+
+logger = log_utils.logger
+
+__all__ = [
+    "DEFAULT_VINTAGE",
+    "Vintage",
+    "get_vintage",
+    "load_vintages",
+    "vintage_for_path",
+]
+
+DEFAULT_VINTAGE = "cd118"
+
+
+class Vintage(NamedTuple):
+    """One Congress vintage: its state layer, nationwide layer and output namespace."""
+
+    name: str
+    layer: dict[str, Any]
+    national: dict[str, Any]
+
+    @property
+    def district_column(self) -> str:
+        """Column holding the district number (e.g. CD118FP)."""
+        return self.layer.get("district_column") or f"{self.name.upper()}FP"
+
+    @property
+    def key_column(self) -> str:
+        """Column holding the unique district id (e.g. GEOID20)."""
+        return self.layer.get("key_column") or "GEOID"
+
+    @property
+    def state_column(self) -> str:
+        """Column holding the state FIPS code (e.g. STATEFP20)."""
+        return self.layer.get("state_column") or "STATEFP"
+
+    @property
+    def out_subdir(self) -> str:
+        """Folder under data-out/ holding this vintage ("" for data-out/ itself)."""
+        subdir = self.layer.get("out_subdir")
+        return self.name if subdir is None else subdir
+
+    @property
+    def in_dir(self) -> Path:
+        """Folder under data-in/ the state shapefiles are fetched into."""
+        return get_data_in_dir() / self.layer.get("output_dir", "tiger")
+
+    @property
+    def out_dir(self) -> Path:
+        """Root of this vintage's outputs."""
+        return get_data_out_dir() / self.out_subdir
+
+    @property
+    def states_out_dir(self) -> Path:
+        """Folder holding one subfolder per state."""
+        return self.out_dir / "states"
+
+    @property
+    def national_out_dir(self) -> Path:
+        """Folder holding the nationwide file, its sidecars and manifest.yaml."""
+        return self.out_dir / self.national.get("output_dir", "national")
+
+    @property
+    def national_path(self) -> Path:
+        """Path of the nationwide GeoJSON."""
+        return self.national_out_dir / self.national.get("filename", f"{self.name}_us.geojson")
+
+    def state_out_path(self, state_name: str) -> Path:
+        """Return the per-state GeoJSON path for a state directory name."""
+        return self.states_out_dir / state_name / f"{self.name}_{state_name}.geojson"
+
+    def iter_shapefiles(self) -> Iterator[tuple[Path, str]]:
+        """Yield (shapefile, state FIPS) for this vintage's extracted shapefiles.
+
+        Files are matched against ``filename_pattern``, so several vintages can
+        share one data-in folder.
+        """
+        pattern = self.layer.get("filename_pattern") or f"tl_2022_{{fips}}_{self.name}.zip"
+        stem = Path(pattern).stem
+        if "{fips}" not in stem:
+            raise ConfigError(f"Vintage {self.name}: filename_pattern needs a {{fips}} field")
+        regex = re.compile(re.escape(stem).replace(re.escape("{fips}"), r"(\d{2})") + r"\.shp")
+        for shp_file in sorted(self.in_dir.glob(f"**/{stem.replace('{fips}', '*')}.shp")):
+            match = regex.fullmatch(shp_file.name)
+            if match:
+                yield shp_file, match.group(1)
+
+
+def _group_layers(layers: dict[str, dict[str, Any]]) -> dict[str, Vintage]:
+    state_layers: dict[str, dict[str, Any]] = {}
+    national_layers: dict[str, dict[str, Any]] = {}
+    for layer in layers.values():
+        name = layer.get("vintage")
+        if not name:
+            continue
+        kind = "nationwide" if layer.get("nationwide") else "state"
+        target = national_layers if kind == "nationwide" else state_layers
+        if name in target:
+            raise ConfigError(f"Vintage {name} has more than one {kind} layer")
+        target[name] = layer
+
+    orphans = sorted(national_layers.keys() - state_layers.keys())
+    if orphans:
+        raise ConfigError(f"Vintage(s) {orphans} have a nationwide layer but no state layer")
+    return {
+        name: Vintage(name, copy.deepcopy(layer), copy.deepcopy(national_layers.get(name, {})))
+        for name, layer in sorted(state_layers.items())
+    }
+
+
+def load_vintages(names: list[str] | None = None, include_disabled: bool = False) -> list[Vintage]:
+    """Return the configured vintages, in name order.
+
+    Args:
+        names (list[str] | None): Vintages to return; None means every
+            vintage whose state layer is not ``enabled: false``.
+        include_disabled (bool): With no names, also return disabled vintages.
+
+    Raises:
+        ConfigError: If a requested vintage is not configured.
+    """
+    vintages = _group_layers(get_config_registry().layers())
+    if names is None:
+        return [
+            v for v in vintages.values() if include_disabled or v.layer.get("enabled") is not False
+        ]
+    unknown = sorted(set(names) - set(vintages))
+    if unknown:
+        raise ConfigError(f"Unknown vintage(s) {unknown}; configured: {sorted(vintages)}")
+    return [vintages[name] for name in sorted(set(names))]
+
+
+def get_vintage(name: str = DEFAULT_VINTAGE) -> Vintage:
+    """Return one configured vintage by name."""
+    return load_vintages([name])[0]
+
+
+def vintage_for_path(rel_path: str, vintages: list[Vintage]) -> str | None:
+    """Return the vintage whose namespace holds a path relative to data-out/.
+
+    The longest matching ``out_subdir`` wins, so a vintage kept at the root
+    of data-out/ only claims paths no other vintage does.
+    """
+    parts = Path(rel_path).parts
+    best: tuple[int, str] | None = None
+    for v in vintages:
+        prefix = Path(v.out_subdir).parts
+        if tuple(parts[: len(prefix)]) == prefix and (best is None or len(prefix) > best[0]):
+            best = (len(prefix), v.name)
+    return best[1] if best else None
@@ -0,0 +1,51 @@
+import geopandas as gpd
+import pytest
+from shapely.geometry import box
+
+from civic_data_boundaries_us_cd118.adjacency import (
+    compute_adjacency,
+    load_adjacency,
+    write_adjacency,
+)
+
+
+def _layer(gap: float = 0.0) -> gpd.GeoDataFrame:
+    return gpd.GeoDataFrame(
+        {"GEOID20": ["2701", "2702", "2703", "2704"]},
+        geometry=[
+            box(-94.0, 45.0, -93.0, 46.0),
+            box(-93.0 + gap, 45.0, -92.0, 46.0),
+            box(-92.0, 45.0, -91.0, 45.5),
+            # Touches 2703 only at its corner
+            box(-91.0, 45.5, -90.0, 46.0),
+        ],
+        crs="EPSG:4269",
+    )
+
+
+def test_compute_adjacency_uses_shared_boundary():
+    graph = compute_adjacency(_layer())
+
+    assert set(graph.neighbors("2702")) == {"2701", "2703"}
+    assert graph.neighbors("2704") == {}
+    # One degree of latitude is about 111 km; half a degree is shared with 2703
+    assert graph.neighbors("2701")["2702"] == pytest.approx(111_000, rel=0.01)
+    assert graph.neighbors("2702")["2703"] == pytest.approx(55_500, rel=0.01)
+    assert list(graph.indptr) == [0, 1, 3, 4, 4]
+
+
+def test_compute_adjacency_tolerance_bridges_gaps():
+    assert compute_adjacency(_layer(gap=0.001)).neighbors("2701") == {}
+    assert set(compute_adjacency(_layer(gap=0.001), tolerance=0.005).neighbors("2701")) == {"2702"}
+
+
+def test_write_and_load_adjacency(tmp_path):
+    graph = compute_adjacency(_layer())
+    json_path, npz_path = write_adjacency(graph, tmp_path / "cd118_us.geojson", "GEOID20", 0.0)
+
+    assert json_path.name == "cd118_us.adjacency.json"
+    doc = json_path.read_text()
+    assert '"edges":[[0,1,' in doc
+    loaded = load_adjacency(npz_path)
+    assert loaded.ids == graph.ids
+    assert loaded.neighbors("2702") == graph.neighbors("2702")
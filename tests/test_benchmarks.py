@@ -0,0 +1,48 @@
+from pathlib import Path
+
+from benchmarks import __main__ as bench_cli
+from benchmarks.suite import BenchResult, compare
+from benchmarks.synthetic import synthetic_districts, write_synthetic_shapefile
+
+
+def test_synthetic_districts_share_boundaries():
+    gdf = synthetic_districts(districts=4, vertices=200)
+    assert gdf.geometry.is_valid.all()
+    first, second = gdf.geometry.iloc[0], gdf.geometry.iloc[1]
+    assert len(first.exterior.coords) == 201
+    shared = first.intersection(second)
+    assert shared.area == 0
+    assert shared.length > 0.5  # a full (wobbly) cell edge
+
+
+def test_write_synthetic_shapefile_layout(tmp_path: Path):
+    shp = write_synthetic_shapefile(tmp_path, "41", districts=3, vertices=40)
+    assert shp == tmp_path / "41" / "tl_2022_41_cd118" / "tl_2022_41_cd118.shp"
+    assert shp.exists()
+
+
+def test_compare_flags_regressions():
+    results = [
+        BenchResult("a", 3, 1.0, 1.0),
+        BenchResult("b", 3, 2.0, 2.0),
+        BenchResult("c", 3, 1, 1),
+    ]
+    baselines = {"k": {"median_s": {"a": 1.0, "b": 1.0}}}
+    by_name = {c.name: c for c in compare(results, baselines, "k", tolerance=0.5)}
+    assert not by_name["a"].regressed
+    assert by_name["b"].regressed and by_name["b"].ratio == 2.0
+    assert by_name["c"].baseline_s is None and not by_name["c"].regressed
+
+
+def test_suite_runs_and_compares(tmp_path: Path, capsys):
+    baselines = tmp_path / "baselines.json"
+    args = ["--districts", "4", "--vertices", "40", "--index-entries", "5", "--repeat", "1"]
+    args += ["--only", "load_cd118_layer", "--only", "remote_load_index"]
+    args += ["--baselines", str(baselines)]
+
+    assert bench_cli.main([*args, "--update-baseline"]) == 0
+    assert baselines.exists()
+    assert bench_cli.main([*args, "--tolerance", "1000"]) == 0
+    out = capsys.readouterr().out
+    assert "remote_load_index" in out
+    assert "simplify" not in out
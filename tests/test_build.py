@@ -0,0 +1,93 @@
+import json
+from pathlib import Path
+import shutil
+
+import geopandas as gpd
+from shapely.geometry import box
+import yaml
+
+from civic_data_boundaries_us_cd118 import build
+from civic_data_boundaries_us_cd118.build import run_build
+from civic_data_boundaries_us_cd118.utils import get_paths
+from civic_data_boundaries_us_cd118.utils.fingerprint import file_sha256
+
+
+def _write_state(root: Path, fips: str, n: int) -> Path:
+    stem = f"tl_2022_{fips}_cd118"
+    shp = root / "data-in" / "tiger" / fips / stem / f"{stem}.shp"
+    shp.parent.mkdir(parents=True, exist_ok=True)
+    gdf = gpd.GeoDataFrame(
+        {"STATEFP20": [fips] * n, "CD118FP": [f"{i + 1:02d}" for i in range(n)]},
+        geometry=[box(i, 0, i + 1, 1) for i in range(n)],
+        crs="EPSG:4269",
+    )
+    gdf.to_file(shp, driver="ESRI Shapefile")
+    return shp
+
+
+def test_build_only_reruns_changed_states(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(get_paths, "get_repo_root", lambda levels_up=3: tmp_path)
+    _write_state(tmp_path, "27", 2)
+    _write_state(tmp_path, "41", 3)
+
+    first = run_build()["cd118"]
+    assert first["rebuilt"] == ["27", "41"]
+    assert (tmp_path / "data-out" / "national" / "cd118_us.geojson").exists()
+    assert (tmp_path / "data-out" / "index.json").exists()
+    assert (tmp_path / "data-out" / "national" / "cd118_us.compact.json").exists()
+    index = json.loads((tmp_path / "data-out" / "index.json").read_text())
+    national_entry = next(e for e in index if e["path"].endswith("cd118_us.geojson"))
+    assert national_entry["compact"].endswith("cd118_us.compact.json")
+    assert national_entry["adjacency"]["csr"].endswith("cd118_us.adjacency.npz")
+    national_path = tmp_path / "data-out" / national_entry["path"]
+    assert national_entry["size"] == national_path.stat().st_size
+    assert national_entry["sha256"] == file_sha256(national_path)
+
+    second = run_build()["cd118"]
+    assert second == {"rebuilt": [], "reused": ["27", "41"], "removed": [], "national": False}
+
+    _write_state(tmp_path, "41", 4)
+    third = run_build()["cd118"]
+    assert third["rebuilt"] == ["41"]
+    assert third["national"] is True
+    national = gpd.read_file(tmp_path / "data-out" / "national" / "cd118_us.geojson")
+    assert len(national) == 6
+
+
+def test_build_removes_states_no_longer_in_the_input(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(get_paths, "get_repo_root", lambda levels_up=3: tmp_path)
+    _write_state(tmp_path, "27", 2)
+    oregon_shp = _write_state(tmp_path, "41", 3)
+    run_build()
+    out = tmp_path / "data-out"
+    assert (out / "states" / "oregon" / "cd118_oregon_chunks").is_dir()
+
+    shutil.rmtree(oregon_shp.parent)
+    summary = run_build()["cd118"]
+
+    assert summary == {"rebuilt": [], "reused": ["27"], "removed": ["41"], "national": True}
+    assert not (out / "states" / "oregon").exists()
+    assert len(gpd.read_file(out / "national" / "cd118_us.geojson")) == 2
+    manifest = yaml.safe_load((out / "national" / "manifest.yaml").read_text())
+    assert [s["state_fips"] for s in manifest["states"]] == ["27"]
+    index = json.loads((out / "index.json").read_text())
+    assert not [e for e in index if "oregon" in e["path"]]
+
+
+def test_build_writes_run_report(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(get_paths, "get_repo_root", lambda levels_up=3: tmp_path)
+    _write_state(tmp_path, "27", 2)
+
+    assert build.main(skip_fetch=True) == 0
+
+    report = json.loads((tmp_path / "data-out" / "run_report.json").read_text())
+    spans = {s["name"]: s for s in report["spans"] if s["category"] != "folder"}
+    assert {"build", "export", "minnesota", "nationwide", "chunk", "index"} <= set(spans)
+    assert spans["minnesota"]["category"] == "state"
+    assert spans["minnesota"]["features"] == 2
+    assert spans["build"]["features"] == 2  # not counted again by nationwide, chunk or index
+    assert spans["minnesota"]["bytes_read"] > 0
+    assert spans["export"]["bytes_written"] == (
+        spans["minnesota"]["bytes_written"] + spans["nationwide"]["bytes_written"]
+    )
+    assert (tmp_path / "data-out" / "run_trace.json").exists()
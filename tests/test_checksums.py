@@ -0,0 +1,72 @@
+"""Tests for output checksums and verification."""
+
+import hashlib
+import json
+from pathlib import Path
+
+from civic_data_boundaries_us_cd118.checksums import (
+    checksum_outputs,
+    load_manifest_checksums,
+    verify_outputs,
+)
+from civic_data_boundaries_us_cd118.index import write_manifest
+
+
+def _write_outputs(out_dir: Path) -> None:
+    (out_dir / "states" / "minnesota").mkdir(parents=True)
+    (out_dir / "states" / "minnesota" / "cd118_minnesota.geojson").write_text('{"a": 1}')
+    (out_dir / "national").mkdir()
+    (out_dir / "national" / "cd118_us.geojson").write_bytes(b"x" * 3_000_000)
+    (out_dir / "national" / "cd118_us.geojson.part").write_text("partial")
+    (out_dir / "index.json").write_text("[]")
+
+
+def test_checksum_outputs_skips_metadata_and_partial_files(tmp_path):
+    _write_outputs(tmp_path)
+
+    checksums = checksum_outputs(tmp_path, workers=2)
+
+    national = str(Path("national") / "cd118_us.geojson")
+    assert sorted(checksums) == [national, str(Path("states/minnesota/cd118_minnesota.geojson"))]
+    assert checksums[national] == {
+        "size": 3_000_000,
+        "mtime_ns": (tmp_path / national).stat().st_mtime_ns,
+        "sha256": hashlib.sha256(b"x" * 3_000_000).hexdigest(),
+    }
+
+
+def test_checksum_outputs_reuses_hashes_of_unchanged_files(tmp_path):
+    _write_outputs(tmp_path)
+    write_manifest(tmp_path, {"name": "cd118"}, [], files=checksum_outputs(tmp_path))
+    known = load_manifest_checksums(tmp_path)
+    national = str(Path("national") / "cd118_us.geojson")
+    minnesota = str(Path("states/minnesota/cd118_minnesota.geojson"))
+    # A recorded hash is trusted while size and mtime are unchanged
+    known[national] = {**known[national], "sha256": "recorded"}
+    known[minnesota] = {**known[minnesota], "sha256": "recorded"}
+    (tmp_path / minnesota).write_text('{"b": 22}')
+
+    checksums = checksum_outputs(tmp_path, previous=known)
+
+    assert checksums[national]["sha256"] == "recorded"
+    assert checksums[minnesota]["sha256"] == hashlib.sha256(b'{"b": 22}').hexdigest()
+
+
+def test_verify_outputs_reports_changed_missing_and_unlisted(tmp_path):
+    _write_outputs(tmp_path)
+    write_manifest(tmp_path, {"name": "cd118"}, [], files=checksum_outputs(tmp_path))
+    manifest = json.loads((tmp_path / "manifest.json").read_text())
+    assert manifest["total_bytes"] == 3_000_008
+
+    result = verify_outputs(tmp_path)
+    assert len(result.ok) == 2
+    assert not result.mismatched and not result.missing and not result.unlisted
+
+    (tmp_path / "states" / "minnesota" / "cd118_minnesota.geojson").write_text('{"a": 2}')
+    (tmp_path / "national" / "cd118_us.geojson").unlink()
+    (tmp_path / "national" / "cd118_us.gpkg").write_text("new")
+
+    result = verify_outputs(tmp_path)
+    assert result.mismatched == [str(Path("states/minnesota/cd118_minnesota.geojson"))]
+    assert result.missing == [str(Path("national/cd118_us.geojson"))]
+    assert result.unlisted == [str(Path("national/cd118_us.gpkg"))]
@@ -0,0 +1,80 @@
+import json
+from pathlib import Path
+
+import numpy as np
+
+from civic_data_boundaries_us_cd118.chunking import (
+    chunk_spatial,
+    hilbert_index,
+    order_by_hilbert,
+    read_chunk_sidecar,
+)
+from civic_data_boundaries_us_cd118.export import chunk_folder
+from civic_data_boundaries_us_cd118.index import build_index_main
+from civic_data_boundaries_us_cd118.utils import get_paths
+
+
+def _square(x: float, y: float, size: float = 1.0) -> dict:
+    ring = [[x, y], [x + size, y], [x + size, y + size], [x, y + size], [x, y]]
+    return {
+        "type": "Feature",
+        "properties": {"name": f"{x},{y}"},
+        "geometry": {"type": "Polygon", "coordinates": [ring]},
+    }
+
+
+def _write_grid(path: Path, n: int) -> None:
+    features = [_square(float(x), float(y)) for x in range(n) for y in range(n)]
+    path.write_text(json.dumps({"type": "FeatureCollection", "features": features}))
+
+
+def test_hilbert_index_visits_every_cell_once():
+    xs, ys = zip(*[(x, y) for x in range(4) for y in range(4)], strict=True)
+    d = hilbert_index(np.array(xs), np.array(ys), order=2)
+    assert sorted(d.tolist()) == list(range(16))
+
+
+def test_order_by_hilbert_keeps_neighbours_adjacent():
+    bboxes = [(float(x), 0.0, x + 1.0, 1.0) for x in (3, 0, 2, 1)]
+    order = order_by_hilbert(bboxes)
+    assert [bboxes[i][0] for i in order] in ([0.0, 1.0, 2.0, 3.0], [3.0, 2.0, 1.0, 0.0])
+
+
+def test_chunk_spatial_respects_target_bytes(tmp_path: Path):
+    src = tmp_path / "grid.geojson"
+    _write_grid(src, 8)
+
+    for mode in ("hilbert", "quadtree"):
+        records = chunk_spatial(src, mode=mode, target_bytes=2_000, max_features=500)
+
+        assert sum(r["features"] for r in records) == 64
+        assert all(r["bytes"] <= 2_000 for r in records)
+        assert read_chunk_sidecar(src) == records
+
+        for record in records:
+            chunk = json.loads((tmp_path / "grid_chunks" / record["path"]).read_text())
+            assert len(chunk["features"]) == record["features"]
+            minx, miny, maxx, maxy = record["bbox"]
+            # Spatially tight: a chunk never spans the whole 8x8 grid
+            assert (maxx - minx) * (maxy - miny) < 64
+
+
+def test_features_mode_writes_chunks_the_index_skips(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(get_paths, "get_repo_root", lambda levels_up=3: tmp_path)
+    state_dir = tmp_path / "data-out" / "states" / "minnesota"
+    state_dir.mkdir(parents=True)
+    src = state_dir / "cd118_minnesota.geojson"
+    _write_grid(src, 3)
+    (state_dir / "cd118_minnesota_chunked.geojson").mkdir()  # left by older runs
+
+    for _ in range(2):
+        chunk_folder(state_dir, {"chunk_mode": "features", "chunk_max_features": 4})
+
+    chunks = sorted((state_dir / "cd118_minnesota_chunks").iterdir())
+    assert [len(json.loads(p.read_text())["features"]) for p in chunks] == [4, 4, 1]
+    assert not (state_dir / "cd118_minnesota_chunked.geojson").exists()
+
+    assert build_index_main() == 0
+    index = json.loads((tmp_path / "data-out" / "index.json").read_text())
+    assert [entry["path"] for entry in index] == [str(src.relative_to(tmp_path / "data-out"))]
+    assert index[0]["features"] == 9
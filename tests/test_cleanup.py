@@ -0,0 +1,51 @@
+from pathlib import Path
+
+import pytest
+
+from civic_data_boundaries_us_cd118.cleanup import clean_data_in_dir, plan_cleanup
+
+
+def _data_in(root: Path) -> Path:
+    data_in = root / "data-in"
+    state_dir = data_in / "tiger" / "27"
+    extracted = state_dir / "tl_2022_27_cd118"
+    extracted.mkdir(parents=True)
+    (state_dir / "tl_2022_27_cd118.zip").write_bytes(b"z" * 100)
+    for ext in (".shp", ".shx", ".dbf", ".prj", ".cpg", ".shp.iso.xml"):
+        (extracted / f"tl_2022_27_cd118{ext}").write_bytes(b"s" * 10)
+    (data_in / "notes.txt").write_text("keep me")
+    return data_in
+
+
+def test_dry_run_reports_without_deleting(tmp_path):
+    data_in = _data_in(tmp_path)
+
+    plan = clean_data_in_dir(data_in, dry_run=True)
+
+    assert plan.counts() == {"zip": 1, "extracted": 6}
+    assert plan.total_bytes == 160
+    assert (data_in / "tiger" / "27" / "tl_2022_27_cd118.zip").exists()
+    assert (data_in / "tiger" / "27" / "tl_2022_27_cd118" / "tl_2022_27_cd118.shp").exists()
+
+
+def test_cleanup_deletes_everything_but_unrelated_files(tmp_path):
+    data_in = _data_in(tmp_path)
+
+    clean_data_in_dir(data_in, workers=2)
+
+    assert sorted(p.name for p in data_in.rglob("*")) == ["notes.txt"]
+
+
+def test_cleanup_keeps_zips(tmp_path):
+    data_in = _data_in(tmp_path)
+
+    plan = clean_data_in_dir(data_in, policy="zips")
+
+    assert plan.counts() == {"extracted": 6}
+    assert (data_in / "tiger" / "27" / "tl_2022_27_cd118.zip").exists()
+    assert not (data_in / "tiger" / "27" / "tl_2022_27_cd118").exists()
+
+
+def test_plan_rejects_unknown_policy(tmp_path):
+    with pytest.raises(ValueError, match="retention policy"):
+        plan_cleanup(tmp_path, policy="everything")
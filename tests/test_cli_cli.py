@@ -21,3 +21,56 @@ def test_fetch():
             )
 
     assert result.exit_code == 0
+
+
+def test_shard_failure_sets_exit_code(tmp_path):
+    # No plan.json in the work directory, so reduce fails
+    result = runner.invoke(app, ["shard", "reduce", "--work-dir", str(tmp_path)])
+    assert result.exit_code == 1
+
+
+def test_build_failure_sets_exit_code(monkeypatch):
+    from civic_data_boundaries_us_cd118 import build
+
+    monkeypatch.setattr(build, "run_build", lambda **kwargs: 1 / 0)
+    result = runner.invoke(app, ["build", "--skip-fetch"])
+    assert result.exit_code == 1
+
+
+def test_tiles_failure_sets_exit_code(tmp_path, monkeypatch):
+    from civic_data_boundaries_us_cd118.utils import get_paths
+
+    # No nationwide GeoJSON under tmp_path to build tiles from
+    monkeypatch.setattr(get_paths, "get_repo_root", lambda levels_up=3: tmp_path)
+    result = runner.invoke(app, ["tiles"])
+    assert result.exit_code == 1
+
+
+def test_serve_failure_sets_exit_code(tmp_path, monkeypatch):
+    # data-out/ does not exist, so there is nothing to serve
+    monkeypatch.setenv("CIVIC_DATA_OUT_DIR", str(tmp_path / "missing"))
+    result = runner.invoke(app, ["serve"])
+    assert result.exit_code == 1
+
+
+def test_diff_failure_sets_exit_code():
+    result = runner.invoke(app, ["diff", "cd118", "cd999"])
+    assert result.exit_code == 1
+
+
+def test_cleanup_rejects_unknown_retain_policy():
+    result = runner.invoke(app, ["cleanup", "--retain", "bogus", "--dry-run"])
+    assert result.exit_code == 1
+
+
+def test_export_failure_sets_exit_code():
+    result = runner.invoke(app, ["export", "--vintage", "cd999"])
+    assert result.exit_code == 1
+
+
+def test_index_failure_sets_exit_code(monkeypatch):
+    from civic_data_boundaries_us_cd118 import index
+
+    monkeypatch.setattr(index, "build_index_main", lambda: 1 / 0)
+    result = runner.invoke(app, ["index"])
+    assert result.exit_code == 1
@@ -0,0 +1,47 @@
+"""Import-time guard for the CLI.
+
+The CLI runs in cron jobs and health checks, so importing it (and running
+light commands like `cleanup --help`) must not pull in the geo stack.
+"""
+
+import subprocess
+import sys
+
+HEAVY_MODULES = {"geopandas", "pandas", "shapely", "pyogrio", "pyproj", "numpy", "osgeo", "fiona"}
+
+# Generous ceiling for the CLI module's cumulative import time
+IMPORT_BUDGET_SECONDS = 1.5
+
+
+def _run(code: str, *flags: str) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def test_cli_import_does_not_load_geo_stack():
+    code = (
+        "import sys\n"
+        "from typer.testing import CliRunner\n"
+        "from civic_data_boundaries_us_cd118.cli.cli import app\n"
+        "result = CliRunner().invoke(app, ['cleanup', '--help'])\n"
+        "assert result.exit_code == 0, result.output\n"
+        "print(','.join(sorted(m for m in sys.modules if m.split('.')[0] in %r)))\n"
+        % (HEAVY_MODULES,)
+    )
+    loaded = _run(code).stdout.strip()
+    assert loaded == "", f"CLI startup imported heavy modules: {loaded}"
+
+
+def test_cli_import_time_budget():
+    result = _run("import civic_data_boundaries_us_cd118.cli.cli", "-X", "importtime")
+    cumulative_us = next(
+        int(line.split("|")[1])
+        for line in result.stderr.splitlines()
+        if line.rstrip().endswith("civic_data_boundaries_us_cd118.cli.cli")
+    )
+    print(f"civic_data_boundaries_us_cd118.cli.cli import: {cumulative_us / 1e6:.3f}s")
+    assert cumulative_us / 1e6 < IMPORT_BUDGET_SECONDS
@@ -0,0 +1,103 @@
+import json
+from pathlib import Path
+
+import geopandas as gpd
+import numpy as np
+import pytest
+import shapely
+from shapely.geometry import MultiPolygon, Polygon, box
+
+from benchmarks.suite import serve_directory
+from civic_data_boundaries_us_cd118 import remote
+from civic_data_boundaries_us_cd118.compact import (
+    coordinate_precision,
+    encode_compact,
+    quantize_layer,
+    write_compact,
+)
+
+WITH_HOLE = Polygon(
+    [(-93.123456, 44.0), (-92.0, 44.0), (-92.0, 45.987654), (-93.123456, 45.987654)],
+    [[(-92.8, 44.2), (-92.8, 44.4), (-92.6, 44.4), (-92.6, 44.2)]],
+)
+ISLANDS = MultiPolygon([box(-90.5, 46.5, -90.25, 46.75), box(-90.0, 47.0, -89.5, 47.5)])
+
+
+def _layer() -> gpd.GeoDataFrame:
+    return gpd.GeoDataFrame(
+        {"CD118FP": ["01", "02", "03"], "ALAND20": [10, 20, 30]},
+        geometry=np.array([WITH_HOLE, ISLANDS, None], dtype=object),
+        crs="EPSG:4269",
+    )
+
+
+@pytest.mark.parametrize(
+    ("cfg", "expected"),
+    [
+        ({}, None),
+        ({"coordinate_precision": "auto", "simplify_tolerance": 0.01}, 3),
+        ({"coordinate_precision": "auto", "simplify_tolerance": 0.05}, 3),
+        ({"coordinate_precision": "auto", "simplify_tolerance": 0.0001}, 5),
+        ({"coordinate_precision": "auto", "simplify_tolerance": None}, None),
+        ({"coordinate_precision": 4, "simplify_tolerance": 0.01}, 4),
+        ({"coordinate_precision": 12}, 7),
+    ],
+)
+def test_coordinate_precision(cfg, expected):
+    assert coordinate_precision(cfg) == expected
+
+
+def test_coordinate_precision_rejects_bad_values():
+    with pytest.raises(ValueError, match="coordinate_precision"):
+        coordinate_precision({"coordinate_precision": "fine"})
+
+
+def test_quantize_layer_rounds_and_stays_valid():
+    out = quantize_layer(_layer(), 3)
+    coords = shapely.get_coordinates(out.geometry.to_numpy())
+    assert (abs(coords * 1000 - (coords * 1000).round()) < 1e-6).all()
+    assert out.geometry.iloc[:2].is_valid.all()
+    assert out.geometry.iloc[2] is None
+
+
+def test_quantize_layer_keeps_rfc7946_orientation():
+    out = quantize_layer(_layer(), 3)
+    parts = shapely.get_parts(out.geometry.iloc[:2].to_numpy())
+    assert shapely.is_ccw(shapely.get_exterior_ring(parts)).all()
+    holes = shapely.get_interior_ring(parts[:1], 0)
+    assert not shapely.is_ccw(holes).any()
+
+
+def test_compact_round_trip():
+    layer = quantize_layer(_layer(), 3)
+    doc = json.loads(json.dumps(encode_compact(layer, 3)))
+    assert doc["columns"] == ["CD118FP", "ALAND20"]
+    # first vertex absolute, then deltas, closing vertex dropped
+    exterior = doc["features"][0]["g"][0][0]
+    assert len(exterior) == 8
+    assert all(isinstance(v, int) for v in exterior)
+    assert abs(exterior[0]) >= 92000 and all(abs(v) <= 1988 for v in exterior[2:])
+
+    collection = remote.decode_compact(doc)
+    features = collection["features"]
+    assert features[0]["properties"] == {"CD118FP": "01", "ALAND20": 10}
+    assert features[1]["geometry"]["type"] == "MultiPolygon"
+    assert features[2]["geometry"] is None
+
+    decoded = gpd.GeoDataFrame.from_features(collection, crs="EPSG:4269")
+    for original, restored in zip(layer.geometry.iloc[:2], decoded.geometry.iloc[:2], strict=True):
+        assert restored.equals_exact(original, tolerance=1e-9)
+
+
+def test_decode_rejects_other_documents():
+    with pytest.raises(ValueError, match="cd118-compact"):
+        remote.decode_compact({"type": "FeatureCollection", "features": []})
+
+
+def test_load_compact_over_http(tmp_path: Path, monkeypatch):
+    write_compact(_layer(), tmp_path / "national" / "cd118_us.compact.json", precision=3)
+    with serve_directory(tmp_path) as url:
+        monkeypatch.setattr(remote, "BASE", url)
+        collection = remote.load_compact("national/cd118_us.compact.json")
+    assert len(collection["features"]) == 3
+    assert collection["bbox"] == [-93.123, 44.0, -89.5, 47.5]
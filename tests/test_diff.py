@@ -0,0 +1,69 @@
+from pathlib import Path
+
+import geopandas as gpd
+import pandas as pd
+import pytest
+from shapely.geometry import box
+
+from civic_data_boundaries_us_cd118.build import run_build
+from civic_data_boundaries_us_cd118.diff import OVERLAP_COLUMNS, diff_state, diff_vintages
+from civic_data_boundaries_us_cd118.utils import get_paths
+
+OLD = {"01": box(-94.0, 45.0, -93.0, 46.0), "02": box(-93.0, 45.0, -92.0, 46.0)}
+# District 01 shrinks to its western half; the eastern half moves to 02
+NEW = {"01": box(-94.0, 45.0, -93.5, 46.0), "02": box(-93.5, 45.0, -92.0, 46.0)}
+
+
+def _layer(column: str, districts: dict) -> gpd.GeoDataFrame:
+    return gpd.GeoDataFrame(
+        {column: list(districts)}, geometry=list(districts.values()), crs="EPSG:4269"
+    )
+
+
+def test_diff_state_overlaps_and_changed_area():
+    changed, table = diff_state(
+        _layer("CD118FP", OLD), _layer("CD119FP", NEW), "CD118FP", "CD119FP", "27"
+    )
+
+    assert list(table.columns) == OVERLAP_COLUMNS
+    rows = {(r["from_district"], r["to_district"]): r for r in table.to_dict("records")}
+    # Old 02 and new 01 never meet, and touching edges are not overlaps
+    assert set(rows) == {("01", "01"), ("01", "02"), ("02", "02")}
+    assert rows["01", "01"]["from_fraction"] == pytest.approx(0.5, abs=0.01)
+    assert rows["01", "02"]["to_fraction"] == pytest.approx(1 / 3, abs=0.01)
+    assert rows["02", "02"]["from_fraction"] == 1.0
+
+    assert list(zip(changed["from_district"], changed["to_district"], strict=True)) == [
+        ("01", "02")
+    ]
+    assert changed.crs == "EPSG:4269"
+    assert changed.geometry.iloc[0].equals(box(-93.5, 45.0, -93.0, 46.0))
+
+
+def _write_state(root: Path, stem: str, column: str, districts: dict) -> None:
+    shp = root / "data-in" / "tiger" / "27" / stem / f"{stem}.shp"
+    shp.parent.mkdir(parents=True, exist_ok=True)
+    _layer(column, districts).to_file(shp, driver="ESRI Shapefile")
+
+
+def test_diff_vintages_writes_changed_geojson_and_overlap_table(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(get_paths, "get_repo_root", lambda levels_up=3: tmp_path)
+    _write_state(tmp_path, "tl_2022_27_cd118", "CD118FP", OLD)
+    _write_state(tmp_path, "tl_2024_27_cd119", "CD119FP", NEW)
+    run_build(vintages=["cd118", "cd119"], workers=2)
+
+    result = diff_vintages("cd118", "cd119", workers=2)
+
+    assert result.states == ["27"]
+    assert result.changed_path == tmp_path / "data-out" / "cd119" / "diff" / (
+        "cd118_to_cd119.changed.geojson"
+    )
+    changed = gpd.read_file(result.changed_path)
+    assert list(changed["to_district"]) == ["02"]
+    assert changed["area_m2"].iloc[0] > 1e9
+    table = pd.read_csv(result.overlaps_path, dtype=str)
+    assert sorted(zip(table["from_district"], table["to_district"], strict=True)) == [
+        ("01", "01"),
+        ("01", "02"),
+        ("02", "02"),
+    ]
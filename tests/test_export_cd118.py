@@ -0,0 +1,161 @@
+import json
+from pathlib import Path
+import shutil
+
+import geopandas as gpd
+import numpy as np
+from shapely.geometry import box
+import yaml
+
+from civic_data_boundaries_us_cd118 import export_cd118 as export_module
+from civic_data_boundaries_us_cd118.export_cd118 import (
+    export_cd118,
+    load_cd118_layer,
+    read_cd118_manifest_entries,
+    read_cd118_raw,
+)
+from civic_data_boundaries_us_cd118.utils import get_paths
+from civic_data_boundaries_us_cd118.vintages import get_vintage
+
+
+def _write_state(root: Path, fips: str, n: int) -> None:
+    stem = f"tl_2022_{fips}_cd118"
+    shp = root / "data-in" / "tiger" / fips / stem / f"{stem}.shp"
+    shp.parent.mkdir(parents=True, exist_ok=True)
+    gpd.GeoDataFrame(
+        {"CD118FP": [f"{i + 1:02d}" for i in range(n)]},
+        geometry=[box(i, 0, i + 1, 1) for i in range(n)],
+        crs="EPSG:4269",
+    ).to_file(shp, driver="ESRI Shapefile")
+
+
+def test_export_skips_states_with_matching_stamp(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(get_paths, "get_repo_root", lambda levels_up=3: tmp_path)
+    _write_state(tmp_path, "27", 2)
+    _write_state(tmp_path, "41", 3)
+
+    export_cd118()
+    entries = read_cd118_manifest_entries()
+    assert set(entries) == {"27", "41"}
+    assert all(e["config_hash"] and e["source_fingerprint"] for e in entries.values())
+    assert entries["41"]["geometry"]["features"] == 3
+    assert entries["41"]["geometry"]["invalid"] == 0
+
+    states_dir = tmp_path / "data-out" / "states"
+    minnesota = states_dir / "minnesota" / "cd118_minnesota.geojson"
+    oregon = states_dir / "oregon" / "cd118_oregon.geojson"
+    national = tmp_path / "data-out" / "national" / "cd118_us.geojson"
+    before = {p: p.stat().st_mtime_ns for p in (minnesota, oregon, national)}
+
+    export_cd118()
+    assert {p: p.stat().st_mtime_ns for p in before} == before
+
+    _write_state(tmp_path, "41", 4)
+    export_cd118()
+    assert minnesota.stat().st_mtime_ns == before[minnesota]
+    assert oregon.stat().st_mtime_ns != before[oregon]
+    assert len(gpd.read_file(national)) == 6
+
+
+def test_load_cd118_layer_skips_dropped_columns(tmp_path: Path):
+    shp = tmp_path / "tl_2022_27_cd118.shp"
+    gpd.GeoDataFrame(
+        {"CD118FP": ["01", "02"], "ALAND20": [5, 6], "LSAD20": ["C2", "C2"]},
+        geometry=np.array([box(0, 0, 1, 1), None], dtype=object),
+        crs="EPSG:4269",
+    ).to_file(shp, driver="ESRI Shapefile")
+
+    raw = read_cd118_raw(shp, drop_columns=["LSAD20", "CD118FP", "GEOID"])
+    assert list(raw.attributes.columns) == ["CD118FP", "ALAND20"]
+    assert isinstance(raw.wkb[0], bytes)
+
+    gdf = load_cd118_layer(shp, drop_columns=["LSAD20"])
+    expected = gpd.read_file(shp).drop(columns=["LSAD20"])
+    assert gdf.equals(expected)
+    assert gdf.crs == expected.crs
+
+
+def test_configured_drop_columns_match_tiger_2022_fields(tmp_path: Path):
+    # Field names of a TIGER/Line 2022 CD118 shapefile
+    fields = {
+        "STATEFP20": ["27"],
+        "CD118FP": ["01"],
+        "GEOID20": ["2701"],
+        "NAMELSAD20": ["Congressional District 1"],
+        "LSAD20": ["C2"],
+        "CDSESSN": ["118"],
+        "MTFCC20": ["G5200"],
+        "FUNCSTAT20": ["N"],
+        "ALAND20": [1],
+        "AWATER20": [2],
+        "INTPTLAT20": ["+44.0"],
+        "INTPTLON20": ["-93.0"],
+    }
+    shp = tmp_path / "tl_2022_27_cd118.shp"
+    gpd.GeoDataFrame(fields, geometry=[box(0, 0, 1, 1)], crs="EPSG:4269").to_file(shp)
+
+    drop_columns = get_vintage("cd118").layer["drop_columns"]
+    raw = read_cd118_raw(shp, drop_columns=drop_columns)
+
+    assert set(drop_columns) <= set(fields)
+    assert not set(drop_columns) & set(raw.attributes.columns)
+    assert {"CD118FP", "GEOID20", "STATEFP20"} <= set(raw.attributes.columns)
+
+
+def test_read_cd118_raw_without_pyarrow(tmp_path: Path, monkeypatch):
+    shp = tmp_path / "tl_2022_27_cd118.shp"
+    gpd.GeoDataFrame(
+        {"CD118FP": ["01", "02"], "LSAD20": ["C2", "C2"]},
+        geometry=[box(0, 0, 1, 1), box(1, 0, 2, 1)],
+        crs="EPSG:4269",
+    ).to_file(shp, driver="ESRI Shapefile")
+    monkeypatch.setattr(export_module, "_HAS_ARROW", False)
+
+    raw = read_cd118_raw(shp, drop_columns=["LSAD20"])
+    assert list(raw.attributes.columns) == ["CD118FP"]
+    assert list(raw.attributes["CD118FP"]) == ["01", "02"]
+    geometries = gpd.GeoSeries.from_wkb(raw.wkb)
+    assert geometries.geom_equals(gpd.GeoSeries([box(0, 0, 1, 1), box(1, 0, 2, 1)])).all()
+
+
+def test_export_follows_nationwide_settings_and_reuses_fingerprints(tmp_path: Path, monkeypatch):
+    config_dir = tmp_path / "data-config"
+    shutil.copytree(Path(__file__).parents[1] / "data-config", config_dir)
+    monkeypatch.setenv("CIVIC_ROOT_DIR", str(tmp_path))
+    monkeypatch.setenv("CIVIC_CONFIG_DIR", str(config_dir))
+    _write_state(tmp_path, "27", 2)
+    _write_state(tmp_path, "41", 3)
+
+    hashed: list[Path] = []
+    fingerprint = export_module.shapefile_fingerprint
+    monkeypatch.setattr(
+        export_module,
+        "shapefile_fingerprint",
+        lambda shp: hashed.append(shp) or fingerprint(shp),
+    )
+
+    export_cd118(vintages=["cd118"])
+    assert len(hashed) == 2  # once per exported state
+
+    hashed.clear()
+    _write_state(tmp_path, "41", 4)
+    export_cd118(vintages=["cd118"])
+    assert [p.stem for p in hashed] == ["tl_2022_41_cd118"]
+
+    national_dir = tmp_path / "data-out" / "national"
+    geopackage = national_dir / "cd118_us.gpkg"
+    adjacency = national_dir / "cd118_us.adjacency.json"
+    assert geopackage.exists()
+    assert json.loads(adjacency.read_text())["tolerance"] == 0.005
+
+    config_path = config_dir / "us_cd118.yaml"
+    config = yaml.safe_load(config_path.read_text())
+    national = next(layer for layer in config["layers"] if layer["nationwide"])
+    national.update({"adjacency_tolerance": 0.01, "write_geopackage": False})
+    config_path.write_text(yaml.safe_dump(config))
+
+    hashed.clear()
+    export_cd118(vintages=["cd118"])
+    assert not hashed
+    assert json.loads(adjacency.read_text())["tolerance"] == 0.01
+    assert not geopackage.exists()
@@ -0,0 +1,66 @@
+from pathlib import Path
+import sqlite3
+
+import geopandas as gpd
+import pyogrio
+from shapely.geometry import MultiPolygon, box
+
+from civic_data_boundaries_us_cd118.geopackage import ocd_ids, write_geopackage
+
+PATTERN = "ocd-division/country:us/state:{state}/cd:{district}"
+
+
+def _layer() -> gpd.GeoDataFrame:
+    return gpd.GeoDataFrame(
+        {"GEOID20": ["2701", "2702", "5501"], "CD118FP": ["01", "02", "01"]},
+        geometry=[
+            box(-94.0, 45.0, -93.0, 46.0),
+            MultiPolygon([box(-93.0, 45.0, -92.5, 46.0), box(-92.4, 45.0, -92.0, 46.0)]),
+            box(-91.0, 44.0, -90.0, 45.0),
+        ],
+        crs="EPSG:4269",
+    )
+
+
+def test_ocd_ids():
+    assert ocd_ids(["27", "06", "99", "27"], ["03", "12", "01", "ZZ"], PATTERN) == [
+        "ocd-division/country:us/state:mn/cd:3",
+        "ocd-division/country:us/state:ca/cd:12",
+        None,
+        None,
+    ]
+
+
+def test_write_geopackage_indexes(tmp_path: Path):
+    path = write_geopackage(
+        _layer(),
+        tmp_path / "cd118_us.gpkg",
+        table="cd118",
+        state_column="STATEFP20",
+        key_column="GEOID20",
+        ocd_pattern=PATTERN,
+    )
+
+    with sqlite3.connect(path) as conn:
+        indexes = {
+            row[0]
+            for row in conn.execute("SELECT name FROM sqlite_master WHERE tbl_name = 'cd118'")
+        }
+        assert {"idx_cd118_statefp20", "idx_cd118_cd118fp", "idx_cd118_ocd_id"} <= indexes
+        # The R-tree finds districts by bbox without touching the feature table
+        hits = conn.execute(
+            "SELECT f.GEOID20 FROM rtree_cd118_geom r JOIN cd118 f ON f.fid = r.id "
+            "WHERE r.maxx >= -92.2 AND r.minx <= -92.1 AND r.maxy >= 45.5 AND r.miny <= 45.5"
+        ).fetchall()
+        assert hits == [("2702",)]
+        row = conn.execute(
+            "SELECT STATEFP20, ocd_id FROM cd118 WHERE ocd_id = ?",
+            ("ocd-division/country:us/state:wi/cd:1",),
+        ).fetchone()
+        assert row == ("55", "ocd-division/country:us/state:wi/cd:1")
+    conn.close()
+
+    back = pyogrio.read_dataframe(path, layer="cd118")
+    assert list(back["GEOID20"]) == ["2701", "2702", "5501"]
+    assert set(back.geom_type) == {"MultiPolygon"}
+    assert [p.name for p in tmp_path.iterdir()] == ["cd118_us.gpkg"]
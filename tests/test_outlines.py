@@ -0,0 +1,29 @@
+import geopandas as gpd
+from shapely.geometry import box
+
+from civic_data_boundaries_us_cd118.outlines import dissolve_states, us_outline
+
+
+def _state(*boxes: tuple[float, float, float, float]) -> gpd.GeoDataFrame:
+    return gpd.GeoDataFrame(geometry=[box(*b) for b in boxes], crs="EPSG:4269")
+
+
+def test_dissolve_states_and_us_outline():
+    frames = {
+        "55": _state((-91.0, 44.0, -90.0, 45.0)),
+        "27": _state((-94.0, 45.0, -93.0, 46.0), (-93.0, 45.0, -91.0, 46.0)),
+    }
+
+    states = dissolve_states(frames, state_column="STATEFP20", workers=2)
+
+    assert list(states["STATEFP20"]) == ["27", "55"]
+    assert list(states["STUSPS"]) == ["MN", "WI"]
+    assert list(states["districts"]) == [2, 1]
+    # The shared district border is gone; only the state's outer edge is left
+    assert states.geometry.iloc[0].equals(box(-94.0, 45.0, -91.0, 46.0))
+    assert states.crs == "EPSG:4269"
+
+    us = us_outline(states)
+    assert len(us) == 1
+    assert us["districts"].iloc[0] == 3
+    assert us.geometry.iloc[0].area == sum(g.area for g in states.geometry)
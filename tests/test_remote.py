@@ -0,0 +1,81 @@
+import gzip
+import json
+from pathlib import Path
+
+import geopandas as gpd
+import pytest
+from shapely.geometry import box
+
+from civic_data_boundaries_us_cd118.remote import iter_features
+from civic_data_boundaries_us_cd118.serve import ServeConfig, running_server
+
+
+@pytest.fixture
+def layer(tmp_path: Path) -> Path:
+    path = tmp_path / "cd118_us.geojson"
+    gpd.GeoDataFrame(
+        {
+            "STATEFP20": ["27", "27", "41", "55"],
+            "GEOID20": ["2701", "2702", "4101", "5501"],
+        },
+        geometry=[box(i, 0.5 * i, i + 1.25, 0.5 * i + 1) for i in range(4)],
+        crs="EPSG:4269",
+    ).to_file(path, driver="GeoJSON")
+    return path
+
+
+def _ids(features) -> list[str]:
+    return [f["properties"]["GEOID20"] for f in features]
+
+
+def test_iter_features_matches_full_parse(layer: Path):
+    expected = json.loads(layer.read_text(encoding="utf-8"))["features"]
+
+    # A tiny read size forces features to span many reads
+    assert list(iter_features(layer, chunk_size=7)) == expected
+    assert list(iter_features(str(layer))) == expected
+
+
+def test_iter_features_filters(layer: Path):
+    assert _ids(iter_features(layer, properties={"STATEFP20": "27"})) == ["2701", "2702"]
+    assert _ids(iter_features(layer, properties={"STATEFP20": ["41", "55"]})) == ["4101", "5501"]
+    assert _ids(iter_features(layer, bbox=(2.1, 1.1, 2.2, 1.2))) == ["2702", "4101"]
+    assert _ids(iter_features(layer, bbox=(2.1, 0, 2.2, 0.1), properties={"STATEFP20": "27"})) == []
+
+
+def test_iter_features_skips_other_members_and_stops_after_features(tmp_path: Path):
+    path = tmp_path / "layer.geojson"
+    path.write_text(
+        '{"bbox": [1, 2.5, 3, 4], "name": {"nested": ["x", {"features": 1}]},\n'
+        ' "features" : [ {"id": 1} ,{"id": 22}], "tail": [',
+        encoding="utf-8",
+    )
+    assert [f["id"] for f in iter_features(path, chunk_size=3)] == [1, 22]
+
+    path.write_text('{"type": "FeatureCollection", "features": []}', encoding="utf-8")
+    assert list(iter_features(path)) == []
+
+    path.write_text('[{"id": 1}]', encoding="utf-8")
+    with pytest.raises(ValueError, match="Expected '\\{'"):
+        list(iter_features(path))
+
+    path.write_text('{"features": [{"id": 1}, {"id": ', encoding="utf-8")
+    stream = iter_features(path)
+    assert next(stream) == {"id": 1}
+    with pytest.raises(ValueError):
+        next(stream)
+
+
+def test_iter_features_from_gzip_and_url(layer: Path):
+    with gzip.open(layer.with_name("cd118_us.geojson.gz"), "wb") as f:
+        f.write(layer.read_bytes())
+    assert _ids(iter_features(layer.with_name("cd118_us.geojson.gz"))) == [
+        "2701",
+        "2702",
+        "4101",
+        "5501",
+    ]
+
+    with running_server(ServeConfig(layer.parent, 0, 0, 0)) as base:
+        features = iter_features(f"{base}/cd118_us.geojson", properties={"GEOID20": "4101"})
+        assert _ids(features) == ["4101"]
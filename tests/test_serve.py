@@ -0,0 +1,139 @@
+import gzip
+import http.client
+import json
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import pytest
+
+from civic_data_boundaries_us_cd118 import remote
+from civic_data_boundaries_us_cd118.serve import (
+    HotCache,
+    ServeConfig,
+    accepted_encodings,
+    parse_range,
+    precompress,
+    running_server,
+)
+
+INDEX = [{"layer": "cd118", "path": "national/cd118_us.geojson"}]
+
+
+@pytest.fixture
+def data_out(tmp_path: Path) -> Path:
+    (tmp_path / "national").mkdir()
+    (tmp_path / "index.json").write_text(json.dumps(INDEX), encoding="utf-8")
+    (tmp_path / "national" / "cd118_us.geojson").write_text(
+        json.dumps({"type": "FeatureCollection", "features": [{"id": i} for i in range(200)]}),
+        encoding="utf-8",
+    )
+    (tmp_path.parent / "secret.txt").write_text("outside", encoding="utf-8")
+    return tmp_path
+
+
+def _get(base: str, path: str, headers: dict[str, str] | None = None, method: str = "GET"):
+    conn = http.client.HTTPConnection(urlsplit(base).netloc, timeout=5)
+    try:
+        conn.request(method, path, headers=headers or {})
+        response = conn.getresponse()
+        return response.status, dict(response.getheaders()), response.read()
+    finally:
+        conn.close()
+
+
+def test_etag_and_ranges(data_out: Path):
+    body = (data_out / "national" / "cd118_us.geojson").read_bytes()
+    with running_server(ServeConfig(data_out)) as base:
+        status, headers, data = _get(base, "/national/cd118_us.geojson")
+        assert status == 200
+        assert data == body
+        assert headers["Content-Type"] == "application/geo+json"
+        assert headers["Accept-Ranges"] == "bytes"
+
+        status, _, data = _get(
+            base, "/national/cd118_us.geojson", {"If-None-Match": headers["ETag"]}
+        )
+        assert (status, data) == (304, b"")
+
+        status, ranged, data = _get(base, "/national/cd118_us.geojson", {"Range": "bytes=10-19"})
+        assert (status, data) == (206, body[10:20])
+        assert ranged["Content-Range"] == f"bytes 10-19/{len(body)}"
+
+        status, _, data = _get(base, "/national/cd118_us.geojson", {"Range": "bytes=-5"})
+        assert (status, data) == (206, body[-5:])
+
+        status, _, _ = _get(base, "/national/cd118_us.geojson", {"Range": f"bytes={len(body)}-"})
+        assert status == 416
+
+        status, _, data = _get(
+            base, "/national/cd118_us.geojson", {"Range": "bytes=0-9", "If-Range": '"stale"'}
+        )
+        assert (status, data) == (200, body)
+
+
+def test_precompressed_sidecar_is_negotiated(data_out: Path):
+    assert precompress(data_out, min_bytes=0) == 2
+    assert precompress(data_out, min_bytes=0) == 0  # already fresh
+
+    body = (data_out / "national" / "cd118_us.geojson").read_bytes()
+    with running_server(ServeConfig(data_out)) as base:
+        status, headers, data = _get(
+            base, "/national/cd118_us.geojson", {"Accept-Encoding": "br;q=0, gzip"}
+        )
+        assert status == 200
+        assert headers["Content-Encoding"] == "gzip"
+        assert headers["Vary"] == "Accept-Encoding"
+        assert gzip.decompress(data) == body
+
+        status, plain, data = _get(base, "/national/cd118_us.geojson")
+        assert "Content-Encoding" not in plain
+        assert data == body
+        assert plain["ETag"] != headers["ETag"]
+
+
+def test_rejects_traversal_and_unknown_methods(data_out: Path):
+    with running_server(ServeConfig(data_out)) as base:
+        assert _get(base, "/../secret.txt")[0] == 404
+        assert _get(base, "/%2e%2e/secret.txt")[0] == 404
+        assert _get(base, "/national")[0] == 404
+        assert _get(base, "/index.json", method="DELETE")[0] == 405
+        status, headers, data = _get(base, "/index.json", method="HEAD")
+        assert (status, data) == (200, b"")
+        assert int(headers["Content-Length"]) == (data_out / "index.json").stat().st_size
+
+
+def test_remote_client_reads_from_local_server(data_out: Path, monkeypatch):
+    with running_server(ServeConfig(data_out)) as base:
+        monkeypatch.setattr(remote, "BASE", remote.BASE)
+        assert remote.set_base(base + "/") == base
+        assert remote.load_index() == INDEX
+    assert remote.set_base(None) == remote.DEFAULT_BASE
+
+
+def test_hot_cache_revalidates_and_evicts(tmp_path: Path):
+    from civic_data_boundaries_us_cd118.serve import _choose
+
+    a, b = tmp_path / "a.json", tmp_path / "b.json"
+    a.write_bytes(b"a" * 60)
+    b.write_bytes(b"b" * 60)
+    cache = HotCache(max_bytes=100, max_file_bytes=80)
+
+    assert cache.get(_choose(a, None)) == b"a" * 60
+    assert cache.get(_choose(a, None)) == b"a" * 60
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    cache.get(_choose(b, None))
+    assert cache.nbytes == 60  # a was evicted to stay under budget
+
+    b.write_bytes(b"c" * 70)
+    assert cache.get(_choose(b, None)) == b"c" * 70
+
+
+def test_header_parsers():
+    assert accepted_encodings("gzip;q=0.5, br;q=0, identity") == {"gzip", "identity"}
+    assert {"br", "gzip"} <= accepted_encodings("*")
+    assert parse_range("bytes=5-", 10) == (5, 9)
+    assert parse_range("bytes=0-3,5-6", 10) is None
+    assert parse_range("items=0-3", 10) is None
+    with pytest.raises(ValueError):
+        parse_range("bytes=-0", 10)
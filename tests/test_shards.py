@@ -0,0 +1,86 @@
+import json
+from pathlib import Path
+
+import geopandas as gpd
+import pytest
+from shapely.geometry import box
+import yaml
+
+from civic_data_boundaries_us_cd118.shards import (
+    ShardError,
+    _claim,
+    plan_shards,
+    reduce_shards,
+    work,
+    work_local,
+)
+from civic_data_boundaries_us_cd118.utils import instrument
+
+
+@pytest.fixture
+def root(tmp_path: Path, monkeypatch) -> Path:
+    config_dir = tmp_path / "data-config"
+    config_dir.mkdir()
+    state_layer = {
+        "name": "cd118",
+        "vintage": "cd118",
+        "district_column": "CD118FP",
+        "out_subdir": "",
+        "split_by": "fips",
+        "fips_start": "27",
+        "fips_end": "29",
+        "filename_pattern": "tl_2022_{fips}_cd118.zip",
+        "base_url": "https://example.invalid/CD",
+        "output_dir": "tiger",
+    }
+    national = {"name": "cd118_national", "vintage": "cd118", "nationwide": True}
+    (config_dir / "layers.yaml").write_text(
+        yaml.safe_dump({"layers": [state_layer, national]}), encoding="utf-8"
+    )
+    monkeypatch.setenv("CIVIC_ROOT_DIR", str(tmp_path))
+    monkeypatch.setenv("CIVIC_CONFIG_DIR", str(config_dir))
+
+    for i, fips in enumerate(["27", "28", "29"]):
+        stem = f"tl_2022_{fips}_cd118"
+        shp = tmp_path / "data-in" / "tiger" / fips / stem / f"{stem}.shp"
+        shp.parent.mkdir(parents=True)
+        gpd.GeoDataFrame(
+            {"CD118FP": ["01", "02"]},
+            geometry=[box(i, 0, i + 0.5, 1), box(i + 0.5, 0, i + 1, 1)],
+            crs="EPSG:4269",
+        ).to_file(shp, driver="ESRI Shapefile")
+    return tmp_path
+
+
+def test_shards_claimed_by_lock_and_reduced(root: Path):
+    work_dir = root / "shards"
+    shards = plan_shards(work_dir, shard_size=2)
+    assert [(s.id, s.fips) for s in shards] == [("cd118-000", ["27", "28"]), ("cd118-001", ["29"])]
+
+    # Another node holds the first shard, so this one only gets the second
+    with _claim(work_dir / "locks" / "cd118-000.lock") as claimed:
+        assert claimed
+        assert work(work_dir, fetch=False) == ["cd118-001"]
+        with pytest.raises(ShardError, match="cd118-000"):
+            reduce_shards(work_dir)
+    assert work(work_dir, fetch=False) == ["cd118-000"]
+    assert work(work_dir, fetch=False) == []
+
+    with instrument.run("shard-reduce"):
+        written = reduce_shards(work_dir, workers=2)
+
+    out = root / "data-out"
+    assert written == {"cd118": out / "national" / "cd118_us.geojson"}
+    assert len(gpd.read_file(out / "national" / "cd118_us.geojson")) == 6
+    manifest = yaml.safe_load((out / "national" / "manifest.yaml").read_text())
+    assert [s["state_fips"] for s in manifest["states"]] == ["27", "28", "29"]
+    index = {e["path"] for e in json.loads((out / "index.json").read_text())}
+    assert {"national/cd118_us.geojson", "states/mississippi/cd118_mississippi.geojson"} <= index
+
+
+def test_work_local_splits_shards_across_processes(root: Path):
+    work_dir = root / "shards"
+    plan_shards(work_dir, shard_size=1)
+
+    assert work_local(work_dir, processes=2, fetch=False) == ["cd118-000", "cd118-001", "cd118-002"]
+    assert len(list((work_dir / "reports").iterdir())) == 2
@@ -0,0 +1,60 @@
+import geopandas as gpd
+import numpy as np
+import pytest
+from shapely.geometry import box
+
+from civic_data_boundaries_us_cd118.store import District, DistrictStore
+
+
+def _layer() -> gpd.GeoDataFrame:
+    return gpd.GeoDataFrame(
+        {
+            "STATEFP20": ["27", "27", "55"],
+            "GEOID20": ["2701", "2702", "5501"],
+            "NAMELSAD20": ["District 1", "District 2", None],
+            "ALAND20": [100, 200, 300],
+            "AWATER20": [1.5, 2.5, np.nan],
+        },
+        geometry=np.array([box(0, 0, 1, 1), box(1, 0, 2, 1), None], dtype=object),
+        crs="EPSG:4269",
+    )
+
+
+def test_store_from_geojson_round_trips_properties_and_geometry(tmp_path):
+    path = tmp_path / "cd118_test.geojson"
+    _layer().to_file(path, driver="GeoJSON")
+    store = DistrictStore.from_geojson(path)
+
+    assert len(store) == 3
+    assert store.crs == "EPSG:4269"
+    district = store.get("2702")
+    assert isinstance(district, District)
+    assert district.properties["NAMELSAD20"] == "District 2"
+    assert district["ALAND20"] == 200
+    assert district.geometry.equals(box(1, 0, 2, 1))
+    assert district.bbox == (1.0, 0.0, 2.0, 1.0)
+
+
+def test_store_encodes_columns_compactly():
+    store = DistrictStore.from_frame(_layer())
+
+    assert store.column("ALAND20").dtype == np.int16
+    assert list(store.column("STATEFP20")) == ["27", "27", "55"]
+    assert store[2]["NAMELSAD20"] is None
+    assert store[2].geometry is None
+    assert [d.key for d in store.find("STATEFP20", "27")] == ["2701", "2702"]
+    assert store.find("STATEFP20", "06") == []
+    assert store.get("0601") is None
+    assert not hasattr(store[0], "__dict__")
+
+
+def test_store_spatial_queries():
+    store = DistrictStore.from_frame(_layer())
+
+    assert list(store.query_bbox(0.5, 0.5, 1.5, 0.5)) == [0, 1]
+    located = store.locate(1.5, 0.5)
+    assert located is not None and located.key == "2702"
+    assert store.locate(5.0, 5.0) is None
+    assert len(store.geometries()) == 3
+    with pytest.raises(IndexError):
+        store[3]
@@ -0,0 +1,80 @@
+import gzip
+import json
+from pathlib import Path
+import shutil
+
+import geopandas as gpd
+from shapely.geometry import box
+
+from civic_data_boundaries_us_cd118 import tiles
+from civic_data_boundaries_us_cd118.tiles import (
+    build_tiles,
+    read_tile,
+    write_pmtiles,
+    zxy_to_tileid,
+)
+from civic_data_boundaries_us_cd118.utils import get_paths
+
+
+def test_zxy_to_tileid_matches_pmtiles_spec():
+    assert [zxy_to_tileid(0, 0, 0)] == [0]
+    assert [zxy_to_tileid(1, x, y) for x, y in ((0, 0), (0, 1), (1, 1), (1, 0))] == [1, 2, 3, 4]
+    assert zxy_to_tileid(2, 0, 0) == 5
+
+
+def test_build_tiles_round_trip(tmp_path: Path):
+    src = tmp_path / "districts.geojson"
+    gdf = gpd.GeoDataFrame(
+        {"CD118FP": ["01", "02"]},
+        geometry=[box(-94, 44, -93, 45), box(-93, 44, -92, 45)],
+        crs="EPSG:4326",
+    )
+    gdf.to_file(src, driver="GeoJSON")
+
+    out = build_tiles(src, tmp_path / "cd.pmtiles", max_zoom=4, workers=1)
+
+    tile = read_tile(out, 0, 0, 0)
+    assert tile is not None
+    payload = gzip.decompress(tile)
+    assert b"cd118" in payload and b"CD118FP" in payload
+    # A tile in the southern hemisphere has no districts
+    assert read_tile(out, 1, 0, 1) is None
+
+
+def test_worker_processes_match_in_process_rendering(tmp_path: Path):
+    src = tmp_path / "districts.geojson"
+    gpd.GeoDataFrame(
+        {"CD118FP": ["01", "02"]},
+        geometry=[box(-94, 44, -93, 45), box(-93, 44, -92, 45)],
+        crs="EPSG:4326",
+    ).to_file(src, driver="GeoJSON")
+
+    single = build_tiles(src, tmp_path / "single.pmtiles", max_zoom=3, workers=1)
+    pooled = build_tiles(src, tmp_path / "pooled.pmtiles", max_zoom=3, workers=2)
+
+    assert pooled.read_bytes() == single.read_bytes()
+
+
+def test_main_builds_tiles_for_another_vintage(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(get_paths, "get_repo_root", lambda levels_up=3: tmp_path)
+    shutil.copytree(Path(__file__).parents[1] / "data-config", tmp_path / "data-config")
+    national = tmp_path / "data-out" / "cd119" / "national"
+    national.mkdir(parents=True)
+    gpd.GeoDataFrame(
+        {"CD119FP": ["01"]}, geometry=[box(-94, 44, -93, 45)], crs="EPSG:4326"
+    ).to_file(national / "cd119_us.geojson", driver="GeoJSON")
+
+    assert tiles.main(vintage="cd119", max_zoom=2, workers=1) == 0
+
+    tile = read_tile(national / "cd119_us.pmtiles", 0, 0, 0)
+    assert tile is not None and b"cd119" in gzip.decompress(tile)
+
+
+def test_write_pmtiles_uses_leaf_directories(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(tiles, "PMTILES_ROOT_MAX", 64)
+    data = {zxy_to_tileid(8, x, 0): gzip.compress(json.dumps([x]).encode()) for x in range(256)}
+
+    out = write_pmtiles(tmp_path / "leaf.pmtiles", data, {}, 8, 8, (-180, -85, 180, 85))
+
+    assert read_tile(out, 8, 17, 0) == data[zxy_to_tileid(8, 17, 0)]
+    assert read_tile(out, 8, 17, 1) is None
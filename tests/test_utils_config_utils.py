@@ -0,0 +1,53 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from civic_data_boundaries_us_cd118.utils.config_utils import (
+    ConfigError,
+    ConfigRegistry,
+    load_layer_config,
+)
+
+YAML = """
+simplify_tolerance: 0.05
+drop_columns: [ALAND]
+layers:
+  - name: cd118
+    simplify_tolerance: {tolerance}
+  - name: other
+"""
+
+
+def _write(path: Path, text: str, mtime_ns: int) -> None:
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_repo_config_loads_with_defaults_merged():
+    cfg = load_layer_config("cd118")
+    assert cfg["name"] == "cd118"
+    assert cfg["drop_columns"]
+    assert load_layer_config("no-such-layer") == {}
+
+
+def test_registry_caches_until_file_changes(tmp_path: Path):
+    yaml_file = tmp_path / "layers.yaml"
+    _write(yaml_file, YAML.format(tolerance=0.01), 1_000_000_000)
+    registry = ConfigRegistry(tmp_path)
+
+    first = registry.layers()
+    assert registry.layers() is first
+    assert registry.get("other")["simplify_tolerance"] == 0.05
+
+    _write(yaml_file, YAML.format(tolerance=0.02), 2_000_000_000)
+    assert registry.get("cd118")["simplify_tolerance"] == 0.02
+
+    registry.get("cd118")["simplify_tolerance"] = 99
+    assert registry.get("cd118")["simplify_tolerance"] == 0.02
+
+
+def test_registry_rejects_bad_types(tmp_path: Path):
+    _write(tmp_path / "bad.yaml", YAML.format(tolerance="fine"), 1_000_000_000)
+    with pytest.raises(ConfigError, match="simplify_tolerance"):
+        ConfigRegistry(tmp_path).layers()
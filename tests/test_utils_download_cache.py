@@ -0,0 +1,61 @@
+from concurrent.futures import ThreadPoolExecutor
+import time
+
+from civic_data_boundaries_us_cd118 import fetch
+from civic_data_boundaries_us_cd118.utils.download_cache import (
+    DownloadCache,
+    get_download_cache,
+    link_into,
+)
+
+URL = "https://example.test/tl_2022_27_cd118.zip"
+
+
+def _fake_download(calls: list[str]):
+    def download(url, f):
+        calls.append(url)
+        time.sleep(0.05)
+        return f.write(b"zip bytes for " + url.encode())
+
+    return download
+
+
+def test_fetch_downloads_each_url_once_across_callers(tmp_path):
+    cache = DownloadCache(tmp_path / "cache")
+    calls: list[str] = []
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda _: cache.fetch(URL, _fake_download(calls)), range(4)))
+
+    assert calls == [URL]
+    assert len({blob for blob, _ in results}) == 1
+    assert sum(downloaded for _, downloaded in results) == 1
+    blob = results[0][0]
+    assert blob.parent.parent.name == "sha256"
+    assert cache.lookup(URL) == blob
+
+
+def test_link_into_shares_cached_bytes(tmp_path):
+    cache = DownloadCache(tmp_path / "cache")
+    blob, _ = cache.fetch(URL, _fake_download([]))
+
+    dest = tmp_path / "checkout" / "data-in" / "tl_2022_27_cd118.zip"
+    method = link_into(blob, dest)
+
+    assert method in {"reflink", "hardlink", "copy"}
+    assert dest.read_bytes() == blob.read_bytes()
+
+
+def test_download_file_uses_cache_from_env(tmp_path, monkeypatch):
+    calls: list[str] = []
+    monkeypatch.setenv("CIVIC_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(fetch, "_stream_download", _fake_download(calls))
+
+    first = fetch.download_file(URL, tmp_path / "a" / "tl_2022_27_cd118.zip")
+    second = fetch.download_file(URL, tmp_path / "b" / "tl_2022_27_cd118.zip")
+
+    assert calls == [URL]
+    assert first.read_bytes() == second.read_bytes()
+    assert get_download_cache() is not None
+    monkeypatch.delenv("CIVIC_CACHE_DIR")
+    assert get_download_cache() is None
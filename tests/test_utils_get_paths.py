@@ -0,0 +1,49 @@
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from civic_data_boundaries_us_cd118.cli.cli import app
+from civic_data_boundaries_us_cd118.utils import get_paths
+
+
+def test_env_vars_set_each_root(tmp_path, monkeypatch):
+    monkeypatch.setenv("CIVIC_DATA_IN_DIR", str(tmp_path / "nvme" / "in"))
+    monkeypatch.setenv("CIVIC_DATA_OUT_DIR", str(tmp_path / "shared" / "out"))
+    monkeypatch.setenv("CIVIC_CONFIG_DIR", str(tmp_path / "config"))
+    monkeypatch.setenv("CIVIC_CACHE_DIR", str(tmp_path / "cache"))
+
+    assert get_paths.get_tiger_in_dir() == tmp_path / "nvme" / "in" / "tiger"
+    assert get_paths.get_national_out_dir() == tmp_path / "shared" / "out" / "national"
+    assert get_paths.get_config_dir() == tmp_path / "config"
+    assert get_paths.get_cache_dir() == tmp_path / "cache"
+
+
+def test_defaults_outside_a_checkout(tmp_path, monkeypatch):
+    for env in ("CIVIC_ROOT_DIR", "CIVIC_DATA_IN_DIR", "CIVIC_DATA_OUT_DIR", "CIVIC_CONFIG_DIR"):
+        monkeypatch.delenv(env, raising=False)
+    monkeypatch.delenv("CIVIC_CACHE_DIR", raising=False)
+    monkeypatch.setattr(get_paths, "_source_checkout", lambda levels_up=3: None)
+    monkeypatch.chdir(tmp_path)
+
+    assert get_paths.get_data_in_dir() == tmp_path / "data-in"
+    assert get_paths.get_config_dir() == tmp_path / "data-config"
+    assert get_paths.get_cache_dir() is None
+
+    monkeypatch.setenv("CIVIC_ROOT_DIR", str(tmp_path / "project"))
+    assert get_paths.get_data_out_dir() == tmp_path / "project" / "data-out"
+
+
+def test_checkout_config_dir_is_found():
+    assert (get_paths.get_config_dir() / "us_cd118.yaml").exists()
+
+
+def test_cli_options_override_roots(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("CIVIC_DATA_IN_DIR", "unused")
+    (tmp_path / "in" / "tiger").mkdir(parents=True)
+    (tmp_path / "in" / "tiger" / "tl_2022_27_cd118.zip").write_bytes(b"zip")
+
+    result = CliRunner().invoke(app, ["--data-in", str(tmp_path / "in"), "cleanup"])
+
+    assert result.exit_code == 0
+    assert get_paths.get_data_in_dir() == tmp_path / "in"
+    assert not (tmp_path / "in" / "tiger" / "tl_2022_27_cd118.zip").exists()
@@ -0,0 +1,118 @@
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+import json
+from pathlib import Path
+import time
+
+import pytest
+
+from civic_data_boundaries_us_cd118.utils import instrument
+
+
+def test_spans_nest_and_roll_up_counts(tmp_path: Path):
+    with instrument.run("demo", out_dir=tmp_path):
+        with instrument.span("export"):
+            for name in ("alaska", "oregon"):
+                with instrument.span(name, category="state", fips="00"):
+                    instrument.add(features=5, bytes_read=100, bytes_written=40)
+        with instrument.span("index"):
+            instrument.add(bytes_read=7)
+
+    report = json.loads((tmp_path / instrument.RUN_REPORT_FILENAME).read_text())
+    assert report["run"] == "demo"
+    assert report["status"] == "ok"
+    spans = {s["name"]: s for s in report["spans"]}
+    assert [s["name"] for s in report["spans"]] == ["demo", "export", "alaska", "oregon", "index"]
+
+    assert spans["alaska"]["parent"] == spans["export"]["id"]
+    assert spans["alaska"]["args"] == {"fips": "00"}
+    assert spans["export"]["features"] == 10
+    assert spans["export"]["bytes_written"] == 80
+    assert spans["demo"]["bytes_read"] == 207
+    assert spans["demo"]["wall_s"] >= spans["export"]["wall_s"]
+    assert spans["alaska"]["features_per_s"] is not None
+    assert spans["index"]["features_per_s"] is None
+
+    trace = json.loads((tmp_path / instrument.RUN_TRACE_FILENAME).read_text())
+    events = trace["traceEvents"]
+    assert len(events) == 5
+    assert all(e["ph"] == "X" and e["dur"] >= 0 for e in events)
+    assert events[2]["args"]["features"] == 5
+
+
+def test_recounted_features_stay_out_of_the_parent(tmp_path: Path):
+    with instrument.run("demo", out_dir=tmp_path):
+        with instrument.span("oregon", category="state"):
+            instrument.add(features=5)
+        with instrument.span("nationwide", rollup_features=False):
+            instrument.add(features=5, bytes_written=9)
+
+    report = json.loads((tmp_path / instrument.RUN_REPORT_FILENAME).read_text())
+    spans = {s["name"]: s for s in report["spans"]}
+    assert spans["nationwide"]["features"] == 5
+    assert spans["demo"]["features"] == 5
+    assert spans["demo"]["bytes_written"] == 9
+
+
+def test_nested_run_is_a_span(tmp_path: Path):
+    with instrument.run("build", out_dir=tmp_path), instrument.run("fetch", out_dir=tmp_path / "x"):
+        instrument.add(bytes_written=1)
+
+    assert not (tmp_path / "x").exists()
+    report = json.loads((tmp_path / instrument.RUN_REPORT_FILENAME).read_text())
+    assert [s["name"] for s in report["spans"]] == ["build", "fetch"]
+    assert report["spans"][0]["bytes_written"] == 1
+
+
+def test_failed_run_still_writes_report(tmp_path: Path):
+    with (
+        pytest.raises(RuntimeError),
+        instrument.run("export", out_dir=tmp_path),
+        instrument.span("chunk"),
+    ):
+        raise RuntimeError("boom")
+
+    report = json.loads((tmp_path / instrument.RUN_REPORT_FILENAME).read_text())
+    assert report["status"] == "error"
+    assert {s["status"] for s in report["spans"]} == {"error"}
+    assert instrument.current_recorder() is None
+
+
+def test_spans_outside_a_run_are_discarded():
+    with instrument.span("loose") as span:
+        instrument.add(features=3)
+        span.add(features=1)
+    assert span.features == 1
+    assert instrument.current_recorder() is None
+
+
+def test_worker_spans_count_their_own_cpu_and_share_counters_safely(tmp_path: Path):
+    def busy(seconds: float) -> None:
+        end = time.thread_time() + seconds
+        while time.thread_time() < end:
+            pass
+
+    def state(name: str, work: Callable[[], None]) -> None:
+        with instrument.span(name, category="state"):
+            work()
+        for _ in range(10_000):
+            instrument.add(features=1)  # counted on the shared "export" span
+
+    with (
+        instrument.run("demo", out_dir=tmp_path),
+        instrument.span("export"),
+        ThreadPoolExecutor(max_workers=2) as pool,
+    ):
+        futures = [
+            pool.submit(instrument.bind(state), "busy", lambda: busy(0.3)),
+            pool.submit(instrument.bind(state), "idle", lambda: time.sleep(0.3)),
+        ]
+        for future in futures:
+            future.result()
+
+    report = json.loads((tmp_path / instrument.RUN_REPORT_FILENAME).read_text())
+    spans = {s["name"]: s for s in report["spans"]}
+    assert spans["busy"]["cpu_s"] >= 0.25
+    assert spans["idle"]["cpu_s"] < 0.1
+    assert spans["idle"]["process_cpu_s"] >= spans["idle"]["cpu_s"]
+    assert spans["export"]["features"] == 20_000
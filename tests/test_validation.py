@@ -0,0 +1,70 @@
+import geopandas as gpd
+import numpy as np
+import shapely
+from shapely.geometry import MultiPolygon, Polygon, box
+
+from civic_data_boundaries_us_cd118.validation import (
+    duplicate_vertex_counts,
+    misoriented_mask,
+    repair_geometries,
+    validate_layer,
+)
+
+BOWTIE = Polygon([(0, 0), (1, 1), (1, 0), (0, 1)])
+CLOCKWISE = Polygon([(0, 0), (0, 1), (1, 1), (1, 0)])
+DUPLICATED = Polygon([(0, 0), (1, 0), (1, 0), (1, 1), (0, 1)])
+GOOD = box(0, 0, 1, 1)  # counterclockwise exterior
+HOLE_CCW = Polygon(GOOD.exterior, [[(0.2, 0.2), (0.4, 0.2), (0.4, 0.4), (0.2, 0.4)]])
+
+
+def test_checks_are_per_geometry():
+    geoms = np.array([GOOD, CLOCKWISE, DUPLICATED, MultiPolygon([GOOD, CLOCKWISE]), HOLE_CCW])
+    assert duplicate_vertex_counts(geoms).tolist() == [0, 0, 1, 0, 0]
+    assert misoriented_mask(geoms).tolist() == [False, True, False, True, True]
+
+
+def test_repair_fixes_problems_in_bulk():
+    geoms = np.array([GOOD, BOWTIE, CLOCKWISE, DUPLICATED, None, Polygon()], dtype=object)
+    fixed, report = repair_geometries(geoms)
+
+    assert report == {
+        "features": 6,
+        "null": 1,
+        "empty": 1,
+        "invalid": 1,
+        "repaired": 1,
+        "unrepaired": 0,
+        "duplicate_vertices": 1,
+        "removed_vertices": 1,
+    }
+    assert fixed[0] is GOOD
+    assert fixed[1].is_valid and fixed[1].area == 0.5  # both lobes kept
+    assert shapely.is_ccw(fixed[2].exterior)  # rewound, but not counted
+    assert len(fixed[3].exterior.coords) == 5
+    assert fixed[4] is None
+    assert geoms[1] is BOWTIE  # input not modified
+
+
+def test_repair_disabled_only_counts():
+    geoms = np.array([BOWTIE, CLOCKWISE], dtype=object)
+    same, report = repair_geometries(geoms, repair=False)
+    assert same[0] is BOWTIE and same[1] is CLOCKWISE
+    assert report["invalid"] == 1
+    assert report["repaired"] == 0
+    assert report["unrepaired"] == 1
+
+
+def test_validate_layer_returns_repaired_frame():
+    gdf = gpd.GeoDataFrame({"CD118FP": ["01", "02"]}, geometry=[GOOD, BOWTIE], crs="EPSG:4269")
+    out, report = validate_layer(gdf, "test")
+    assert out.geometry.is_valid.all()
+    assert out.crs == gdf.crs
+    assert not gdf.geometry.is_valid.all()
+    assert report["repaired"] == 1
+
+
+def test_validate_layer_rewinds_shapefile_rings_without_reporting_them():
+    gdf = gpd.GeoDataFrame({"CD118FP": ["01"]}, geometry=[CLOCKWISE], crs="EPSG:4269")
+    out, report = validate_layer(gdf, "test")
+    assert shapely.is_ccw(out.geometry.iloc[0].exterior)
+    assert not any(report[key] for key in ("invalid", "duplicate_vertices", "unrepaired"))
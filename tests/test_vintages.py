@@ -0,0 +1,82 @@
+import json
+from pathlib import Path
+
+import geopandas as gpd
+import pytest
+from shapely.geometry import box
+
+from civic_data_boundaries_us_cd118.build import run_build
+from civic_data_boundaries_us_cd118.utils import get_paths
+from civic_data_boundaries_us_cd118.utils.config_utils import ConfigError
+from civic_data_boundaries_us_cd118.vintages import load_vintages, vintage_for_path
+
+
+def _write_state(root: Path, stem: str, fips: str, columns: dict[str, list[str]]) -> None:
+    shp = root / "data-in" / "tiger" / fips / stem / f"{stem}.shp"
+    shp.parent.mkdir(parents=True, exist_ok=True)
+    n = len(next(iter(columns.values())))
+    gpd.GeoDataFrame(
+        columns, geometry=[box(i, 0, i + 1, 1) for i in range(n)], crs="EPSG:4269"
+    ).to_file(shp, driver="ESRI Shapefile")
+
+
+def test_build_runs_every_vintage_into_its_namespace(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(get_paths, "get_repo_root", lambda levels_up=3: tmp_path)
+    _write_state(tmp_path, "tl_2022_27_cd118", "27", {"CD118FP": ["01", "02"]})
+    _write_state(tmp_path, "tl_2022_41_cd118", "41", {"CD118FP": ["01"]})
+    _write_state(
+        tmp_path,
+        "tl_2024_27_cd119",
+        "27",
+        {"CD119FP": ["01", "02", "03"], "GEOID": ["2701", "2702", "2703"]},
+    )
+
+    assert [v.name for v in load_vintages()] == ["cd118"]  # cd119 is opt-in
+    summary = run_build(vintages=["cd118", "cd119"], workers=4)
+
+    assert summary["cd118"]["rebuilt"] == ["27", "41"]
+    assert summary["cd119"]["rebuilt"] == ["27"]
+    out = tmp_path / "data-out"
+    assert len(gpd.read_file(out / "national" / "cd118_us.geojson")) == 3
+    cd119 = gpd.read_file(out / "cd119" / "states" / "minnesota" / "cd119_minnesota.geojson")
+    assert list(cd119["CD119FP"]) == ["01", "02", "03"]
+    adjacency = json.loads((out / "cd119" / "national" / "cd119_us.adjacency.json").read_text())
+    assert adjacency["ids"] == ["2701", "2702", "2703"]
+    assert (out / "cd119" / "national" / "manifest.yaml").exists()
+
+    entries = json.loads((out / "index.json").read_text())
+    index = {e["path"]: e["vintage"] for e in entries}
+    assert index["national/cd118_us.geojson"] == "cd118"
+    assert index["cd119/national/cd119_us.geojson"] == "cd119"
+    assert index["states/oregon/cd118_oregon.geojson"] == "cd118"
+    geopackages = {e["path"]: e.get("geopackage") for e in entries}
+    assert geopackages["cd119/national/cd119_us.geojson"] == "cd119/national/cd119_us.gpkg"
+    assert index["cd119/outlines/cd119_us_outline.geojson"] == "cd119"
+    states = gpd.read_file(out / "outlines" / "cd118_states.geojson")
+    assert list(states["STATEFP20"]) == ["27", "41"]
+
+    again = run_build(vintages=["cd119"])
+    assert set(again) == {"cd119"}
+    assert again["cd119"]["reused"] == ["27"]
+
+
+def test_disabled_and_unknown_vintages(tmp_path: Path, monkeypatch):
+    (tmp_path / "layers.yaml").write_text(
+        "layers:\n"
+        "  - {name: a, vintage: cd118, split_by: fips, out_subdir: ''}\n"
+        "  - {name: b, vintage: cd119, split_by: fips, enabled: false}\n"
+        "  - {name: b_us, vintage: cd119, nationwide: true}\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setenv("CIVIC_CONFIG_DIR", str(tmp_path))
+
+    assert [v.name for v in load_vintages()] == ["cd118"]
+    (cd119,) = load_vintages(["cd119"])
+    assert cd119.district_column == "CD119FP"
+    assert cd119.national["name"] == "b_us"
+    with pytest.raises(ConfigError, match="cd120"):
+        load_vintages(["cd120"])
+
+    everything = load_vintages(include_disabled=True)
+    assert vintage_for_path("cd119/states/ohio/cd119_ohio.geojson", everything) == "cd119"
+    assert vintage_for_path("states/ohio/cd118_ohio.geojson", everything) == "cd118"